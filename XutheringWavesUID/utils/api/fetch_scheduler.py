@@ -0,0 +1,177 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+from gsuid_core.logger import logger
+
+from .request_util import KuroApiResp
+
+# 优先级, 数值越小越先执行
+PRIORITY_INTERACTIVE = 0  # 单角色查询
+PRIORITY_REFRESH = 1  # 刷新全部面板
+PRIORITY_BACKGROUND = 2  # 后台/预取
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_REFRESH: "refresh",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+def get_concurrency() -> int:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("RefreshCardConcurrency").data or 2
+
+
+def is_global_limit() -> bool:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("UseGlobalSemaphore").data or False
+
+
+def get_global_concurrency() -> int:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("RefreshCardGlobalConcurrency").data or 20
+
+
+class _Job:
+    __slots__ = ("uid", "func", "future", "deadline", "enqueued_at")
+
+    def __init__(
+        self,
+        uid: str,
+        func: Callable[[], Awaitable[KuroApiResp]],
+        future: asyncio.Future,
+        deadline: Optional[float],
+    ):
+        self.uid = uid
+        self.func = func
+        self.future = future
+        self.deadline = deadline
+        self.enqueued_at = time.monotonic()
+
+
+class FetchScheduler:
+    """
+    角色详情请求调度
+    - 按优先级出队: 单角色查询 > 刷新面板 > 后台任务
+    - 同一优先级内按uid轮转, 大号刷新不会饿死其他用户
+    - 每个uid最多同时执行 RefreshCardConcurrency 个请求
+    - 所有uid合计最多同时执行 RefreshCardGlobalConcurrency 个请求;
+      开启 UseGlobalSemaphore 时 RefreshCardConcurrency 同时作为全局上限
+    - 排队超过截止时间的请求直接返回超时, 不再发出
+    """
+
+    def __init__(self):
+        # 优先级 -> uid -> 待执行任务
+        self._queues: Dict[int, "OrderedDict[str, Deque[_Job]]"] = {
+            p: OrderedDict() for p in PRIORITY_NAMES
+        }
+        self._running: Dict[str, int] = {}
+        self._running_total = 0
+        # 持有执行中的任务, 避免被垃圾回收
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"dispatched": 0, "expired": 0, "wait_ms": 0.0}
+
+    async def submit(
+        self,
+        uid: str,
+        func: Callable[[], Awaitable[KuroApiResp]],
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[float] = None,
+    ) -> KuroApiResp:
+        """
+        deadline: time.monotonic() 下的截止时间, 超过仍在排队则放弃
+        """
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues[priority].setdefault(uid, deque())
+        queue.append(_Job(uid, func, future, deadline))
+        self._dispatch()
+        return await future
+
+    def _next_job(self) -> Optional[_Job]:
+        limit = get_concurrency()
+        global_limit = get_global_concurrency()
+        if is_global_limit():
+            global_limit = min(global_limit, limit)
+        if self._running_total >= global_limit:
+            return None
+
+        for queues in self._queues.values():
+            for uid in list(queues.keys()):
+                jobs = queues[uid]
+                if self._running.get(uid, 0) >= limit:
+                    continue
+                job = jobs.popleft()
+                # 轮转: 取出后移到末尾
+                if jobs:
+                    queues.move_to_end(uid)
+                else:
+                    del queues[uid]
+                return job
+        return None
+
+    def _dispatch(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            if job.future.done():
+                # 调用方已取消
+                continue
+            if job.deadline is not None and time.monotonic() > job.deadline:
+                self._stats["expired"] += 1
+                job.future.set_result(KuroApiResp.err("请求排队超时"))
+                continue
+
+            self._stats["dispatched"] += 1
+            self._stats["wait_ms"] += (time.monotonic() - job.enqueued_at) * 1000
+            self._running[job.uid] = self._running.get(job.uid, 0) + 1
+            self._running_total += 1
+            task = asyncio.ensure_future(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _Job):
+        try:
+            res = await job.func()
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(res)
+        finally:
+            self._running[job.uid] -= 1
+            if self._running[job.uid] <= 0:
+                del self._running[job.uid]
+            self._running_total -= 1
+            try:
+                self._dispatch()
+            except Exception as e:
+                logger.exception(f"[鸣潮] 详情请求调度失败: {e}")
+
+    def queue_depth(self) -> Dict[str, int]:
+        return {
+            PRIORITY_NAMES[p]: sum(len(jobs) for jobs in queues.values())
+            for p, queues in self._queues.items()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        dispatched = self._stats["dispatched"]
+        return {
+            "running": self._running_total,
+            "queued": self.queue_depth(),
+            "dispatched": dispatched,
+            "expired": self._stats["expired"],
+            "avg_wait_ms": self._stats["wait_ms"] / dispatched if dispatched else 0,
+        }
+
+
+fetch_scheduler = FetchScheduler()
@@ -0,0 +1,243 @@
+"""
+model.py 中高频模型的 msgspec Struct 镜像
+
+字段名与 pydantic 模型一致, 只读场景可直接替换;
+直接从文件字节解码, 不经过 dict 中间层, 适合群排行等批量读取.
+需要修改或传给计算模块 (WuWaCalc 等) 时仍使用 model.py 中的模型
+"""
+
+from typing import Any, List, Literal, Optional, Union
+
+from msgspec import UNSET, Struct, UnsetType, ValidationError, field, convert
+from msgspec import json as msgjson
+
+from gsuid_core.logger import logger
+
+
+class Role(Struct):
+    roleId: int
+    level: int
+    roleName: str
+    starLevel: int
+    attributeId: int
+    weaponTypeId: int
+    acronym: str
+    breach: Optional[int] = None
+    roleIconUrl: Optional[str] = None
+    rolePicUrl: Optional[str] = None
+    attributeName: Optional[str] = None
+    weaponTypeName: Optional[str] = None
+    chainUnlockNum: Optional[int] = None
+
+
+class Chain(Struct):
+    order: int
+    unlocked: bool
+    name: Optional[str] = None
+    description: Optional[str] = None
+    iconUrl: Optional[str] = None
+
+
+class Weapon(Struct):
+    weaponId: int
+    weaponName: str
+    weaponType: int
+    weaponStarLevel: int
+    weaponIcon: Optional[str] = None
+    weaponEffectName: Optional[str] = None
+
+
+class WeaponData(Struct):
+    weapon: Weapon
+    level: int
+    breach: Optional[int] = None
+    resonLevel: Optional[int] = None
+
+
+class PhantomProp(Struct):
+    phantomPropId: int
+    name: str
+    phantomId: int
+    quality: int
+    cost: int
+    iconUrl: str
+    skillDescription: Optional[str] = None
+
+
+class FetterDetail(Struct):
+    groupId: int
+    name: str
+    num: int
+    iconUrl: Optional[str] = None
+    firstDescription: Optional[str] = None
+    secondDescription: Optional[str] = None
+
+
+class Props(Struct):
+    attributeName: str
+    attributeValue: str
+    iconUrl: Optional[str] = None
+
+
+class EquipPhantom(Struct):
+    phantomProp: PhantomProp
+    cost: int
+    quality: int
+    level: int
+    fetterDetail: FetterDetail
+    mainProps: Optional[List[Props]] = None
+    subProps: Optional[List[Props]] = None
+
+    def get_props(self):
+        props = []
+        if self.mainProps:
+            props.extend(self.mainProps)
+        if self.subProps:
+            props.extend(self.subProps)
+
+        return props
+
+
+class EquipPhantomData(Struct):
+    cost: int
+    equipPhantomList: Optional[List[Optional[EquipPhantom]]] = None
+
+
+class Skill(Struct):
+    id: int
+    type: str
+    name: str
+    description: str
+    iconUrl: str
+
+
+class SkillData(Struct):
+    skill: Skill
+    level: int
+
+
+class RoleDetailData(Struct):
+    role: Role
+    level: int
+    chainList: List[Chain]
+    weaponData: WeaponData
+    skillList: List[SkillData]
+    phantomData: Optional[EquipPhantomData] = None
+
+    def get_chain_num(self):
+        """获取命座数量"""
+        return sum(1 for chain in self.chainList if chain.unlocked)
+
+    def get_chain_name(self):
+        n = self.get_chain_num()
+        return f"{['零', '一', '二', '三', '四', '五', '六'][n]}链"
+
+    def get_skill_level(
+        self,
+        skill_type: Literal["常态攻击", "共鸣技能", "共鸣解放", "变奏技能", "共鸣回路"],
+    ):
+        skill_level = 1
+        _skill = next(
+            (skill for skill in self.skillList if skill.skill.type == skill_type), None
+        )
+        if _skill:
+            skill_level = _skill.level - 1
+        return skill_level
+
+    def get_skill_list(self):
+        sort = ["常态攻击", "共鸣技能", "共鸣回路", "共鸣解放", "变奏技能", "延奏技能"]
+        return sorted(self.skillList, key=lambda x: sort.index(x.skill.type))
+
+
+class SlashRole(Struct):
+    iconUrl: str
+    roleId: int
+
+
+class SlashHalf(Struct):
+    buffDescription: str
+    buffIcon: str
+    buffName: str
+    buffQuality: int
+    roleList: List[SlashRole]
+    score: int
+
+
+class SlashChallenge(Struct):
+    challengeId: int
+    challengeName: str
+    score: int
+    halfList: List[SlashHalf] = field(default_factory=list)
+    rank: Optional[str] = ""
+
+    def get_rank(self):
+        if not self.rank:
+            return ""
+        return self.rank.lower()
+
+
+class SlashDifficulty(Struct):
+    allScore: int
+    difficulty: int
+    difficultyName: str
+    homePageBG: str
+    maxScore: int
+    teamIcon: str
+    challengeList: List[SlashChallenge] = field(default_factory=list)
+
+
+class SlashDetail(Struct):
+    """冥海"""
+
+    isUnlock: bool
+    seasonEndTime: int
+    difficultyList: List[SlashDifficulty] = field(default_factory=list)
+
+
+class SlashRecord(Struct):
+    """slashData.json, 旧版本文件直接为 SlashDetail (record_time 为 None)"""
+
+    record_time: Union[int, None, UnsetType] = UNSET
+    slash_data: Optional[SlashDetail] = None
+
+
+# 宽松模式, 与 pydantic 一样接受数字字符串等
+role_detail_list_decoder = msgjson.Decoder(List[RoleDetailData], strict=False)
+slash_record_decoder = msgjson.Decoder(SlashRecord, strict=False)
+slash_detail_decoder = msgjson.Decoder(SlashDetail, strict=False)
+
+
+def _convert_role_detail(item: Any) -> Optional[RoleDetailData]:
+    try:
+        return convert(item, RoleDetailData, strict=False)
+    except ValidationError:
+        pass
+    # 经 pydantic 模型校验转换, 与面板缓存的读取结果保持一致
+    from .model import RoleDetailData as RoleDetailModel
+
+    try:
+        model = RoleDetailModel.model_validate(item)
+        return convert(model.model_dump(), RoleDetailData, strict=False)
+    except Exception as e:
+        logger.warning(f"[鸣潮] 角色详情解码失败, 已跳过: {e}")
+        return None
+
+
+def decode_role_detail_list(data: Union[bytes, str]) -> List[RoleDetailData]:
+    """
+    整体解码失败时逐个角色解码, 单个角色数据异常不影响其他角色
+    """
+    try:
+        return role_detail_list_decoder.decode(data)
+    except ValidationError:
+        pass
+    roles = [_convert_role_detail(item) for item in msgjson.decode(data)]
+    return [role for role in roles if role is not None]
+
+
+def decode_slash_record(data: Union[bytes, str]) -> SlashRecord:
+    record = slash_record_decoder.decode(data)
+    if record.slash_data is None:
+        # 旧格式
+        return SlashRecord(None, slash_detail_decoder.decode(data))
+    return record
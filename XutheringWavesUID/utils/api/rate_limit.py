@@ -0,0 +1,145 @@
+import asyncio
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+from gsuid_core.logger import logger
+
+from .request_util import KuroApiResp, RespCode
+
+
+def get_rate_limit() -> float:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("KuroRateLimit").data or 0
+
+
+def get_backoff_max() -> float:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("KuroRateBackoffMax").data or 60
+
+
+def get_throttle_reason(status: int, resp: Optional[KuroApiResp]) -> str:
+    """判断上游是否在限流/风控, 返回原因, 否则返回空串"""
+    if status == 429:
+        return "HTTP 429"
+    if status >= 500:
+        return f"HTTP {status}"
+    if resp is None:
+        return ""
+    if resp.code == RespCode.DANGER_ENV.value:
+        return f"code {resp.code}"
+    if isinstance(resp.msg, str) and "系统繁忙" in resp.msg:
+        return resp.msg
+    return ""
+
+
+def get_retry_delay(base: float, attempt: int) -> float:
+    """指数退避 + 抖动"""
+    return min(get_backoff_max(), base * 2**attempt) * random.uniform(0.5, 1.5)
+
+
+class TokenBucket:
+    """
+    令牌桶 + 自适应退避
+    - 成功: 速率逐步恢复到配置值 (加性增)
+    - 风控/繁忙/429/5xx: 速率减半, 并按连续失败次数指数退避 (乘性减)
+    - 等待者按到达顺序预约令牌 (asyncio.Lock 为 FIFO), 在锁外等待
+    """
+
+    def __init__(self, name: str, rate: float):
+        self.name = name
+        self.base_rate = rate
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self._lock = asyncio.Lock()
+
+    def _reset(self, rate: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.tokens = min(self.tokens, rate)
+
+    def _refill(self, now: float):
+        # 桶容量为 1 秒的配置速率, 允许短时突发
+        self.tokens = min(
+            self.base_rate, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    async def acquire(self, base_rate: float):
+        # 持锁只做预约: 按到达顺序扣除令牌, 不足时记为欠账并算出等待时间,
+        # 在锁外等待, 慢的等待者不会阻塞其他调用方
+        async with self._lock:
+            if base_rate != self.base_rate:
+                self._reset(base_rate)
+
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, self.blocked_until - now)
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        # 等待期间触发了退避则继续等待
+        while True:
+            delay = self.blocked_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def penalize(self, reason: str):
+        self.failures += 1
+        self.rate = max(self.base_rate / 16, self.rate / 2)
+        backoff = min(get_backoff_max(), 2 ** (self.failures - 1))
+        backoff *= random.uniform(0.8, 1.2)
+        self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+        logger.warning(
+            f"[鸣潮] 接口[{self.name}] {reason}, 退避 {backoff:.1f}s, "
+            f"速率降为 {self.rate:.2f}/s"
+        )
+
+    def reward(self):
+        self.failures = 0
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+
+class RateLimiter:
+    def __init__(self):
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def get_bucket(self, route: str, egress: str) -> TokenBucket:
+        key = (route, egress)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(f"{route}@{egress}", get_rate_limit())
+            self._buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, route: str, proxy: Optional[str]) -> Optional[TokenBucket]:
+        rate = get_rate_limit()
+        if rate <= 0:
+            return None
+        bucket = self.get_bucket(route, proxy or "direct")
+        await bucket.acquire(rate)
+        return bucket
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            bucket.name: {
+                "rate": bucket.rate,
+                "failures": bucket.failures,
+                "blocked": max(0.0, bucket.blocked_until - time.monotonic()),
+            }
+            for bucket in self._buckets.values()
+        }
+
+
+rate_limiter = RateLimiter()
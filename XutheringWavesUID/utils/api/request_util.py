@@ -1,6 +1,8 @@
 import asyncio
+from contextvars import ContextVar
 from enum import IntEnum
-from typing import Any, Dict, Generic, Optional, TypeVar, Union
+from functools import wraps
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar, Union
 
 from pydantic import (
     BaseModel,
@@ -49,6 +51,36 @@ async def get_community_header() -> dict[str, str]:
 
 T = TypeVar("T")
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 当前请求所属的接口标签, 用于匹配 NeedProxyFunc
+_request_route: ContextVar[str] = ContextVar("waves_request_route", default="")
+
+
+def waves_route(func: F) -> F:
+    """
+    声明接口的路由标签（即函数名），_waves_request 据此匹配 NeedProxyFunc
+    使用示例:
+    @waves_route
+    async def get_role_detail_info(self, ...):
+        return await self._waves_request(...)
+    """
+    route = func.__name__
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _request_route.set(route)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _request_route.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def get_request_route() -> str:
+    return _request_route.get()
+
 
 class ThrowMsg(str):
     TOKEN_INVALID = "登录已过期，请重新登录"
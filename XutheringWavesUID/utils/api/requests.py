@@ -1,21 +1,20 @@
 import asyncio
-import inspect
 import json
 import os
 import random
 import string
-from typing import Any, Dict, List, Literal, Mapping, Optional, Union
+from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple, Union
 
 import aiohttp
 from aiohttp import ClientTimeout, ContentTypeError
 
 from gsuid_core.logger import logger
 
+from ...utils.cache import credential_cache
 from ...utils.database.models import WavesUser
 from ...wutheringwaves_config import WutheringWavesConfig
 from ..error_reply import WAVES_CODE_999
 from ..util import timed_async_cache
-from ..resource.RESOURCE_PATH import CACHE_PATH
 from .api import (
     ANN_CONTENT_URL,
     ANN_LIST_URL,
@@ -68,7 +67,25 @@ from .request_util import (
     KuroApiResp,
     get_base_header,
     get_community_header,
+    get_request_route,
+    waves_route,
 )
+from .rate_limit import get_retry_delay, get_throttle_reason, rate_limiter
+from .response_cache import is_cache_enabled, response_cache
+from .single_flight import single_flight
+from .token_pool import RiskControlError, get_pool_size, public_token_pool
+
+
+def get_cookie_validate_ttl() -> float:
+    return WutheringWavesConfig.get_config("CookieValidateCache").data or 0
+
+
+def get_coalesce_ttl() -> float:
+    return WutheringWavesConfig.get_config("RequestCoalesceTTL").data or 0
+
+
+def is_resp_success(resp: KuroApiResp) -> bool:
+    return resp.success
 
 
 def generate_random_jwt_token() -> str:
@@ -138,8 +155,21 @@ class WavesApi:
             },
             update_data={"bat": access_token},
         )
+        credential_cache.invalidate(uid=waves_user.uid)
         return waves_user
 
+    async def get_cache_scope(self, roleId: str, token: str) -> str:
+        """
+        接口缓存的 token 范围
+        自己的token与公共token能看到的数据不同, 缓存按 self/public 分开
+        """
+        if not is_cache_enabled():
+            return ""
+        waves_user = await WavesUser.select_data_by_cookie_and_uid(
+            cookie=token, uid=roleId
+        )
+        return "self" if waves_user else "public"
+
     async def get_used_headers(
         self, cookie: str, uid: str, needToken=False
     ) -> Dict[str, Any]:
@@ -150,6 +180,13 @@ class WavesApi:
         }
         if needToken:
             headers["token"] = cookie
+
+        cred = credential_cache.get(uid, cookie)
+        if cred is not None:
+            headers["did"] = cred.did
+            headers["b-at"] = cred.bat
+            return headers
+
         waves_user: Optional[WavesUser] = await WavesUser.select_data_by_cookie_and_uid(
             cookie=cookie,
             uid=uid,
@@ -162,6 +199,7 @@ class WavesApi:
 
         headers["did"] = waves_user.did or ""
         headers["b-at"] = waves_user.bat or ""
+        credential_cache.set(uid, cookie, headers["did"], headers["b-at"])
         return headers
 
     async def get_ck_result(self, uid, user_id, bot_id) -> tuple[bool, Optional[str]]:
@@ -187,30 +225,73 @@ class WavesApi:
         if waves_user.status == "无效":
             return ""
 
-        data = await self.login_log(uid, waves_user.cookie)
+        # 短时间内已校验过的token直接使用
+        if credential_cache.is_validated(
+            uid, waves_user.cookie, get_cookie_validate_ttl()
+        ):
+            return waves_user.cookie
+
+        return await self.validate_self_cookie(uid, waves_user.cookie, waves_user)
+
+    @single_flight(keys=["uid", "cookie"])
+    async def validate_self_cookie(
+        self, uid: str, cookie: str, waves_user: WavesUser
+    ) -> str:
+        """校验自己的token, 同一 (uid, cookie) 的并发校验只请求一次"""
+        data = await self.login_log(uid, cookie)
         if not data.success:
-            await data.mark_cookie_invalid(uid, waves_user.cookie)
+            await data.mark_cookie_invalid(uid, cookie)
             return ""
 
-        data = await self.refresh_data(uid, waves_user.cookie)
+        data = await self.refresh_data(uid, cookie)
         if not data.success:
             if data.is_bat_token_invalid:
                 if waves_user := await self.refresh_bat_token(waves_user):
                     return waves_user.cookie
             else:
-                await data.mark_cookie_invalid(uid, waves_user.cookie)
+                await data.mark_cookie_invalid(uid, cookie)
             return ""
 
-        return waves_user.cookie
+        credential_cache.mark_validated(
+            uid, cookie, waves_user.did or "", waves_user.bat or ""
+        )
+        return cookie
+
+    async def validate_public_cookie(self, uid: str, cookie: str) -> bool:
+        data = await self.login_log(uid, cookie)
+        if not data.success:
+            if reason := get_throttle_reason(200, data):
+                raise RiskControlError(reason)
+            await data.mark_cookie_invalid(uid, cookie)
+            return False
+
+        data = await self.refresh_data(uid, cookie)
+        if not data.success:
+            if reason := get_throttle_reason(200, data):
+                raise RiskControlError(reason)
+            await data.mark_cookie_invalid(uid, cookie)
+            return False
+
+        return True
+
+    async def refresh_public_token_pool(self):
+        task = public_token_pool.schedule_refresh(self.validate_public_cookie)
+        if task:
+            await task
 
     async def get_waves_random_cookie(self, uid: str, user_id: str) -> Optional[str]:
         if WutheringWavesConfig.get_config("WavesOnlySelfCk").data:
             return None
 
-        # 公共ck 随机一个
+        # 公共ck 从池中轮换取出
+        if cookie := public_token_pool.pick():
+            return cookie
+
+        # 池为空时后台补充, 本次现场校验兜底
+        public_token_pool.schedule_refresh(self.validate_public_cookie)
+
         user_list = await WavesUser.get_waves_all_user()
         random.shuffle(user_list)
-        ck_list = []
         times = 1
         for user in user_list:
             if not await WavesUser.cookie_validate(user.uid):
@@ -231,12 +312,12 @@ class WavesApi:
                 times -= 1
                 continue
 
-            ck_list.append(user.cookie)
-            break
-
-        if len(ck_list) > 0:
-            return random.choices(ck_list, k=1)[0]
+            # 未开启公共token池时不放入池中
+            if get_pool_size() > 0:
+                public_token_pool.add(user.uid, user.cookie)
+            return user.cookie
 
+    @waves_route
     async def get_kuro_role_list(self, token: str, did: str, game_id: Union[int, str] = WAVES_GAME_ID):
         header = await get_base_header()
         header.update(
@@ -249,6 +330,12 @@ class WavesApi:
 
         return await self._waves_request(ROLE_LIST_URL, "POST", header, data=data)
 
+    @single_flight(
+        keys=["roleId", "token", "gameId"],
+        ttl=get_coalesce_ttl,
+        condition=is_resp_success,
+    )
+    @waves_route
     async def get_daily_info(
         self, roleId: str, token: str, gameId: Union[str, int] = WAVES_GAME_ID
     ):
@@ -272,6 +359,7 @@ class WavesApi:
             data=data,
         )
 
+    @waves_route
     async def refresh_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -286,6 +374,7 @@ class WavesApi:
         }
         return await self._waves_request(REFRESH_URL, "POST", header, data=data)
 
+    @waves_route
     async def login_log(self, roleId: str, token: str):
         """登录校验"""
         header = await get_base_header()
@@ -301,6 +390,12 @@ class WavesApi:
         data = {}
         return await self._waves_request(LOGIN_LOG_URL, "POST", header, data=data)
 
+    @single_flight(
+        keys=["roleId", "token", "serverId"],
+        ttl=get_coalesce_ttl,
+        condition=is_resp_success,
+    )
+    @waves_route
     async def get_base_info(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -313,25 +408,27 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                info = await self._waves_request(BASE_DATA_URL, "POST", header, data=data)
-                base_info_path = CACHE_PATH / "base_info"
-                base_info_path.mkdir(parents=True, exist_ok=True)
-                with open(base_info_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(info.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取基础信息失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "base_info" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    info = json.load(f)
-                info = KuroApiResp(**info)
-        else:
-            info = await self._waves_request(BASE_DATA_URL, "POST", header, data=data)
-        return info
+        return await response_cache.fetch(
+            "base_info",
+            roleId,
+            lambda: self._waves_request(BASE_DATA_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+        )
 
+    @single_flight(
+        keys=["roleId", "token", "serverId", "use_cache"],
+        ttl=get_coalesce_ttl,
+        condition=is_resp_success,
+    )
+    @waves_route
     async def get_role_info(
-        self, roleId: str, token: str, serverId: Optional[str] = None
+        self,
+        roleId: str,
+        token: str,
+        serverId: Optional[str] = None,
+        use_cache: bool = True,
     ):
+        """共鸣者信息, 刷新面板时 use_cache=False 跳过缓存"""
         header = await get_base_header()
         used_headers = await self.get_used_headers(cookie=token, uid=roleId)
         header.update(used_headers)
@@ -341,34 +438,34 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                role_info = await self._waves_request(ROLE_DATA_URL, "POST", header, data=data)
-                role_info_path = CACHE_PATH / "role_info"
-                role_info_path.mkdir(parents=True, exist_ok=True)
-                with open(role_info_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(role_info.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取基础信息失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "role_info" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    role_info = json.load(f)
-                role_info = KuroApiResp(**role_info)
-        else:
-            role_info = await self._waves_request(ROLE_DATA_URL, "POST", header, data=data)
-        return role_info
+        return await response_cache.fetch(
+            "role_info",
+            roleId,
+            lambda: self._waves_request(ROLE_DATA_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+            use_cache=use_cache,
+        )
 
+    @waves_route
     async def get_tree(self):
         header = await get_community_header()
         header.update({"wiki_type": "9"})
         data = {"devcode": ""}
         return await self._waves_request(WIKI_TREE_URL, "POST", header, data=data)
 
+    @waves_route
     async def get_wiki(self, catalogueId: str):
         header = await get_community_header()
         header.update({"wiki_type": "9"})
         data = {"catalogueId": catalogueId, "limit": 1000}
         return await self._waves_request(WIKI_DETAIL_URL, "POST", header, data=data)
 
+    @single_flight(
+        keys=["roleId", "charId", "token", "serverId"],
+        ttl=get_coalesce_ttl,
+        condition=is_resp_success,
+    )
+    @waves_route
     async def get_role_detail_info(
         self, charId: str, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -384,22 +481,15 @@ class WavesApi:
             "countryCode": "1",
             "id": charId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                role_detail = await self._waves_request(ROLE_DETAIL_URL, "POST", header, data=data)
-                role_detail_path = CACHE_PATH / "role_detail"
-                role_detail_path.mkdir(parents=True, exist_ok=True)
-                with open(role_detail_path / f"{roleId}_{charId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(role_detail.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取角色详情失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "role_detail" / f"{roleId}_{charId}.json", "r", encoding="utf-8") as f:
-                    role_detail = json.load(f)
-                role_detail = KuroApiResp(**role_detail)
-        else:
-            role_detail = await self._waves_request(ROLE_DETAIL_URL, "POST", header, data=data)
-        return role_detail
+        scope = await self.get_cache_scope(roleId, token)
+        return await response_cache.fetch(
+            "role_detail",
+            roleId,
+            lambda: self._waves_request(ROLE_DETAIL_URL, "POST", header, data=data),
+            extra=f"{charId}_{scope}",
+        )
 
+    @waves_route
     async def get_calabash_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -413,22 +503,14 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                calabash_data = await self._waves_request(CALABASH_DATA_URL, "POST", header, data=data)
-                calabash_data_path = CACHE_PATH / "calabash_data"
-                calabash_data_path.mkdir(parents=True, exist_ok=True)
-                with open(calabash_data_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(calabash_data.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取数据坞失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "calabash_data" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    calabash_data = json.load(f)
-                calabash_data = KuroApiResp(**calabash_data)
-        else:
-            calabash_data = await self._waves_request(CALABASH_DATA_URL, "POST", header, data=data)
-        return calabash_data
+        return await response_cache.fetch(
+            "calabash_data",
+            roleId,
+            lambda: self._waves_request(CALABASH_DATA_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+        )
 
+    @waves_route
     async def get_explore_data(
         self,
         roleId: str,
@@ -447,22 +529,15 @@ class WavesApi:
             "roleId": roleId,
             "countryCode": countryCode,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                explore_data = await self._waves_request(EXPLORE_DATA_URL, "POST", header, data=data)
-                explore_data_path = CACHE_PATH / "explore_data"
-                explore_data_path.mkdir(parents=True, exist_ok=True)
-                with open(explore_data_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(explore_data.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取探索度失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "explore_data" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    explore_data = json.load(f)
-                explore_data = KuroApiResp(**explore_data)
-        else:
-            explore_data = await self._waves_request(EXPLORE_DATA_URL, "POST", header, data=data)
-        return explore_data
+        scope = await self.get_cache_scope(roleId, token)
+        return await response_cache.fetch(
+            "explore_data",
+            roleId,
+            lambda: self._waves_request(EXPLORE_DATA_URL, "POST", header, data=data),
+            extra=f"{countryCode}_{scope}",
+        )
 
+    @waves_route
     async def get_challenge_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -476,22 +551,14 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                challenge_data = await self._waves_request(CHALLENGE_DATA_URL, "POST", header, data=data)
-                challenge_data_path = CACHE_PATH / "challenge_data"
-                challenge_data_path.mkdir(parents=True, exist_ok=True)
-                with open(challenge_data_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(challenge_data.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取全息数据失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "challenge_data" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    challenge_data = json.load(f)
-                challenge_data = KuroApiResp(**challenge_data)
-        else:
-            challenge_data = await self._waves_request(CHALLENGE_DATA_URL, "POST", header, data=data)
-        return challenge_data
+        return await response_cache.fetch(
+            "challenge_data",
+            roleId,
+            lambda: self._waves_request(CHALLENGE_DATA_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+        )
 
+    @waves_route
     async def get_abyss_data(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -504,22 +571,14 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                abyss_data = await self._waves_request(TOWER_DETAIL_URL, "POST", header, data=data)
-                abyss_data_path = CACHE_PATH / "abyss_data"
-                abyss_data_path.mkdir(parents=True, exist_ok=True)
-                with open(abyss_data_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(abyss_data.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取深渊数据失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "abyss_data" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    abyss_data = json.load(f)
-                abyss_data = KuroApiResp(**abyss_data)
-        else:
-            abyss_data = await self._waves_request(TOWER_DETAIL_URL, "POST", header, data=data)
-        return abyss_data
+        return await response_cache.fetch(
+            "abyss_data",
+            roleId,
+            lambda: self._waves_request(TOWER_DETAIL_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+        )
 
+    @waves_route
     async def get_abyss_index(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -533,22 +592,14 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                abyss_index = await self._waves_request(TOWER_INDEX_URL, "POST", header, data=data)
-                abyss_index_path = CACHE_PATH / "abyss_index"
-                abyss_index_path.mkdir(parents=True, exist_ok=True)
-                with open(abyss_index_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(abyss_index.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取深渊索引失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "abyss_index" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    abyss_index = json.load(f)
-                abyss_index = KuroApiResp(**abyss_index)
-        else:
-            abyss_index = await self._waves_request(TOWER_INDEX_URL, "POST", header, data=data)
-        return abyss_index
+        return await response_cache.fetch(
+            "abyss_index",
+            roleId,
+            lambda: self._waves_request(TOWER_INDEX_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+        )
 
+    @waves_route
     async def get_slash_index(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -562,22 +613,14 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                slash_index = await self._waves_request(SLASH_INDEX_URL, "POST", header, data=data)
-                slash_index_path = CACHE_PATH / "slash_index"
-                slash_index_path.mkdir(parents=True, exist_ok=True)
-                with open(slash_index_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(slash_index.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取冥海索引失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "slash_index" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    slash_index = json.load(f)
-                slash_index = KuroApiResp(**slash_index)
-        else:
-            slash_index = await self._waves_request(SLASH_INDEX_URL, "POST", header, data=data)
-        return slash_index
+        return await response_cache.fetch(
+            "slash_index",
+            roleId,
+            lambda: self._waves_request(SLASH_INDEX_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+        )
 
+    @waves_route
     async def get_slash_detail(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -591,22 +634,14 @@ class WavesApi:
             "serverId": self.get_server_id(roleId, serverId),
             "roleId": roleId,
         }
-        if WutheringWavesConfig.get_config("CacheEverything").data:
-            try:
-                slash_detail = await self._waves_request(SLASH_DETAIL_URL, "POST", header, data=data)
-                slash_detail_path = CACHE_PATH / "slash_detail"
-                slash_detail_path.mkdir(parents=True, exist_ok=True)
-                with open(slash_detail_path / f"{roleId}.json", "w", encoding="utf-8") as f:
-                    f.write(json.dumps(slash_detail.model_dump(), ensure_ascii=False, indent=4))
-            except Exception as e:
-                logger.error(f"获取冥海详情失败，返回缓存数据 {e}")
-                with open(CACHE_PATH / "slash_detail" / f"{roleId}.json", "r", encoding="utf-8") as f:
-                    slash_detail = json.load(f)
-                slash_detail = KuroApiResp(**slash_detail)
-        else:
-            slash_detail = await self._waves_request(SLASH_DETAIL_URL, "POST", header, data=data)
-        return slash_detail
+        return await response_cache.fetch(
+            "slash_detail",
+            roleId,
+            lambda: self._waves_request(SLASH_DETAIL_URL, "POST", header, data=data),
+            extra=await self.get_cache_scope(roleId, token),
+        )
 
+    @waves_route
     async def get_more_activity(
         self, roleId: str, token: str, serverId: Optional[str] = None
     ):
@@ -622,6 +657,7 @@ class WavesApi:
         }
         return await self._waves_request(MORE_ACTIVITY_URL, "POST", header, data=data)
 
+    @waves_route
     async def get_request_token(
         self, roleId: str, token: str, did: str, serverId: Optional[str] = None
     ) -> tuple[bool, str]:
@@ -645,6 +681,7 @@ class WavesApi:
 
         return False, ""
 
+    @waves_route
     async def calculator_refresh_data(
         self,
         roleId: str,
@@ -669,6 +706,7 @@ class WavesApi:
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
     )
+    @waves_route
     async def get_online_list_role(self, token: str):
         """所有的角色列表"""
         header = await get_base_header()
@@ -680,6 +718,7 @@ class WavesApi:
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
     )
+    @waves_route
     async def get_online_list_weapon(self, token: str):
         """所有的武器列表"""
         header = await get_base_header()
@@ -691,6 +730,7 @@ class WavesApi:
         86400,
         lambda x: x.success and isinstance(x.data, (dict, list)),
     )
+    @waves_route
     async def get_online_list_phantom(self, token: str):
         """所有的声骸列表"""
         header = await get_base_header()
@@ -698,6 +738,7 @@ class WavesApi:
         data = {}
         return await self._waves_request(ONLINE_LIST_PHANTOM, "POST", header, data=data)
 
+    @waves_route
     async def get_owned_role(
         self,
         roleId: str,
@@ -716,6 +757,7 @@ class WavesApi:
         }
         return await self._waves_request(QUERY_OWNED_ROLE, "POST", header, data=data)
 
+    @waves_route
     async def get_develop_role_cultivate_status(
         self,
         roleId: str,
@@ -738,6 +780,7 @@ class WavesApi:
             ROLE_CULTIVATE_STATUS, "POST", header, data=data
         )
 
+    @waves_route
     async def get_batch_role_cost(
         self,
         roleId: str,
@@ -758,6 +801,7 @@ class WavesApi:
         }
         return await self._waves_request(BATCH_ROLE_COST, "POST", header, data=data)
 
+    @waves_route
     async def get_period_list(
         self,
         roleId: str,
@@ -771,6 +815,7 @@ class WavesApi:
         header.update(used_headers)
         return await self._waves_request(PERIOD_LIST_URL, "GET", header)
 
+    @waves_route
     async def get_period_detail(
         self,
         type: Literal["month", "week", "version"],
@@ -798,6 +843,7 @@ class WavesApi:
             url = VERSION_LIST_URL
         return await self._waves_request(url, "POST", header, data=data)
 
+    @waves_route
     async def get_gacha_log(
         self,
         cardPoolType: str,
@@ -817,6 +863,7 @@ class WavesApi:
         url = GACHA_NET_LOG_URL if self.is_net(roleId) else GACHA_LOG_URL
         return await self._waves_request(url, "POST", header, json_data=data)
 
+    @waves_route
     async def get_ann_list_by_type(
         self, eventType: str = "", pageSize: Optional[int] = None
     ):
@@ -829,6 +876,7 @@ class WavesApi:
         headers = await get_community_header()
         return await self._waves_request(ANN_LIST_URL, "POST", headers, data=data)
 
+    @waves_route
     async def get_ann_detail(self, post_id: str):
         """获取公告详情"""
         if post_id in self.ann_map:
@@ -859,6 +907,7 @@ class WavesApi:
 
         return self.ann_list_data
 
+    @waves_route
     async def get_wiki_home(self):
         """获取wiki首页"""
         headers = await get_community_header()
@@ -868,6 +917,7 @@ class WavesApi:
             return res.model_dump()
         return {}
 
+    @waves_route
     async def get_entry_detail(self, entry_id: str):
         """获取entry详情"""
         if entry_id in self.entry_detail_map:
@@ -885,6 +935,7 @@ class WavesApi:
             return raw_data
         return {}
 
+    @waves_route
     async def login(self, mobile: Union[int, str], code: str, did: str):
         """登录
         Args:
@@ -915,41 +966,58 @@ class WavesApi:
             header = await get_base_header()
 
         proxy_func = get_need_proxy_func()
-        if inspect.stack()[1].function in proxy_func or "all" in proxy_func:
+        if get_request_route() in proxy_func or "all" in proxy_func:
             proxy_url = get_local_proxy_url()
         else:
             proxy_url = None
 
+        route = get_request_route() or url
+
         async def do_request(
             req_data, client_session: aiohttp.ClientSession
-        ) -> KuroApiResp[Any]:
-            async with client_session.request(
-                method,
-                url=url,
-                headers=header,
-                params=params,
-                json=json_data,
-                data=req_data,
-                proxy=proxy_url,
-                timeout=ClientTimeout(total=10),
-            ) as resp:
-                try:
-                    raw_data = await resp.json()
-                except ContentTypeError:
-                    _raw_data = await resp.text()
-                    raw_data = {"code": WAVES_CODE_999, "data": _raw_data}
-
-                if isinstance(raw_data, dict):
+        ) -> Tuple[int, KuroApiResp[Any]]:
+            # 每次发出请求 (包括过验证码后的重试) 都经过限流桶
+            bucket = await rate_limiter.acquire(route, proxy_url)
+            http_status = 0
+            response = None
+            try:
+                async with client_session.request(
+                    method,
+                    url=url,
+                    headers=header,
+                    params=params,
+                    json=json_data,
+                    data=req_data,
+                    proxy=proxy_url,
+                    timeout=ClientTimeout(total=10),
+                ) as resp:
+                    http_status = resp.status
                     try:
-                        raw_data["data"] = json.loads(raw_data.get("data", ""))
-                    except Exception:
-                        pass
-
-                logger.debug(
-                    f"url:[{url}] params:[{params}] headers:[{header}] data:[{req_data}] raw_data:{raw_data}"
-                )
-                # 统一解析为 KuroApiResp
-                return KuroApiResp[Any].model_validate(raw_data)
+                        raw_data = await resp.json()
+                    except ContentTypeError:
+                        _raw_data = await resp.text()
+                        raw_data = {"code": WAVES_CODE_999, "data": _raw_data}
+
+                    if isinstance(raw_data, dict):
+                        try:
+                            raw_data["data"] = json.loads(raw_data.get("data", ""))
+                        except Exception:
+                            pass
+
+                    logger.debug(
+                        f"url:[{url}] params:[{params}] headers:[{header}] data:[{req_data}] raw_data:{raw_data}"
+                    )
+                    # 统一解析为 KuroApiResp
+                    response = KuroApiResp[Any].model_validate(raw_data)
+                    return http_status, response
+            finally:
+                # 按状态码判断限流, 响应体解析失败时同样退避
+                if bucket:
+                    reason = get_throttle_reason(http_status, response)
+                    if reason:
+                        bucket.penalize(reason)
+                    elif response is not None:
+                        bucket.reward()
 
         async def solve_captcha():
             if not self.captcha_solver:
@@ -969,7 +1037,15 @@ class WavesApi:
                     logger.warning(f"url:[{url}] 获取session失败")
                     continue
 
-                response = await do_request(data, client)
+                http_status, response = await do_request(data, client)
+
+                if (http_status == 429 or http_status >= 500) and (
+                    attempt < max_retries - 1
+                ):
+                    reason = get_throttle_reason(http_status, response)
+                    logger.warning(f"url:[{url}] {reason}, 尝试次数 {attempt + 1}")
+                    await asyncio.sleep(get_retry_delay(retry_delay, attempt))
+                    continue
 
                 res_data = response.data or {}
                 if (
@@ -987,17 +1063,18 @@ class WavesApi:
                     # 重试数据准备
                     retry_data = data.copy() if data else {}
                     retry_data["geeTestData"] = seccode_data
-                    return await do_request(retry_data, client)
+                    _, response = await do_request(retry_data, client)
+                    return response
 
                 return response
 
             except aiohttp.ClientError as e:
                 logger.warning(f"url:[{url}] 网络请求失败, 尝试次数 {attempt + 1}", e)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
+                    await asyncio.sleep(get_retry_delay(retry_delay, attempt))
             except Exception as e:
                 logger.warning(f"url:[{url}] 发生未知错误, 尝试次数 {attempt + 1}", e)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(retry_delay)
+                    await asyncio.sleep(get_retry_delay(retry_delay, attempt))
 
         raise TypeError("请求服务器失败，已达最大重试次数")
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import aiofiles
+
+from gsuid_core.logger import logger
+
+from ..resource.RESOURCE_PATH import CACHE_PATH
+from .request_util import KuroApiResp
+
+# 接口 -> (新鲜期, 过期后仍可先返回旧数据并后台刷新的时长), 单位秒
+# 角色详情用于刷新面板, 必须实时获取; 刷新面板时角色信息以 use_cache=False 跳过缓存
+CACHE_TTL: Dict[str, Tuple[int, int]] = {
+    "base_info": (60, 600),
+    "role_info": (60, 600),
+    "role_detail": (0, 0),
+    "calabash_data": (60, 600),
+    "explore_data": (60, 600),
+    "challenge_data": (60, 600),
+    "abyss_data": (60, 600),
+    "abyss_index": (60, 600),
+    "slash_index": (60, 600),
+    "slash_detail": (60, 600),
+}
+
+
+def is_cache_enabled() -> bool:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("CacheEverything").data or False
+
+
+class ResponseCache:
+    """
+    接口数据缓存
+    - 新鲜期内直接返回缓存
+    - 过期但在容忍期内, 先返回缓存并后台刷新
+    - 请求异常时以缓存兜底
+    - 写入在后台进行, 先写临时文件再原子替换
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._revalidating: Dict[Path, asyncio.Task] = {}
+        self._writing: Set[asyncio.Task] = set()
+
+    def get_path(self, endpoint: str, roleId: str, extra: str = "") -> Path:
+        name = f"{roleId}_{extra}" if extra else f"{roleId}"
+        return self.root / endpoint / f"{name}.json"
+
+    async def read(self, path: Path) -> Optional[Tuple[KuroApiResp, float]]:
+        try:
+            mtime = path.stat().st_mtime
+            async with aiofiles.open(path, mode="r", encoding="utf-8") as f:
+                data = json.loads(await f.read())
+            return KuroApiResp(**data), time.time() - mtime
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[鸣潮] 读取缓存失败 {path}: {e}")
+            return None
+
+    async def write(self, path: Path, resp: KuroApiResp):
+        tmp = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            text = json.dumps(
+                resp.model_dump(), ensure_ascii=False, separators=(",", ":")
+            )
+            # 同一缓存的并发写入各用各的临时文件, 不会互相覆盖
+            fd, name = tempfile.mkstemp(
+                prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+            )
+            os.close(fd)
+            tmp = Path(name)
+            async with aiofiles.open(tmp, mode="w", encoding="utf-8") as f:
+                await f.write(text)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"[鸣潮] 写入缓存失败 {path}: {e}")
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+
+    def _spawn(self, coro: Awaitable[Any]) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._writing.add(task)
+        task.add_done_callback(self._writing.discard)
+        return task
+
+    async def _revalidate(
+        self, path: Path, fetch: Callable[[], Awaitable[KuroApiResp]]
+    ):
+        try:
+            resp = await fetch()
+            if resp.success:
+                await self.write(path, resp)
+        except Exception as e:
+            logger.warning(f"[鸣潮] 后台刷新缓存失败 {path}: {e}")
+        finally:
+            self._revalidating.pop(path, None)
+
+    async def fetch(
+        self,
+        endpoint: str,
+        roleId: str,
+        fetch: Callable[[], Awaitable[KuroApiResp]],
+        extra: str = "",
+        use_cache: bool = True,
+    ) -> KuroApiResp:
+        """use_cache=False 时必定请求上游, 成功结果仍写入缓存, 请求异常时以缓存兜底"""
+        if not is_cache_enabled():
+            return await fetch()
+
+        path = self.get_path(endpoint, roleId, extra)
+        ttl, stale = CACHE_TTL.get(endpoint, (0, 0)) if use_cache else (0, 0)
+
+        cached = await self.read(path) if ttl > 0 or stale > 0 else None
+        if cached:
+            resp, age = cached
+            if age < ttl:
+                return resp
+            if age < ttl + stale:
+                if path not in self._revalidating:
+                    self._revalidating[path] = self._spawn(
+                        self._revalidate(path, fetch)
+                    )
+                return resp
+
+        try:
+            resp = await fetch()
+        except Exception as e:
+            cached = cached or await self.read(path)
+            if not cached:
+                raise
+            logger.error(f"[鸣潮] 获取[{endpoint}]失败，返回缓存数据 {e}")
+            return cached[0]
+
+        if resp.success:
+            self._spawn(self.write(path, resp))
+        return resp
+
+    async def flush(self):
+        if self._writing:
+            await asyncio.gather(*self._writing, return_exceptions=True)
+
+    def evict(
+        self, max_age: float, max_bytes: int, dry_run: bool = False
+    ) -> Tuple[int, int]:
+        """按时间和总大小淘汰缓存文件, 返回(删除文件数, 释放字节数), dry_run 时只统计"""
+        if not self.root.exists():
+            return 0, 0
+
+        now = time.time()
+        files = []
+        removed = freed = 0
+        for path in self.root.rglob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if max_age > 0 and now - stat.st_mtime > max_age:
+                if not dry_run:
+                    path.unlink(missing_ok=True)
+                removed += 1
+                freed += stat.st_size
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if max_bytes > 0 and total > max_bytes:
+            files.sort()
+            for _, size, path in files:
+                if total <= max_bytes:
+                    break
+                if not dry_run:
+                    path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+                freed += size
+
+        return removed, freed
+
+
+response_cache = ResponseCache(CACHE_PATH)
@@ -0,0 +1,174 @@
+import asyncio
+import copy
+import inspect
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from gsuid_core.logger import logger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]"):
+        self.task = task
+        self.waiters = 1
+
+
+class SingleFlight:
+    """
+    并发请求合并
+    相同key的并发调用只会发出一次上游请求, 其余调用等待并共享结果;
+    ttl > 0 时成功结果会在短时间内直接复用
+    copy_result 为 False 时共享的结果不再复制, 由调用方保证只读
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, copy_result: bool = True):
+        self.name = name
+        self.maxsize = maxsize
+        self.copy_result = copy_result
+        self._inflight: Dict[Tuple, _Flight] = {}
+        self._results: "OrderedDict[Tuple, Tuple[Any, float]]" = OrderedDict()
+
+        self.hits = 0  # 命中短时缓存
+        self.coalesced = 0  # 合并到进行中的请求
+        self.misses = 0  # 实际发出的上游请求
+        self.evictions = 0  # 超出容量被淘汰的结果
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+            "cached": len(self._results),
+        }
+
+    def invalidate(self, key: Optional[Tuple] = None):
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
+
+    def _get_result(self, key: Tuple) -> Tuple[bool, Any]:
+        if key not in self._results:
+            return False, None
+        value, expiry = self._results[key]
+        if time.monotonic() >= expiry:
+            del self._results[key]
+            return False, None
+        self._results.move_to_end(key)
+        return True, value
+
+    def _set_result(self, key: Tuple, value: Any, ttl: float):
+        now = time.monotonic()
+        self._results[key] = (value, now + ttl)
+        self._results.move_to_end(key)
+        if len(self._results) > self.maxsize:
+            for k in [k for k, (_, exp) in self._results.items() if exp <= now]:
+                del self._results[k]
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+                self.evictions += 1
+
+    async def do(
+        self,
+        key: Tuple,
+        func: Callable[[], Any],
+        ttl: float = 0,
+        condition: Callable[[Any], bool] = lambda x: True,
+        negative_ttl: float = 0,
+    ) -> Any:
+        """
+        condition 为 False 的结果按 negative_ttl 缓存 (为 0 时不缓存)
+        """
+        if ttl > 0 or negative_ttl > 0:
+            found, value = self._get_result(key)
+            if found:
+                self.hits += 1
+                return copy.deepcopy(value) if self.copy_result else value
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            self.misses += 1
+            # 上游请求独立成任务, 单个调用方被取消不会影响其他等待者
+            flight = _Flight(asyncio.ensure_future(func()))
+            self._inflight[key] = flight
+
+            def _done(task: "asyncio.Future[Any]", _flight: _Flight = flight):
+                if self._inflight.get(key) is _flight:
+                    del self._inflight[key]
+                if task.cancelled() or task.exception() is not None:
+                    return
+                if ttl <= 0 and negative_ttl <= 0:
+                    return
+                result = task.result()
+                # 结果已交给所有等待者, condition 出错只影响是否缓存
+                try:
+                    if condition(result):
+                        if ttl > 0:
+                            self._set_result(key, result, ttl)
+                    elif negative_ttl > 0:
+                        self._set_result(key, result, negative_ttl)
+                except Exception as e:
+                    logger.exception(f"[鸣潮] {self.name} 缓存条件判断失败: {e}")
+
+            flight.task.add_done_callback(_done)
+        else:
+            self.coalesced += 1
+            flight.waiters += 1
+
+        result = await asyncio.shield(flight.task)
+        # 结果被共享时返回副本, 防止调用方互相修改数据
+        if self.copy_result and (ttl > 0 or flight.waiters > 1):
+            return copy.deepcopy(result)
+        return result
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, int]]:
+    return {name: flight.stats() for name, flight in _flights.items()}
+
+
+def single_flight(
+    keys: List[str],
+    ttl: Callable[[], float] = lambda: 0,
+    condition: Callable[[Any], bool] = lambda x: True,
+) -> Callable[[F], F]:
+    """
+    请求合并装饰器
+    key 为 (函数名, *keys对应的参数值)
+    使用示例:
+    @single_flight(keys=["roleId", "token"])
+    async def get_role_info(self, roleId: str, token: str):
+        return await self._waves_request(...)
+    """
+
+    def decorator(func: F) -> F:
+        sig = inspect.signature(func)
+        flight = _flights.setdefault(func.__name__, SingleFlight(func.__name__))
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound_args = sig.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            key = (func.__name__,) + tuple(
+                bound_args.arguments.get(k) for k in keys
+            )
+            return await flight.do(
+                key,
+                lambda: func(*args, **kwargs),
+                ttl=ttl(),
+                condition=condition,
+            )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from gsuid_core.logger import logger
+
+# 校验函数: True 有效, False 失效(移出池), 抛异常视为临时故障,
+# 抛 RiskControlError 时立即停止本次刷新
+ValidateFunc = Callable[[str, str], Awaitable[bool]]
+
+MAX_SCORE = 3
+# 每次刷新最多校验的候选数 = 池大小 * CANDIDATE_FACTOR
+CANDIDATE_FACTOR = 3
+# 连续校验失败次数上限, 达到后停止本次补充
+MAX_CONSECUTIVE_FAILURES = 5
+
+
+class RiskControlError(Exception):
+    """上游风控或繁忙, 继续校验只会放大请求"""
+
+
+def get_pool_size() -> int:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("PublicTokenPoolSize").data or 0
+
+
+class PublicToken:
+    __slots__ = ("uid", "cookie", "score", "last_used", "last_checked")
+
+    def __init__(self, uid: str, cookie: str):
+        self.uid = uid
+        self.cookie = cookie
+        self.score = MAX_SCORE
+        self.last_used = 0.0
+        self.last_checked = time.time()
+
+
+class PublicTokenPool:
+    """
+    公共token池
+    只保存已校验过的token, 按最久未使用轮换取出;
+    校验由后台定时任务完成, 取token时不发起任何请求
+    """
+
+    def __init__(self):
+        # 头部为最久未使用
+        self._tokens: "OrderedDict[str, PublicToken]" = OrderedDict()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def pick(self) -> Optional[str]:
+        if not self._tokens:
+            return None
+        cookie, token = next(iter(self._tokens.items()))
+        token.last_used = time.time()
+        self._tokens.move_to_end(cookie)
+        return cookie
+
+    def add(self, uid: str, cookie: str):
+        token = self._tokens.get(cookie)
+        if token is None:
+            # 新token放在头部, 优先被使用
+            self._tokens[cookie] = PublicToken(uid, cookie)
+            self._tokens.move_to_end(cookie, last=False)
+        else:
+            token.score = MAX_SCORE
+            token.last_checked = time.time()
+
+    def discard(self, cookie: str):
+        self._tokens.pop(cookie, None)
+
+    def report_failure(self, cookie: str):
+        token = self._tokens.get(cookie)
+        if token is None:
+            return
+        token.score -= 1
+        if token.score <= 0:
+            self.discard(cookie)
+
+    async def refresh(self, validate: ValidateFunc):
+        from ..database.models import WavesUser
+
+        size = get_pool_size()
+        if size <= 0:
+            self._tokens.clear()
+            return
+
+        # 复查池内token
+        for token in list(self._tokens.values()):
+            try:
+                if await validate(token.uid, token.cookie):
+                    self.add(token.uid, token.cookie)
+                else:
+                    self.discard(token.cookie)
+            except RiskControlError as e:
+                logger.warning(f"[鸣潮] 公共token复查遇到风控, 停止刷新: {e}")
+                return
+            except Exception as e:
+                logger.warning(f"[鸣潮] 公共token复查失败 {token.uid}: {e}")
+                self.report_failure(token.cookie)
+
+        while len(self._tokens) > size:
+            self._tokens.popitem(last=True)
+
+        if len(self._tokens) >= size:
+            return
+
+        # 补充新token, 限制候选数与连续失败次数, 避免账号大面积失效或
+        # 被风控时每次刷新都对所有用户发起请求
+        user_list = await WavesUser.get_waves_all_user()
+        random.shuffle(user_list)
+        attempts = size * CANDIDATE_FACTOR
+        failures = 0
+        for user in user_list:
+            if len(self._tokens) >= size or attempts <= 0:
+                break
+            if failures >= MAX_CONSECUTIVE_FAILURES:
+                logger.warning(f"[鸣潮] 公共token连续校验失败 {failures} 次, 停止补充")
+                break
+            if user.cookie in self._tokens:
+                continue
+            if not await WavesUser.cookie_validate(user.uid):
+                continue
+            attempts -= 1
+            try:
+                if await validate(user.uid, user.cookie):
+                    self.add(user.uid, user.cookie)
+                    failures = 0
+                    continue
+            except RiskControlError as e:
+                logger.warning(f"[鸣潮] 公共token校验遇到风控, 停止补充: {e}")
+                break
+            except Exception as e:
+                logger.warning(f"[鸣潮] 公共token校验失败 {user.uid}: {e}")
+            failures += 1
+
+        logger.info(f"[鸣潮] 公共token池刷新完成, 当前数量: {len(self._tokens)}")
+
+    def schedule_refresh(self, validate: ValidateFunc) -> Optional[asyncio.Task]:
+        """后台刷新, 同一时间只有一个刷新任务"""
+        if self._refresh_task and not self._refresh_task.done():
+            return self._refresh_task
+        if get_pool_size() <= 0 and not self._tokens:
+            return None
+        self._refresh_task = asyncio.create_task(self._safe_refresh(validate))
+        return self._refresh_task
+
+    async def _safe_refresh(self, validate: ValidateFunc):
+        try:
+            await self.refresh(validate)
+        except Exception as e:
+            logger.exception(f"[鸣潮] 公共token池刷新失败: {e}")
+
+
+public_token_pool = PublicTokenPool()
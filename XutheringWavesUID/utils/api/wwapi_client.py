@@ -0,0 +1,136 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from gsuid_core.logger import logger
+
+# 连接未建立 (请求未发出) 或网关报告上游不可用 (502/503) 时重试
+RETRY_STATUS = (502, 503)
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout)
+# 连接中断/网关超时时上游可能已处理请求, 只重试幂等的方法, 避免重复上传
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+IDEMPOTENT_RETRY_STATUS = RETRY_STATUS + (504,)
+IDEMPOTENT_RETRY_EXCEPTIONS = RETRY_EXCEPTIONS + (httpx.RemoteProtocolError,)
+
+
+def get_max_connections() -> int:
+    from ...wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("WWApiMaxConnections").data or 20
+
+
+class EndpointStats:
+    __slots__ = ("count", "errors", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, cost_ms: float, ok: bool):
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self.total_ms += cost_ms
+        self.max_ms = max(self.max_ms, cost_ms)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.count if self.count else 0,
+            "max_ms": self.max_ms,
+        }
+
+
+class WWApiClient:
+    """
+    排行等 wwapi 接口共用的 httpx 客户端
+    每个事件循环一个连接池 (上传队列运行在独立线程的事件循环中)
+    """
+
+    def __init__(self, retries: int = 2, retry_delay: float = 0.5):
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._clients: Dict[int, httpx.AsyncClient] = {}
+        self._stats: Dict[str, EndpointStats] = {}
+
+    def get_client(self) -> httpx.AsyncClient:
+        key = id(asyncio.get_running_loop())
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            max_connections = get_max_connections()
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=30,
+                ),
+                timeout=httpx.Timeout(10),
+            )
+            self._clients[key] = client
+        return client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        endpoint = urlparse(url).path
+        stats = self._stats.setdefault(endpoint, EndpointStats())
+        if method.upper() in IDEMPOTENT_METHODS:
+            retry_status, retry_exceptions = (
+                IDEMPOTENT_RETRY_STATUS,
+                IDEMPOTENT_RETRY_EXCEPTIONS,
+            )
+        else:
+            retry_status, retry_exceptions = RETRY_STATUS, RETRY_EXCEPTIONS
+
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                res = await self.get_client().request(method, url, **kwargs)
+            except retry_exceptions as e:
+                stats.record((time.perf_counter() - start) * 1000, False)
+                if attempt >= self.retries:
+                    raise
+                logger.debug(f"[鸣潮] {endpoint} 连接失败, 重试 {attempt + 1}: {e}")
+            except Exception:
+                stats.record((time.perf_counter() - start) * 1000, False)
+                raise
+            else:
+                ok = res.status_code < 500
+                stats.record((time.perf_counter() - start) * 1000, ok)
+                if res.status_code not in retry_status or attempt >= self.retries:
+                    return res
+                logger.debug(f"[鸣潮] {endpoint} {res.status_code}, 重试 {attempt + 1}")
+
+            await asyncio.sleep(
+                self.retry_delay * 2**attempt * random.uniform(0.5, 1.5)
+            )
+
+        raise RuntimeError("unreachable")
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {k: v.to_dict() for k, v in self._stats.items()}
+
+    async def close(self):
+        try:
+            key: Optional[int] = id(asyncio.get_running_loop())
+        except RuntimeError:
+            key = None
+        for loop_id, client in list(self._clients.items()):
+            # 其他事件循环的客户端无法在当前循环关闭, 直接丢弃
+            if loop_id == key:
+                await client.aclose()
+            del self._clients[loop_id]
+
+
+wwapi_client = WWApiClient()
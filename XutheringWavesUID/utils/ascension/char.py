@@ -1,6 +1,7 @@
-import copy
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union
+from types import MappingProxyType
+from typing import Mapping, Optional, Union
 
 from msgspec import json as msgjson
 
@@ -30,12 +31,19 @@ read_char_json_files(MAP_PATH)
 
 
 class WavesCharResult:
+    """
+    结果按 (char_id, level, breach) 缓存并在调用间共享, 不可修改
+    stats 为基础数值, fixed_skill 为固有技能加成 (百分数, 如 12.0 表示 12%)
+    """
+
     def __init__(self):
         self.name = ""
         self.starLevel = 4
-        self.stats = {"life": 0.0, "atk": 0.0, "def": 0.0}
+        self.stats: Mapping[str, float] = MappingProxyType(
+            {"life": 0.0, "atk": 0.0, "def": 0.0}
+        )
         self.skillTrees = {}
-        self.fixed_skill = {}
+        self.fixed_skill: Mapping[str, float] = MappingProxyType({})
 
 
 def get_breach(breach: Union[int, None], level: int):
@@ -67,30 +75,34 @@ def get_char_detail(
     breach 突破
     resonLevel 精炼
     """
+    return _get_char_detail(str(char_id), level, get_breach(breach, level))
+
+
+@lru_cache(maxsize=4096)
+def _get_char_detail(char_id: str, level: int, breach: int) -> WavesCharResult:
     result = WavesCharResult()
-    if str(char_id) not in char_id_data:
+    if char_id not in char_id_data:
         logger.exception(f"get_char_detail char_id: {char_id} not found")
         return result
 
-    breach = get_breach(breach, level)
-
-    char_data = char_id_data[str(char_id)]
+    char_data = char_id_data[char_id]
     result.name = char_data["name"]
     result.starLevel = char_data["starLevel"]
-    result.stats = copy.deepcopy(char_data["stats"][str(breach)][str(level)])
+    stats = char_data["stats"][str(breach)][str(level)]
+    result.stats = MappingProxyType({k: float(v) for k, v in stats.items()})
     result.skillTrees = char_data["skillTree"]
 
-    char_data["skillTree"].items()
+    fixed_skill = {}
     for key, value in char_data["skillTree"].items():
         skill_info = value.get("skill", {})
         name = skill_info.get("name", "")
         if name in fixed_name and breach >= 3:
             name = name.replace("提升", "").replace("全", "")
-            if name not in result.fixed_skill:
-                result.fixed_skill[name] = "0%"
+            if name not in fixed_skill:
+                fixed_skill[name] = "0%"
 
-            result.fixed_skill[name] = sum_percentages(
-                skill_info["param"][0], result.fixed_skill[name]
+            fixed_skill[name] = sum_percentages(
+                skill_info["param"][0], fixed_skill[name]
             )
 
         if skill_info.get("type") == "固有技能":
@@ -99,12 +111,15 @@ def get_char_detail(
                     f"{char_data['name']}的{name}"
                 ):
                     name = name.replace("提升", "").replace("全", "")
-                    if name not in result.fixed_skill:
-                        result.fixed_skill[name] = "0%"
-                    result.fixed_skill[name] = sum_percentages(
-                        skill_info["param"][0], result.fixed_skill[name]
+                    if name not in fixed_skill:
+                        fixed_skill[name] = "0%"
+                    fixed_skill[name] = sum_percentages(
+                        skill_info["param"][0], fixed_skill[name]
                     )
 
+    result.fixed_skill = MappingProxyType(
+        {k: float(v.rstrip("%")) for k, v in fixed_skill.items()}
+    )
     return result
 
 
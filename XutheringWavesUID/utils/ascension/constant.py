@@ -21,9 +21,13 @@ fixed_name = [
 ]
 
 
-def sum_percentages(*args):
+def sum_percentages(*args: Union[str, float]):
     total = 0.0
     for percent in args:
+        if not isinstance(percent, str):
+            # 数值为百分数, 如 12.0 表示 12%
+            total += percent
+            continue
         try:
             # 去除百分号并转换为浮点数
             num = float(percent.rstrip("%"))
@@ -1,6 +1,7 @@
-import copy
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple, Union
 
 from msgspec import json as msgjson
 
@@ -30,15 +31,21 @@ read_weapon_json_files(MAP_PATH)
 
 
 class WavesWeaponResult:
+    """
+    结果按 (weapon_id, level, breach, resonLevel) 缓存并在调用间共享, 不可修改
+    stats 每项含 name, value (展示文本) 与 num (数值, 百分比属性为百分数)
+    sub_effect 含 name 与 value (百分数)
+    """
+
     def __init__(self):
         self.name: str = ""
         self.starLevel: int = 4
         self.type: int = 0
-        self.stats = []
+        self.stats: Tuple[Mapping[str, Any], ...] = ()
         self.param = []
         self.effect: str = ""
         self.effectName: str = ""
-        self.sub_effect = {}
+        self.sub_effect: Mapping[str, Any] = MappingProxyType({})
         self.resonLevel: int = 1
 
     def get_resonLevel_name(self):
@@ -74,42 +81,56 @@ def get_weapon_detail(
     breach 突破
     resonLevel 精炼
     """
+    if resonLevel is None:
+        resonLevel = 1
+    return _get_weapon_detail(
+        str(weapon_id), level, get_breach(breach, level), resonLevel
+    )
+
+
+def _format_stat(stat: dict) -> Mapping[str, Any]:
+    if stat["isPercent"]:
+        value = f"{stat['value'] / 100:.1f}%"
+    elif stat["isRatio"]:
+        value = f"{stat['value'] * 100:.1f}%"
+    else:
+        value = f"{int(stat['value'])}"
+    return MappingProxyType(
+        {**stat, "value": value, "num": float(value.rstrip("%"))}
+    )
+
+
+@lru_cache(maxsize=4096)
+def _get_weapon_detail(
+    weapon_id: str, level: int, breach: Union[int, None], resonLevel: int
+) -> WavesWeaponResult:
     result = WavesWeaponResult()
-    if str(weapon_id) not in weapon_id_data:
+    if weapon_id not in weapon_id_data:
         return result
 
-    breach = get_breach(breach, level)
-
-    weapon_data = weapon_id_data[str(weapon_id)]
+    weapon_data = weapon_id_data[weapon_id]
     result.name = weapon_data["name"]
     result.starLevel = weapon_data["starLevel"]
     result.type = weapon_data["type"]
     result.effectName = weapon_data["effectName"]
-    result.stats = copy.deepcopy(weapon_data["stats"][str(breach)][str(level)])
+    result.stats = tuple(
+        _format_stat(stat) for stat in weapon_data["stats"][str(breach)][str(level)]
+    )
     result.param = weapon_data["param"]
     effect = weapon_data["effect"]
-    if resonLevel is None:
-        resonLevel = 1
     result.resonLevel = resonLevel
     for i, p in enumerate(weapon_data["param"]):
         _temp = "{" + str(i) + "}"
         effect = effect.replace(f"{_temp}", str(p[resonLevel - 1]))
     result.effect = effect
 
-    for stat in result.stats:
-        if stat["isPercent"]:
-            stat["value"] = f"{stat['value'] / 100:.1f}%"
-        elif stat["isRatio"]:
-            stat["value"] = f"{stat['value'] * 100:.1f}%"
-        else:
-            stat["value"] = f"{int(stat['value'])}"
-
-    result.sub_effect = {}
     for i, v in enumerate(fixed_name):
         if result.effect.startswith(v):
             value = weapon_data["param"][0][resonLevel - 1]
             name = v.replace("提升", "").replace("全", "")
-            result.sub_effect = {"name": name, "value": f"{value}"}
+            result.sub_effect = MappingProxyType(
+                {"name": name, "value": float(f"{value}".rstrip("%"))}
+            )
 
     return result
 
@@ -37,3 +37,64 @@ class TimedCache:
                 keys_to_delete.append(key)
         for key in keys_to_delete:
             del self.cache[key]
+
+
+class Credential:
+    __slots__ = ("did", "bat", "validated_at")
+
+    def __init__(self, did: str = "", bat: str = ""):
+        self.did = did
+        self.bat = bat
+        self.validated_at = 0.0
+
+
+class CredentialCache:
+    """(uid, cookie) -> did/bat/上次校验时间"""
+
+    def __init__(self, maxsize=4096):
+        self.cache: "OrderedDict[tuple, Credential]" = OrderedDict()
+        self.maxsize = maxsize
+
+    def get(self, uid: str, cookie: str):
+        key = (uid, cookie)
+        if key not in self.cache:
+            return None
+        self.cache.move_to_end(key)
+        return self.cache[key]
+
+    def set(self, uid: str, cookie: str, did: str, bat: str):
+        key = (uid, cookie)
+        cred = self.cache.get(key)
+        if cred is None:
+            cred = Credential(did, bat)
+            self.cache[key] = cred
+        else:
+            cred.did = did
+            cred.bat = bat
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+        return cred
+
+    def mark_validated(self, uid: str, cookie: str, did: str, bat: str):
+        self.set(uid, cookie, did, bat).validated_at = time.time()
+
+    def is_validated(self, uid: str, cookie: str, ttl: float) -> bool:
+        cred = self.get(uid, cookie)
+        if cred is None or ttl <= 0:
+            return False
+        return time.time() - cred.validated_at < ttl
+
+    def invalidate(self, uid=None, cookie=None):
+        for key in list(self.cache.keys()):
+            if uid is not None and key[0] != uid:
+                continue
+            if cookie is not None and key[1] != cookie:
+                continue
+            del self.cache[key]
+
+    def clear(self):
+        self.cache.clear()
+
+
+credential_cache = CredentialCache()
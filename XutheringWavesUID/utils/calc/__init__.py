@@ -1,9 +1,8 @@
-import copy
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Optional
 
 from gsuid_core.logger import logger
 
-from ...utils.api.model import Props, RoleDetailData
+from ...utils.api.model import RoleDetailData
 from ...utils.api.model_other import EnemyDetailData
 from ...utils.damage.utils import (
     SONATA_ANCIENT,
@@ -12,12 +11,33 @@ from ...utils.damage.utils import (
 )
 from ...utils.map.damage.damage import check_if_ph_3, check_if_ph_5
 from ..ascension.char import WavesCharResult, get_char_detail
-from ..ascension.constant import percent_to_float, sum_numbers, sum_percentages
 from ..ascension.sonata import WavesSonataResult, get_sonata_detail
 from ..ascension.weapon import WavesWeaponResult, get_weapon_detail
 from ..damage.abstract import WavesEchoRegister
 from ..damage.damage import DamageAttribute
-from ..resource.constant import card_sort_map as card_sort_map_back
+from .stat_vector import (
+    ATK,
+    ATK_PERCENT,
+    ATTRIBUTE_DMG,
+    CARD_HIDDEN,
+    CARD_STATS,
+    CRIT_DMG,
+    CRIT_RATE,
+    DEF,
+    DEF_PERCENT,
+    ENERGY_REGEN,
+    FLAT_STATS,
+    LIFE,
+    LIFE_PERCENT,
+    STAT_INDEX,
+    StatVector,
+    add_props,
+    add_text,
+    new_vector,
+    percent_index,
+    sum_percent,
+    vector_to_card,
+)
 
 
 class WuWaCalc(object):
@@ -75,31 +95,10 @@ class WuWaCalc(object):
             return
         self.can_calc = True
 
-    def sum_phantom_value(self, result: Dict[str, str], prop_list: List[Props]) -> Dict:
-        name_per = ["攻击", "生命", "防御"]
-
-        for prop in prop_list:
-            per = "%" in prop.attributeValue
-            name = prop.attributeName
-            if per and name in name_per:
-                name = f"{name}%"
-            if name not in result:
-                result[name] = prop.attributeValue
-                continue
-
-            if per:
-                old = float(result[name].replace("%", ""))
-                new = float(prop.attributeValue.replace("%", ""))
-                result[name] = f"{old + new:.1f}%"
-            else:
-                old = int(result[name])
-                new = int(prop.attributeValue)
-                result[name] = f"{old + new:d}"
-
-        return result
-
     def prepare_phantom(self):
-        result = {"ph_detail": [], "echo_id": 0}
+        """声骸词条与2件套效果累加到 stat_vector"""
+        vector = new_vector()
+        result = {"ph_detail": [], "echo_id": 0, "stat_vector": vector}
         if not self.role_detail.phantomData:
             return result
         equipPhantomList = self.role_detail.phantomData.equipPhantomList
@@ -110,8 +109,7 @@ class WuWaCalc(object):
             if _phantom and _phantom.phantomProp:
                 if i == 0:
                     result["echo_id"] = _phantom.phantomProp.phantomId
-                props = _phantom.get_props()
-                result = self.sum_phantom_value(result, props)
+                add_props(vector, _phantom.get_props())
                 sonata_result: WavesSonataResult = get_sonata_detail(
                     _phantom.fetterDetail.name
                 )
@@ -131,15 +129,8 @@ class WuWaCalc(object):
             two_piece = waves_sonata_result.piece(2)
             # 2件套效果，声骸数量大于等于2
             if two_piece and num >= 2:
-                name: str | Any = two_piece.effect
-                effect = two_piece.param[0]
                 result["ph"] = waves_sonata_result.name
-                if name not in result:
-                    result[name] = effect
-                else:
-                    old = float(result[name].replace("%", ""))
-                    new = float(effect.replace("%", ""))
-                    result[name] = f"{old + new:.1f}%"
+                add_text(vector, two_piece.effect, two_piece.param[0])
 
             result["ph_detail"].append(
                 {
@@ -153,7 +144,7 @@ class WuWaCalc(object):
 
     def enhance_summation_phantom_value(
         self,
-        result: Dict[str, Union[str, float]],
+        result: Dict[str, Any],
     ):
         role_id = self.role_detail.role.roleId
         role_level = self.role_detail.role.level
@@ -177,6 +168,7 @@ class WuWaCalc(object):
             weapon_reson_level,
         )
 
+        vector: StatVector = result["stat_vector"]
         # 基础生命
         _life = char_result.stats["life"]
         # 基础攻击
@@ -185,28 +177,24 @@ class WuWaCalc(object):
         _def = char_result.stats["def"]
 
         # 武器基础攻击
-        _weapon_atk = weapon_result.stats[0]["value"]
-        result["atk_flat"] = float(result.get("攻击", "0"))
-        result["life_flat"] = float(result.get("生命", "0"))
-        result["def_flat"] = float(result.get("防御", "0"))
-
-        base_atk = float(_atk) + float(_weapon_atk)
-        per_atk = percent_to_float(result.get("攻击%", "0%"))
+        _weapon_atk = weapon_result.stats[0]["num"]
+        result["atk_flat"] = vector[ATK]
+        result["life_flat"] = vector[LIFE]
+        result["def_flat"] = vector[DEF]
+
+        # 生命/攻击/防御 由声骸固定值变为声骸提供的总值
+        base_atk = _atk + _weapon_atk
+        per_atk = vector[ATK_PERCENT] * 0.01
         result["atk_percent"] = per_atk
-        new_atk = int(base_atk * per_atk) + int(result.get("攻击", "0"))
-        result["攻击"] = f"{new_atk}"
+        vector[ATK] = int(base_atk * per_atk) + int(vector[ATK])
 
-        base_life = float(_life)
-        per_life = percent_to_float(result.get("生命%", "0%"))
+        per_life = vector[LIFE_PERCENT] * 0.01
         result["life_percent"] = per_life
-        new_life = int(base_life * per_life) + int(result.get("生命", "0"))
-        result["生命"] = f"{new_life}"
+        vector[LIFE] = int(_life * per_life) + int(vector[LIFE])
 
-        base_def = float(_def)
-        per_def = percent_to_float(result.get("防御%", "0%"))
+        per_def = vector[DEF_PERCENT] * 0.01
         result["def_percent"] = per_def
-        new_def = int(base_def * per_def) + int(result.get("防御", "0"))
-        result["防御"] = f"{new_def}"
+        vector[DEF] = int(_def * per_def) + int(vector[DEF])
 
         # 声骸首位
         if "echo_id" in result:
@@ -216,15 +204,9 @@ class WuWaCalc(object):
                 temp = e.do_equipment_first(role_id)
                 logger.debug(f"首位声骸数据 {e.name}-{e.id}-{temp}")
                 for key, value in temp.items():
-                    if key not in result:
-                        result[key] = value
-                    else:
-                        _value = result[key]
-                        if isinstance(_value, str):
-                            old = float(_value.replace("%", ""))
-                            new = float(value.replace("%", ""))
-                            result[key] = f"{old + new:.1f}%"
+                    add_text(vector, key, value)
 
+        result.update(vector_to_card(vector, always=FLAT_STATS))
         return result
 
     def enhance_summation_card_value(
@@ -242,12 +224,25 @@ class WuWaCalc(object):
         weapon_reson_level = weaponData.resonLevel
 
         shuxing = f"{role_attr}伤害加成"
-        card_sort_map: Dict[str, Any] = copy.deepcopy(card_sort_map_back)
+        shuxing_index = STAT_INDEX[shuxing]
+        card_sort_map: Dict[str, Any] = {}
         char_result: WavesCharResult = get_char_detail(role_id, role_level, role_breach)
         weapon_result: WavesWeaponResult = get_weapon_detail(
             weapon_id, weapon_level, weapon_breach, weapon_reson_level
         )
 
+        # 声骸提供的属性
+        phantom: StatVector = result["stat_vector"]
+        # 武器、固有技能、套装效果提供的属性, 最后与声骸属性合并为面板
+        card = new_vector()
+
+        def add_percent(name: str, value: float):
+            index = percent_index(name)
+            if index is None:
+                logger.debug(f"未知属性 {name}: {value}")
+                return
+            card[index] = sum_percent(value, card[index])
+
         # 基础生命
         _life = char_result.stats["life"]
         # 基础攻击
@@ -255,37 +250,30 @@ class WuWaCalc(object):
         # 基础防御
         _def = char_result.stats["def"]
         # 武器基础攻击
-        _weapon_atk = weapon_result.stats[0]["value"]
-        card_sort_map["char_atk"] = float(_atk)
-        card_sort_map["weapon_atk"] = float(_weapon_atk)
-        card_sort_map["char_life"] = float(_life)
-        card_sort_map["char_def"] = float(_def)
+        _weapon_atk = weapon_result.stats[0]["num"]
+        card_sort_map["char_atk"] = _atk
+        card_sort_map["weapon_atk"] = _weapon_atk
+        card_sort_map["char_life"] = _life
+        card_sort_map["char_def"] = _def
         # 武器副词条
-        weapon_sub_name = weapon_result.stats[1]["name"]
-        weapon_sub_value = weapon_result.stats[1]["value"]
-        card_sort_map[weapon_sub_name] = sum_percentages(
-            weapon_sub_value, card_sort_map[weapon_sub_name]
-        )
+        add_percent(weapon_result.stats[1]["name"], weapon_result.stats[1]["num"])
 
         # 武器谐振
         if weapon_result.sub_effect:
             # sub_name = ["生命提升", "共鸣效率提升", "攻击提升", "全属性伤害加成提升"]
-            sub_effect_name = weapon_result.sub_effect["name"]
-            card_sort_map[sub_effect_name] = sum_percentages(
-                weapon_result.sub_effect["value"], card_sort_map[sub_effect_name]
+            add_percent(
+                weapon_result.sub_effect["name"], weapon_result.sub_effect["value"]
             )
 
         # 角色固有技能
         for name, value in char_result.fixed_skill.items():
-            if name not in card_sort_map:
-                card_sort_map[name] = "0%"
-            card_sort_map[name] = sum_percentages(value, card_sort_map[name])
+            add_percent(name, value)
 
-        char_regen = "100%"
-        card_sort_map["共鸣效率"] = sum_percentages(
-            char_regen, result.get("共鸣效率", "0%"), card_sort_map["共鸣效率"]
+        char_regen = 100.0
+        card[ENERGY_REGEN] = sum_percent(
+            char_regen, phantom[ENERGY_REGEN], card[ENERGY_REGEN]
         )
-        card_sort_map["energy_regen"] = percent_to_float(card_sort_map["共鸣效率"])
+        card_sort_map["energy_regen"] = card[ENERGY_REGEN] * 0.01
 
         card_sort_map["ph_detail"] = result.get("ph_detail", [])
 
@@ -300,10 +288,7 @@ class WuWaCalc(object):
                 # 角色攻击提升15%，共鸣效率达到250%后，当前角色全属性伤害提升30%
                 result["atk_percent"] += 0.15
                 if card_sort_map["energy_regen"] >= 2.5:
-                    card_sort_map["属性伤害加成"] = sum_percentages(
-                        "30%",
-                        card_sort_map["属性伤害加成"],
-                    )
+                    card[ATTRIBUTE_DMG] = sum_percent(30.0, card[ATTRIBUTE_DMG])
                 card_sort_map["ph_result"] = True
 
             # 失序彼岸之梦
@@ -311,112 +296,75 @@ class WuWaCalc(object):
                 ph_detail["ph_name"], ph_detail["ph_num"], SONATA_ANCIENT
             ):
                 # 角色共鸣能量为0时，暴击率提升35%
-                card_sort_map["暴击"] = sum_percentages(
-                    "20%",
-                    card_sort_map["暴击"],
-                )
+                card[CRIT_RATE] = sum_percent(20.0, card[CRIT_RATE])
                 card_sort_map["ph_result"] = True
 
-        base_atk = float(sum_numbers(_atk, _weapon_atk))
+        base_atk = _atk + _weapon_atk
         # 各种攻击百分比 = 武器副词条+武器谐振+固有技能
-        per_temp = percent_to_float(card_sort_map["攻击"])
+        per_temp = card[ATK_PERCENT] * 0.01
         card_sort_map["atk_percent"] = per_temp + result.get("atk_percent", 0)
         card_sort_map["atk_flat"] = float(result.get("atk_flat", 0))
-        card_sort_map["攻击"] = sum_numbers(
-            base_atk, result.get("攻击", 0), round(base_atk * per_temp)
-        )
-        card_sort_map["攻击"] = f"{card_sort_map['攻击'].split('.')[0]}"
+        card[ATK] = int(base_atk + phantom[ATK] + round(base_atk * per_temp))
 
-        base_life = float(_life)
-        per_life = percent_to_float(card_sort_map["生命"])
+        per_life = card[LIFE_PERCENT] * 0.01
         card_sort_map["life_percent"] = per_life + result.get("life_percent", 0)
         card_sort_map["life_flat"] = float(result.get("life_flat", 0))
-        card_sort_map["生命"] = sum_numbers(
-            _life, result.get("生命", 0), round(base_life * per_life)
-        )
-        card_sort_map["生命"] = f"{card_sort_map['生命'].split('.')[0]}"
+        card[LIFE] = int(_life + phantom[LIFE] + round(_life * per_life))
 
-        base_def = float(_def)
-        per_def = percent_to_float(card_sort_map["防御"])
+        per_def = card[DEF_PERCENT] * 0.01
         card_sort_map["def_percent"] = per_def + result.get("def_percent", 0)
         card_sort_map["def_flat"] = float(result.get("def_flat", 0))
-        card_sort_map["防御"] = sum_numbers(
-            _def, result.get("防御", 0), round(base_def * per_def)
-        )
-        card_sort_map["防御"] = f"{card_sort_map['防御'].split('.')[0]}"
+        card[DEF] = int(_def + phantom[DEF] + round(_def * per_def))
 
         # 固定暴击
-        char_crit_rate = "5%"
+        char_crit_rate = 5.0
         # 固定爆伤
-        char_crit_dmg = "150%"
+        char_crit_dmg = 150.0
 
-        card_sort_map["暴击"] = sum_percentages(
-            char_crit_rate, result.get("暴击", "0%"), card_sort_map["暴击"]
+        card[CRIT_RATE] = sum_percent(
+            char_crit_rate, phantom[CRIT_RATE], card[CRIT_RATE]
         )
-        card_sort_map["crit_rate"] = percent_to_float(card_sort_map["暴击"])
-        card_sort_map["暴击伤害"] = sum_percentages(
-            char_crit_dmg, result.get("暴击伤害", "0%"), card_sort_map["暴击伤害"]
-        )
-        card_sort_map["crit_dmg"] = percent_to_float(card_sort_map["暴击伤害"])
+        card_sort_map["crit_rate"] = card[CRIT_RATE] * 0.01
+        card[CRIT_DMG] = sum_percent(char_crit_dmg, phantom[CRIT_DMG], card[CRIT_DMG])
+        card_sort_map["crit_dmg"] = card[CRIT_DMG] * 0.01
 
-        card_sort_map[shuxing] = sum_percentages(
-            result.get(shuxing, "0%"),
-            card_sort_map.get(shuxing, "0%"),
-            card_sort_map.get("属性伤害加成", "0%"),
+        card[shuxing_index] = sum_percent(
+            phantom[shuxing_index], card[shuxing_index], card[ATTRIBUTE_DMG]
         )
-        card_sort_map["shuxing_bonus"] = percent_to_float(card_sort_map[shuxing])
+        card_sort_map["shuxing_bonus"] = card[shuxing_index] * 0.01
         card_sort_map["char_attr"] = role_attr
 
-        if "属性伤害加成" in card_sort_map:
-            del card_sort_map["属性伤害加成"]
-
-        card_sort_map["普攻伤害加成"] = sum_percentages(
-            result.get("普攻伤害加成", "0%"), card_sort_map.get("普攻伤害加成", "0%")
-        )
-        card_sort_map["attack_damage"] = percent_to_float(card_sort_map["普攻伤害加成"])
-
-        card_sort_map["重击伤害加成"] = sum_percentages(
-            result.get("重击伤害加成", "0%"), card_sort_map.get("重击伤害加成", "0%")
-        )
-        card_sort_map["hit_damage"] = percent_to_float(card_sort_map["重击伤害加成"])
-
-        card_sort_map["共鸣技能伤害加成"] = sum_percentages(
-            result.get("共鸣技能伤害加成", "0%"),
-            card_sort_map.get("共鸣技能伤害加成", "0%"),
-        )
-        card_sort_map["skill_damage"] = percent_to_float(
-            card_sort_map["共鸣技能伤害加成"]
-        )
-
-        card_sort_map["共鸣解放伤害加成"] = sum_percentages(
-            result.get("共鸣解放伤害加成", "0%"),
-            card_sort_map.get("共鸣解放伤害加成", "0%"),
-        )
-        card_sort_map["liberation_damage"] = percent_to_float(
-            card_sort_map["共鸣解放伤害加成"]
-        )
-
-        card_sort_map["声骸技能伤害加成"] = sum_percentages(
-            result.get("声骸技能伤害加成", "0%"),
-            card_sort_map.get("声骸技能伤害加成", "0%"),
-        )
-        card_sort_map["phantom_damage"] = percent_to_float(
-            card_sort_map["声骸技能伤害加成"]
-        )
-
-        card_sort_map["治疗效果加成"] = sum_percentages(
-            result.get("治疗效果加成", "0%"), card_sort_map.get("治疗效果加成", "0%")
-        )
-        card_sort_map["heal_bonus"] = percent_to_float(card_sort_map["治疗效果加成"])
+        for name, key in (
+            ("普攻伤害加成", "attack_damage"),
+            ("重击伤害加成", "hit_damage"),
+            ("共鸣技能伤害加成", "skill_damage"),
+            ("共鸣解放伤害加成", "liberation_damage"),
+            ("声骸技能伤害加成", "phantom_damage"),
+            ("治疗效果加成", "heal_bonus"),
+        ):
+            index = STAT_INDEX[name]
+            card[index] = sum_percent(phantom[index], card[index])
+            card_sort_map[key] = card[index] * 0.01
 
         card_sort_map["echo_id"] = result.get("echo_id")
+        card_sort_map["stat_vector"] = card
+        # 展示用的面板数值
+        card_sort_map.update(
+            vector_to_card(
+                card, always=CARD_STATS + (shuxing_index,), hidden=CARD_HIDDEN
+            )
+        )
         # logger.debug(f"面板数据: {card_sort_map}")
         return card_sort_map
 
-    def card_sort_map_to_attribute(self, card_sort_map: Dict):
+    def card_sort_map_to_attribute(
+        self, card_sort_map: Dict, record_effect: bool = True
+    ):
+        """record_effect=False 时不记录效果明细, 用于只需要伤害数值的排行计算"""
         attr = DamageAttribute(
             enemy_resistance=self.enemy_detail.enemy_resistance / 100,
             enemy_level=self.enemy_detail.enemy_level,
+            record_effect=record_effect,
         )
         attr.set_char_atk(card_sort_map["char_atk"])
         attr.set_char_life(card_sort_map["char_life"])
@@ -0,0 +1,414 @@
+"""
+声骸评分批量计算
+
+按 calc.json 的权重表把多个角色的声骸词条一次算完:
+- 每条声骸的主/副词条按 stat_vector 的下标展开为数值矩阵
+- 每个 (评分模板, 属性, cost) 预先展开为同样下标的权重行
+- 安装了 numpy 时整批做一次矩阵运算, 否则逐条声骸按权重行累加
+
+评分模块 (calculate.calc_phantom_score) 由资源下载提供, 批量计算启用前
+会把每个评分模板 (map/character/*/calc.json 及极限面板实际取到的模板)
+套用到极限面板上与其逐条对比, 只有对比一致的模板走批量计算, 其余继续逐条调用评分模块;
+对比在启动时或评分前通过 ensure_batch_score_verified 在线程中进行, 不阻塞事件循环
+"""
+
+import json
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from gsuid_core.logger import logger
+
+from ..api.model import Props
+from ..resource.constant import ATTRIBUTE_NAME_SET
+from .stat_vector import STAT_NAMES, parse_prop
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 极限面板, 用于校验批量评分
+LIMIT_PATH = Path(__file__).parents[1] / "map" / "1.json"
+# 各角色的评分模板, default 为通用模板
+CALC_MAP_PATH = Path(__file__).parents[1] / "map" / "character"
+# 声骸满分
+ECHO_MAX_SCORE = 50
+GRADES = ("c", "b", "a", "s", "ss", "sss")
+SKILL_DAMAGE = ("普攻伤害加成", "重击伤害加成", "共鸣技能伤害加成", "共鸣解放伤害加成")
+ELEMENT_DAMAGE = {f"{name}伤害加成" for name in ATTRIBUTE_NAME_SET}
+# 对比时允许的误差, 评分保留两位小数, 累加顺序不同时末位可能相差 0.01
+VERIFY_TOLERANCE = 0.01 + 1e-9
+
+# (评分模板, 角色属性, [(cost, 词条列表)]) 模板为空时该角色评分为 0
+RoleInput = Tuple[Optional[Dict], str, List[Tuple[int, List[Props]]]]
+EchoScore = Tuple[float, str]
+
+# 参与评分计算的模板字段
+TEMPLATE_FIELDS = (
+    "main_props",
+    "sub_props",
+    "skill_weight",
+    "props_grade",
+    "score_max",
+)
+
+# (模板内容, 属性, cost) -> (主词条权重行, 副词条权重行, 满分, 评级阈值)
+_tables: Dict[Tuple, Tuple[List[float], List[float], float, List]] = {}
+# id(模板) -> (模板, 模板内容), 持有模板引用保证 id 不被复用
+_template_keys: Dict[int, Tuple[Dict, str]] = {}
+_TEMPLATE_KEYS_MAX = 1024
+# verified: 对比一致的模板内容
+# generation: 每次 reset 加一, 校验期间评分模块被重新加载时丢弃旧的校验结果
+_state: Dict[str, Any] = {"enabled": None, "verified": set(), "generation": 0}
+_verify_lock = asyncio.Lock()
+
+
+def get_cost_index(cost: int) -> int:
+    """calc.json 中 score_max / props_grade 按 1, 3, 4 cost 排列"""
+    if cost == 4:
+        return 2
+    if cost == 3:
+        return 1
+    return 0
+
+
+def _weight_row(
+    props_map: Dict[str, float], attribute_name: str, skill_weight: List[float]
+) -> List[float]:
+    row = []
+    for name in STAT_NAMES:
+        if name in SKILL_DAMAGE and name not in props_map:
+            weight = (
+                props_map.get("技能伤害加成", 0)
+                * skill_weight[SKILL_DAMAGE.index(name)]
+            )
+        elif name in ELEMENT_DAMAGE:
+            weight = (
+                props_map.get("属性伤害加成", 0)
+                if name == f"{attribute_name}伤害加成"
+                else 0
+            )
+        else:
+            weight = props_map.get(name, 0)
+        row.append(float(weight))
+    return row
+
+
+def get_template_key(calc_map: Dict) -> str:
+    """按参与计算的字段区分模板, 同名模板内容不同时不会共用权重行"""
+    cached = _template_keys.get(id(calc_map))
+    if cached is not None and cached[0] is calc_map:
+        return cached[1]
+    key = json.dumps(
+        [calc_map.get(field) for field in TEMPLATE_FIELDS],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    if len(_template_keys) >= _TEMPLATE_KEYS_MAX:
+        _template_keys.clear()
+    _template_keys[id(calc_map)] = (calc_map, key)
+    return key
+
+
+def _get_table(template_key: str, calc_map: Dict, attribute_name: str, cost: int):
+    key = (template_key, attribute_name, cost)
+    table = _tables.get(key)
+    if table is None:
+        skill_weight = calc_map.get("skill_weight") or [0, 0, 0, 0]
+        cost_index = get_cost_index(cost)
+        table = (
+            _weight_row(
+                calc_map["main_props"].get(str(cost), {}), attribute_name, skill_weight
+            ),
+            _weight_row(calc_map["sub_props"], attribute_name, skill_weight),
+            calc_map["score_max"][cost_index],
+            calc_map["props_grade"][cost_index],
+        )
+        _tables[key] = table
+    return table
+
+
+def _grade(ratio: float, thresholds: List[float]) -> str:
+    index = 0
+    for i, threshold in enumerate(thresholds):
+        if ratio >= threshold:
+            index = i
+    return GRADES[min(index, len(GRADES) - 1)]
+
+
+class PropMatrix:
+    """
+    一批声骸的词条, 按列存放:
+    echo[k] 第几条声骸, part[k] 主词条0/副词条1, col[k] 属性下标, num[k] 数值
+    每条声骸对应 tables 中的一个权重表
+    """
+
+    def __init__(self):
+        self.echo: List[int] = []
+        self.part: List[int] = []
+        self.col: List[int] = []
+        self.num: List[float] = []
+        self.tables: List[Tuple] = []
+        self.echo_table: List[int] = []
+        self._table_index: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.echo_table)
+
+    def add_echo(self, props: List[Props], table: Tuple):
+        e = len(self.echo_table)
+        k = self._table_index.get(id(table))
+        if k is None:
+            k = self._table_index[id(table)] = len(self.tables)
+            self.tables.append(table)
+        self.echo_table.append(k)
+
+        # 前两条为主词条
+        for i, prop in enumerate(props):
+            index, num = parse_prop(prop.attributeName, prop.attributeValue)
+            if index is None:
+                continue
+            self.echo.append(e)
+            self.part.append(0 if i < 2 else 1)
+            self.col.append(index)
+            self.num.append(num)
+
+    def get_table(self, e: int) -> Tuple:
+        return self.tables[self.echo_table[e]]
+
+
+def _score_python(matrix: PropMatrix) -> List[float]:
+    tables = [matrix.get_table(e) for e in range(len(matrix))]
+    raw = [0.0] * len(matrix)
+    for e, part, col, num in zip(matrix.echo, matrix.part, matrix.col, matrix.num):
+        raw[e] += tables[e][part][col] * num
+    return [value / table[2] for value, table in zip(raw, tables)]
+
+
+def _score_numpy(matrix: PropMatrix) -> List[float]:
+    assert np is not None
+    echo = np.asarray(matrix.echo, dtype=np.intp)
+    echo_table = np.asarray(matrix.echo_table, dtype=np.intp)
+    # (权重表, 主/副词条, 属性) 的权重, 每个词条取对应的权重后按声骸求和
+    weights = np.asarray([t[:2] for t in matrix.tables], dtype=float)
+    weight = weights[echo_table[echo], matrix.part, matrix.col]
+    raw = np.bincount(echo, weights=weight * matrix.num, minlength=len(matrix))
+    score_max = np.asarray([t[2] for t in matrix.tables], dtype=float)
+    return (raw / score_max[echo_table]).tolist()
+
+
+def batch_phantom_score(
+    roles: Sequence[RoleInput], use_numpy: Optional[bool] = None
+) -> List[List[EchoScore]]:
+    """
+    批量计算声骸评分
+    roles: [(评分模板, 角色属性, [(cost, 词条列表)])]
+    返回每个角色每条声骸的 (评分, 评级), 与 calc_phantom_score 的结果一一对应
+    """
+    matrix = PropMatrix()
+    for calc_map, attribute_name, phantoms in roles:
+        if not calc_map:
+            continue
+        template_key = get_template_key(calc_map)
+        for cost, props in phantoms:
+            matrix.add_echo(
+                props, _get_table(template_key, calc_map, attribute_name, cost)
+            )
+
+    if use_numpy is None:
+        use_numpy = np is not None
+    if not len(matrix):
+        ratios = []
+    elif use_numpy:
+        ratios = _score_numpy(matrix)
+    else:
+        ratios = _score_python(matrix)
+
+    result = []
+    e = 0
+    for calc_map, _, phantoms in roles:
+        if not calc_map:
+            result.append([(0, "c")] * len(phantoms))
+            continue
+        role_result = []
+        for _ in phantoms:
+            ratio = ratios[e]
+            grade = _grade(ratio, matrix.get_table(e)[3])
+            role_result.append((round(ratio * ECHO_MAX_SCORE, 2), grade))
+            e += 1
+        result.append(role_result)
+    return result
+
+
+def _get_phantoms(role_detail) -> List[Tuple[int, List[Props]]]:
+    if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
+        return []
+    return [
+        (_phantom.cost, _phantom.get_props())
+        for _phantom in role_detail.phantomData.equipPhantomList
+        if _phantom and _phantom.phantomProp
+    ]
+
+
+def _scalar_score(role_id, phantoms, calc_map) -> List[EchoScore]:
+    from ..calculate import calc_phantom_score
+
+    return [
+        calc_phantom_score(role_id, props, cost, calc_map) for cost, props in phantoms
+    ]
+
+
+def load_calc_maps() -> List[Dict]:
+    """读取全部评分模板"""
+    return [
+        json.loads(path.read_text("utf-8"))
+        for path in sorted(CALC_MAP_PATH.glob("*/calc.json"))
+    ]
+
+
+def verify_batch_score() -> Set[str]:
+    """
+    在极限面板上与评分模块逐条对比, 每个评分模板分别套用到每个面板及其角色属性上
+    返回对比一致的模板
+    """
+    from ..api.model import RoleDetailData
+    from ..calculate import get_calc_map
+    from . import WuWaCalc
+
+    role_details = [
+        RoleDetailData(**i) for i in json.loads(LIMIT_PATH.read_text("utf-8"))
+    ]
+    cards = []
+    for role_detail in role_details:
+        calc = WuWaCalc(role_detail)
+        cards.append(
+            (
+                calc.enhance_summation_phantom_value(calc.prepare_phantom()),
+                _get_phantoms(role_detail),
+            )
+        )
+
+    # 模板内容 -> 模板, 包含评分模块实际返回的模板与全部 calc.json
+    templates: Dict[str, Dict] = {}
+    for role_detail in role_details:
+        role = role_detail.role
+        for phantom_card, _ in cards:
+            calc_map = get_calc_map(phantom_card, role.roleName, role.roleId)
+            if calc_map:
+                templates.setdefault(get_template_key(calc_map), calc_map)
+    for calc_map in load_calc_maps():
+        templates.setdefault(get_template_key(calc_map), calc_map)
+
+    verified = set()
+    for template_key, calc_map in templates.items():
+        roles = []
+        expected = []
+        for role_detail, (_, phantoms) in zip(role_details, cards):
+            role = role_detail.role
+            roles.append((calc_map, role.attributeName, phantoms))
+            expected.append(_scalar_score(role.roleId, phantoms, calc_map))
+        if _is_same(batch_phantom_score(roles), expected, calc_map.get("name", "")):
+            verified.add(template_key)
+    return verified
+
+
+def _is_same(
+    result: List[List[EchoScore]], expected: List[List[EchoScore]], name: str
+) -> bool:
+    for role_scores, role_expected in zip(result, expected):
+        for (score, grade), (expected_score, expected_grade) in zip(
+            role_scores, role_expected
+        ):
+            if (
+                abs(score - expected_score) > VERIFY_TOLERANCE
+                or grade != expected_grade
+            ):
+                logger.info(
+                    f"[鸣潮] 声骸批量评分与评分模块不一致 {name}: "
+                    f"{score}/{grade} != {expected_score}/{expected_grade}"
+                )
+                return False
+    return True
+
+
+def is_batch_score_enabled() -> bool:
+    """未校验时同步进行校验, 耗时较长, 在事件循环中应使用 ensure_batch_score_verified"""
+    if _state["enabled"] is None:
+        generation = _state["generation"]
+        try:
+            verified = verify_batch_score()
+        except Exception as e:
+            logger.warning(f"[鸣潮] 声骸批量评分校验失败: {e}")
+            verified = set()
+        if generation != _state["generation"]:
+            return False
+        _state["verified"] = verified
+        _state["enabled"] = bool(verified)
+        logger.info(
+            f"[鸣潮] 声骸批量评分: "
+            f"{f'启用, 模板 {len(verified)} 个' if verified else '未启用'}"
+        )
+    return _state["enabled"]
+
+
+async def ensure_batch_score_verified() -> bool:
+    """在线程中完成批量评分校验"""
+    if _state["enabled"] is None:
+        async with _verify_lock:
+            if _state["enabled"] is None:
+                await asyncio.to_thread(is_batch_score_enabled)
+    return bool(_state["enabled"])
+
+
+def reset_batch_score():
+    """评分模块或评分模板更新后重新校验"""
+    _tables.clear()
+    _template_keys.clear()
+    _state["enabled"] = None
+    _state["verified"] = set()
+    _state["generation"] += 1
+
+
+def score_roles(calcs: Sequence[Any]) -> List[float]:
+    """
+    计算多个角色的声骸总分 (未取整)
+    calcs 为已生成 calc_temp 的 WuWaCalc
+    模板对比一致的角色批量计算, 其余 (含尚未校验时) 逐条调用评分模块, 此处不触发校验
+    """
+    phantoms_list = [_get_phantoms(calc.role_detail) for calc in calcs]
+
+    batch = []
+    if _state["enabled"]:
+        verified = _state["verified"]
+        batch = [
+            i
+            for i, calc in enumerate(calcs)
+            if calc.calc_temp and get_template_key(calc.calc_temp) in verified
+        ]
+    scores: List[Optional[List[EchoScore]]] = [None] * len(calcs)
+    if batch:
+        batch_scores = batch_phantom_score(
+            [
+                (
+                    calcs[i].calc_temp,
+                    calcs[i].role_detail.role.attributeName,
+                    phantoms_list[i],
+                )
+                for i in batch
+            ]
+        )
+        for i, role_scores in zip(batch, batch_scores):
+            scores[i] = role_scores
+
+    totals = []
+    for calc, phantoms, role_scores in zip(calcs, phantoms_list, scores):
+        if role_scores is None:
+            role_scores = _scalar_score(
+                calc.role_detail.role.roleId, phantoms, calc.calc_temp
+            )
+        total = 0
+        for score, _ in role_scores:
+            total += score
+        totals.append(total)
+    return totals
@@ -0,0 +1,145 @@
+"""
+声骸/面板属性的数值向量
+
+每个属性固定一个下标, 数值存放在 array("d") 中:
+- 生命/攻击/防御 为固定值
+- 其余为百分数, 如 12.5 表示 12.5%, 每次累加后保留一位小数, 与面板展示一致
+计算过程只做数值运算, 仅在生成展示用的面板字典时格式化为字符串
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from gsuid_core.logger import logger
+
+from ..api.model import Props
+
+STAT_NAMES: Tuple[str, ...] = (
+    "生命",
+    "攻击",
+    "防御",
+    "生命%",
+    "攻击%",
+    "防御%",
+    "共鸣效率",
+    "暴击",
+    "暴击伤害",
+    "冷凝伤害加成",
+    "热熔伤害加成",
+    "导电伤害加成",
+    "气动伤害加成",
+    "衍射伤害加成",
+    "湮灭伤害加成",
+    "属性伤害加成",
+    "治疗效果加成",
+    "普攻伤害加成",
+    "重击伤害加成",
+    "共鸣技能伤害加成",
+    "共鸣解放伤害加成",
+    "声骸技能伤害加成",
+)
+STAT_INDEX: Dict[str, int] = {name: i for i, name in enumerate(STAT_NAMES)}
+
+LIFE, ATK, DEF = 0, 1, 2
+LIFE_PERCENT, ATK_PERCENT, DEF_PERCENT = 3, 4, 5
+ENERGY_REGEN = STAT_INDEX["共鸣效率"]
+CRIT_RATE = STAT_INDEX["暴击"]
+CRIT_DMG = STAT_INDEX["暴击伤害"]
+ATTRIBUTE_DMG = STAT_INDEX["属性伤害加成"]
+
+FLAT_STATS = (LIFE, ATK, DEF)
+# 角色面板始终展示的属性, 属性伤害加成并入角色对应属性后不单独展示
+CARD_STATS = FLAT_STATS + tuple(
+    STAT_INDEX[name]
+    for name in (
+        "共鸣效率",
+        "暴击",
+        "暴击伤害",
+        "治疗效果加成",
+        "普攻伤害加成",
+        "重击伤害加成",
+        "共鸣技能伤害加成",
+        "共鸣解放伤害加成",
+        "声骸技能伤害加成",
+    )
+)
+CARD_HIDDEN = (LIFE_PERCENT, ATK_PERCENT, DEF_PERCENT, ATTRIBUTE_DMG)
+BASE_NAMES = ("生命", "攻击", "防御")
+
+StatVector = array
+
+_ZERO = (0.0,) * len(STAT_NAMES)
+
+
+def new_vector() -> StatVector:
+    return array("d", _ZERO)
+
+
+def percent_index(name: str) -> Optional[int]:
+    """百分比属性的下标, 生命/攻击/防御 对应 生命%/攻击%/防御%"""
+    if name in BASE_NAMES:
+        name = f"{name}%"
+    return STAT_INDEX.get(name)
+
+
+@lru_cache(maxsize=1024)
+def parse_prop(name: str, value: str) -> Tuple[Optional[int], float]:
+    """
+    解析声骸词条, 返回 (下标, 数值)
+    带 % 的 生命/攻击/防御 为百分比, 不带 % 的为固定值
+    """
+    per = "%" in value
+    num = float(value.replace("%", ""))
+    index = percent_index(name) if per else STAT_INDEX.get(name)
+    if index is None:
+        logger.debug(f"未知属性 {name}: {value}")
+    return index, num
+
+
+def add_stat(vector: StatVector, index: int, value: float):
+    if index in FLAT_STATS or not vector[index]:
+        vector[index] += value
+    else:
+        vector[index] = round(vector[index] + value, 1)
+
+
+def sum_percent(*values: float) -> float:
+    """按顺序累加百分数并保留一位小数"""
+    total = 0.0
+    for value in values:
+        total += value
+    return round(total, 1)
+
+
+def add_text(vector: StatVector, name: str, value: str):
+    """累加 {"冷凝伤害加成": "12%"} 形式的效果"""
+    index, num = parse_prop(name, value)
+    if index is not None:
+        add_stat(vector, index, num)
+
+
+def add_props(vector: StatVector, props: Iterable[Props]):
+    for prop in props:
+        index, num = parse_prop(prop.attributeName, prop.attributeValue)
+        if index is not None:
+            add_stat(vector, index, num)
+
+
+def format_stat(index: int, value: float) -> str:
+    if index in FLAT_STATS:
+        return f"{int(value)}"
+    return f"{value:.1f}%"
+
+
+def vector_to_card(
+    vector: StatVector, always: Iterable[int] = (), hidden: Iterable[int] = ()
+) -> Dict[str, str]:
+    """生成展示用的面板字典, 包含非零属性与 always 中的属性, 不含 hidden 中的属性"""
+    keep = set(always)
+    skip = set(hidden)
+    return {
+        name: format_stat(i, vector[i])
+        for i, name in enumerate(STAT_NAMES)
+        if (vector[i] or i in keep) and i not in skip
+    }
@@ -62,5 +62,11 @@ def reload_calculate_module():
     for attr in attributes:
         val = getattr(module, attr)
         current_globals[attr] = val
-        
+
+    # 评分模块变化后批量评分需重新校验, 评分缓存需重新计算
+    from .calc.batch_score import reset_batch_score
+    from .score_memo import reset_calc_version
+
+    reset_batch_score()
+    reset_calc_version()
     logger.info("calculate 模块已重新加载")
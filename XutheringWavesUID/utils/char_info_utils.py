@@ -1,12 +1,11 @@
-import json
-from typing import Any, Dict, Generator, Union
-
-import aiofiles
+from typing import Any, Dict, Generator, Iterable, List, Optional, Union
 
 from gsuid_core.logger import logger
 
+from ..utils.api import model_struct
 from ..utils.api.model import RoleDetailData
-from .resource.RESOURCE_PATH import PLAYER_PATH
+from .panel_cache import panel_cache
+from .panel_store import get_panel_store
 
 PATTERN = (
     r"[\u4e00-\u9fa5a-zA-Z0-9\U0001F300-\U0001FAFF\U00002600-\U000027BF-—·()（）]+"
@@ -15,18 +14,34 @@ PATTERN = (
 async def get_all_role_detail_info_list(
     uid: str,
 ) -> Union[Generator[RoleDetailData, Any, None], None]:
-    path = PLAYER_PATH / uid / "rawData.json"
-    if not path.exists():
+    roles = await panel_cache.get_all(get_panel_store(), uid)
+    if roles is None:
+        return None
+
+    return iter(roles)
+
+
+async def get_all_role_detail_struct_list(
+    uid: str,
+) -> Optional[List[model_struct.RoleDetailData]]:
+    """只读的快速解码, 用于群排行等批量读取, 不经过面板缓存"""
+    raw = await get_panel_store().get_all_raw(uid)
+    if raw is None:
         return None
     try:
-        async with aiofiles.open(path, mode="r", encoding="utf-8") as f:
-            player_data = json.loads(await f.read())
+        return model_struct.decode_role_detail_list(raw)
     except Exception as e:
-        logger.exception(f"get role detail info failed {path}:", e)
-        path.unlink(missing_ok=True)
+        logger.warning(f"decode role detail failed {uid}: {e}")
         return None
 
-    return iter(RoleDetailData(**r) for r in player_data)
+
+async def get_role_detail_info_list(
+    uid: str, role_ids: Iterable[Union[int, str]]
+) -> List[RoleDetailData]:
+    """只读取指定角色"""
+    return await panel_cache.get_roles(
+        get_panel_store(), uid, [int(i) for i in role_ids]
+    )
 
 
 async def get_all_role_detail_info(uid: str) -> Union[Dict[str, RoleDetailData], None]:
@@ -131,6 +131,7 @@ class DamageAttribute:
         teammate_char_ids: Optional[List[int]] = None,
         env_spectro=False,
         online_level=1,
+        record_effect=True,
     ):
         """
         初始化 DamageAttribute 类的实例。
@@ -160,6 +161,7 @@ class DamageAttribute:
         :param echo_id: 声骸技能id
         :param char_attr: 角色属性 ["冷凝", "衍射", "导电", "热熔", "气动", "湮灭"]
         :param sync_strike: 协同攻击
+        :param record_effect: 是否记录效果明细, 排行等只需数值时关闭
         """
         if teammate_char_ids is None:
             teammate_char_ids = []
@@ -230,6 +232,9 @@ class DamageAttribute:
         self.energy_regen = energy_regen
         # 效果
         self.effect = []
+        # 不记录效果明细时, 只保留 get_effect 需要读取的 标题 -> 内容
+        self.record_effect = record_effect
+        self.effect_values: Dict[str, str] = {}
         # 敌人等级
         self.enemy_level = 0
         # 队友id
@@ -307,12 +312,18 @@ class DamageAttribute:
         return self
 
     def add_effect(self, title: str, msg: str):
+        if not self.record_effect:
+            if title and msg and title not in self.effect_values:
+                self.effect_values[title] = f"{msg}"
+            return
         effect = WavesEffect.add_effect(title, msg)
         if effect is None:
             return
         self.effect.append(effect)
 
     def get_effect(self, title: str):
+        if not self.record_effect:
+            return self.effect_values.get(title)
         for effect in self.effect:
             if effect.element_msg != title:
                 continue
@@ -323,6 +334,9 @@ class DamageAttribute:
 
         title = "敌人等级"
         msg = f"{enemy_level}级"
+        if not self.record_effect:
+            self.effect_values[title] = msg
+            return self
         for effect in self.effect:
             if effect.element_msg == title:
                 effect.element_value = msg
@@ -3,7 +3,7 @@ from typing import Any, Dict, List, Optional, Type, TypeVar
 from sqlalchemy import delete, null, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import and_, or_
-from sqlmodel import Field, col, select
+from sqlmodel import Field, SQLModel, col, select
 
 from gsuid_core.utils.database.base_models import (
     Bind,
@@ -14,6 +14,9 @@ from gsuid_core.utils.database.base_models import (
 from gsuid_core.utils.database.startup import exec_list
 from gsuid_core.webconsole.mount_app import GsAdminModel, PageSchema, site
 
+from ..api.token_pool import public_token_pool
+from ..cache import credential_cache
+
 exec_list.extend(
     [
         'ALTER TABLE WavesUser ADD COLUMN platform TEXT DEFAULT ""',
@@ -28,6 +31,8 @@ exec_list.extend(
 
 T_WavesBind = TypeVar("T_WavesBind", bound="WavesBind")
 T_WavesUser = TypeVar("T_WavesUser", bound="WavesUser")
+T_WavesGroupBind = TypeVar("T_WavesGroupBind", bound="WavesGroupBind")
+T_WavesRoleScore = TypeVar("T_WavesRoleScore", bound="WavesRoleScore")
 
 
 class WavesBind(Bind, table=True):
@@ -36,15 +41,26 @@ class WavesBind(Bind, table=True):
     pgr_uid: Optional[str] = Field(default=None, title="战双UID")
 
     @classmethod
-    @with_session
-    async def get_group_all_uid(
-        cls: Type[T_WavesBind], session: AsyncSession, group_id: Optional[str] = None
-    ):
-        """根据传入`group_id`获取该群号下所有绑定`uid`列表"""
-        result = await session.scalars(
-            select(cls).where(col(cls.group_id).contains(group_id))
-        )
-        return result.all()
+    async def update_data(cls, user_id: str, bot_id: str, **data) -> int:
+        """uid/group_id 变化时同步群成员表"""
+        code = await super().update_data(user_id, bot_id, **data)
+        if "uid" in data or "group_id" in data:
+            await WavesGroupBind.sync_bind(user_id, bot_id)
+        return code
+
+    @classmethod
+    async def delete_uid(cls, user_id: str, bot_id: str, *args, **kwargs):
+        """不依赖父类是否经过 update_data, 删除后同步群成员表"""
+        res = await super().delete_uid(user_id, bot_id, *args, **kwargs)
+        await WavesGroupBind.sync_bind(user_id, bot_id)
+        return res
+
+    @classmethod
+    async def switch_uid_by_game(cls, user_id: str, bot_id: str, *args, **kwargs):
+        """不依赖父类是否经过 update_data, 切换后同步群成员表"""
+        res = await super().switch_uid_by_game(user_id, bot_id, *args, **kwargs)
+        await WavesGroupBind.sync_bind(user_id, bot_id)
+        return res
 
     @classmethod
     async def insert_waves_uid(
@@ -74,6 +90,7 @@ class WavesBind(Bind, table=True):
                 bot_id=bot_id,
                 **{"uid": uid, "group_id": group_id},
             )
+            await WavesGroupBind.sync_bind(user_id, bot_id)
             return code
 
         result = await cls.select_data(user_id, bot_id)
@@ -109,6 +126,155 @@ class WavesBind(Bind, table=True):
         return res
 
 
+class WavesGroupBind(SQLModel, table=True):
+    """
+    群成员表, 每行为 (群号, 账号, 平台, 单个uid)
+    由 WavesBind 中下划线连接的 group_id/uid 展开而来, 群排行按 group_id 索引查询
+    """
+
+    __table_args__: Dict[str, Any] = {"extend_existing": True}
+    id: Optional[int] = Field(default=None, primary_key=True, title="序号")
+    group_id: str = Field(index=True, title="群号")
+    user_id: str = Field(title="账号")
+    bot_id: str = Field(title="平台")
+    uid: str = Field(title="鸣潮UID")
+
+    @staticmethod
+    def expand_bind(bind: WavesBind) -> List["WavesGroupBind"]:
+        groups = [i for i in (bind.group_id or "").split("_") if i]
+        uids = [i for i in (bind.uid or "").split("_") if i]
+        return [
+            WavesGroupBind(
+                group_id=group_id, user_id=bind.user_id, bot_id=bind.bot_id, uid=uid
+            )
+            for group_id in groups
+            for uid in uids
+        ]
+
+    @classmethod
+    @with_session
+    async def sync_bind(
+        cls: Type[T_WavesGroupBind], session: AsyncSession, user_id: str, bot_id: str
+    ):
+        """按 WavesBind 当前数据重建该用户的成员记录"""
+        result = await session.scalars(
+            select(WavesBind).where(
+                col(WavesBind.user_id) == user_id, col(WavesBind.bot_id) == bot_id
+            )
+        )
+        await session.execute(
+            delete(cls).where(
+                and_(col(cls.user_id) == user_id, col(cls.bot_id) == bot_id)
+            )
+        )
+        for bind in result.all():
+            session.add_all(cls.expand_bind(bind))
+
+    @classmethod
+    @with_session
+    async def rebuild(cls: Type[T_WavesGroupBind], session: AsyncSession) -> int:
+        """由 WavesBind 全量重建, 返回成员记录数"""
+        result = await session.scalars(select(WavesBind))
+        rows = [row for bind in result.all() for row in cls.expand_bind(bind)]
+        await session.execute(delete(cls))
+        session.add_all(rows)
+        return len(rows)
+
+    @classmethod
+    @with_session
+    async def get_group_members(
+        cls: Type[T_WavesGroupBind], session: AsyncSession, group_id: str
+    ) -> List[T_WavesGroupBind]:
+        """群内所有绑定的 (账号, uid)"""
+        result = await session.scalars(
+            select(cls).where(col(cls.group_id) == group_id)
+        )
+        return list(result.all())
+
+
+class WavesRoleScore(SQLModel, table=True):
+    """
+    角色评分缓存, 每个 (uid, 角色) 一行
+    以 (面板哈希, 评分模块版本, 伤害模块版本) 判断是否有效, 面板或模块变化后重新计算
+    """
+
+    __table_args__: Dict[str, Any] = {"extend_existing": True}
+    id: Optional[int] = Field(default=None, primary_key=True, title="序号")
+    uid: str = Field(index=True, title="鸣潮UID")
+    role_id: int = Field(title="角色ID")
+    panel_hash: str = Field(index=True, title="面板哈希")
+    calc_version: str = Field(title="评分模块版本")
+    damage_version: str = Field(title="伤害模块版本")
+    score: float = Field(default=0, title="声骸评分")
+    score_bg: str = Field(default="", title="评分背景")
+    sonata_name: str = Field(default="", title="合鸣效果")
+    # 特殊合鸣组合的展示名, 如 洛2+2
+    sonata_alias: str = Field(default="", title="合鸣展示名")
+    # 未计算期望伤害时为 False, 计算过但角色没有伤害计算时 expected_damage 为 None
+    has_expected: bool = Field(default=False, title="已计算期望伤害")
+    expected_damage: Optional[str] = Field(default=None, title="期望伤害")
+    expected_name: str = Field(default="", title="期望伤害名字")
+
+    @classmethod
+    @with_session
+    async def get_by_hash(
+        cls: Type[T_WavesRoleScore],
+        session: AsyncSession,
+        panel_hashes: List[str],
+        calc_version: str,
+        damage_version: str,
+    ) -> Dict[str, T_WavesRoleScore]:
+        """面板哈希 -> 当前版本下的评分"""
+        result: Dict[str, T_WavesRoleScore] = {}
+        # 分批查询, 避免超过 sqlite 的参数数量上限
+        for i in range(0, len(panel_hashes), 500):
+            rows = await session.scalars(
+                select(cls).where(
+                    col(cls.panel_hash).in_(panel_hashes[i : i + 500]),
+                    col(cls.calc_version) == calc_version,
+                    col(cls.damage_version) == damage_version,
+                )
+            )
+            for row in rows.all():
+                result[row.panel_hash] = row
+        return result
+
+    @classmethod
+    @with_session
+    async def save_scores(
+        cls: Type[T_WavesRoleScore],
+        session: AsyncSession,
+        scores: List[T_WavesRoleScore],
+    ):
+        """写入评分, 替换同一 (uid, 角色) 的旧记录"""
+        for row in scores:
+            await session.execute(
+                delete(cls).where(
+                    col(cls.uid) == row.uid, col(cls.role_id) == row.role_id
+                )
+            )
+        session.add_all([cls(**row.model_dump(exclude={"id"})) for row in scores])
+
+    @classmethod
+    @with_session
+    async def delete_stale(
+        cls: Type[T_WavesRoleScore],
+        session: AsyncSession,
+        calc_version: str,
+        damage_version: str,
+    ) -> int:
+        """删除旧版本模块计算的记录, 返回删除数"""
+        result = await session.execute(
+            delete(cls).where(
+                or_(
+                    col(cls.calc_version) != calc_version,
+                    col(cls.damage_version) != damage_version,
+                )
+            )
+        )
+        return result.rowcount or 0
+
+
 class WavesUser(User, table=True):
     __table_args__: Dict[str, Any] = {"extend_existing": True}
     cookie: str = Field(default="", title="Cookie")
@@ -133,6 +299,8 @@ class WavesUser(User, table=True):
             .values(status=mark)
         )
         await session.execute(sql)
+        credential_cache.invalidate(uid=uid, cookie=cookie)
+        public_token_pool.discard(cookie)
         return True
 
     @classmethod
@@ -252,6 +420,7 @@ class WavesUser(User, table=True):
             or_(col(cls.status) == "无效", col(cls.cookie) == ""),
         )
         result = await session.execute(sql)
+        credential_cache.clear()
         return result.rowcount
 
     @classmethod
@@ -271,6 +440,7 @@ class WavesUser(User, table=True):
             )
         )
         result = await session.execute(sql)
+        credential_cache.invalidate(uid=uid)
         return result.rowcount
 
 
@@ -2,12 +2,10 @@ from typing import Dict, Optional
 
 from pydantic import BaseModel
 
-from .calc import WuWaCalc
 from ..utils.api.model import RoleDetailData
-from .damage.abstract import DamageRankRegister
 from .damage.utils import comma_separated_number
 from .char_info_utils import get_all_role_detail_info
-from .calculate import get_calc_map, calc_phantom_score, get_total_score_bg
+from .score_memo import get_role_scores
 
 
 class WavesCharRank(BaseModel):
@@ -50,71 +48,23 @@ async def get_waves_char_rank(uid, all_role_detail, need_expected_damage=False):
         temp = all_role_detail.values()
     else:
         temp = all_role_detail if all_role_detail else []
-    waves_char_rank = []
-    for role_detail in temp:
-        if not isinstance(role_detail, RoleDetailData):
-            role_detail = RoleDetailData(**role_detail)
+    role_details = [
+        i if isinstance(i, RoleDetailData) else RoleDetailData(**i) for i in temp
+    ]
 
-        phantom_score = 0
-        calc: WuWaCalc = WuWaCalc(role_detail)
-        # calc_temp = None
-        expected_damage = None
+    scores = await get_role_scores(
+        [(uid, role_detail) for role_detail in role_details], need_expected_damage
+    )
 
-        sonataName = ""
+    waves_char_rank = []
+    for role_detail, role_score in zip(role_details, scores):
+        expected_damage = None
         expected_name = ""
-        if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
-            equipPhantomList = role_detail.phantomData.equipPhantomList
-
-            calc.phantom_pre = calc.prepare_phantom()
-            calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-            calc.calc_temp = get_calc_map(
-                calc.phantom_card,
-                role_detail.role.roleName,
-                role_detail.role.roleId,
-            )
-            for i, _phantom in enumerate(equipPhantomList):
-                if _phantom and _phantom.phantomProp:
-                    props = _phantom.get_props()
-                    _score, _bg = calc_phantom_score(
-                        role_detail.role.roleId, props, _phantom.cost, calc.calc_temp
-                    )
-                    phantom_score += _score
-
-            if need_expected_damage:
-                rankDetail = DamageRankRegister.find_class(str(role_detail.role.roleId))
-                if rankDetail:
-                    calc.role_card = calc.enhance_summation_card_value(
-                        calc.phantom_card
-                    )
-                    calc.damageAttribute = calc.card_sort_map_to_attribute(
-                        calc.role_card
-                    )
-                    _, expected_damage = rankDetail["func"](
-                        calc.damageAttribute, role_detail
-                    )
-                    expected_damage = comma_separated_number(expected_damage)
-                    expected_name = rankDetail["title"]
-
-            for ph_detail in calc.phantom_pre.get("ph_detail", []):
-                if ph_detail.get("ph_name") and ph_detail.get("ph_num") == 5:
-                    sonataName = ph_detail["ph_name"]
-                    break
-
-                if ph_detail.get("ph_name") and ph_detail.get("isFull"):
-                    sonataName = ph_detail["ph_name"]
-                    break
-
-            if role_detail.role.roleId == 1606:
-                roccia_part_1, roccia_part_2 = False, False
-                for ph_detail in calc.phantom_pre.get("ph_detail", []):
-                    if ph_detail.get("ph_name") == "沉日劫明" and ph_detail.get("ph_num") >= 2:
-                        roccia_part_1 = True
-                    if ph_detail.get("ph_name") == "幽夜隐匿之帷" and ph_detail.get("ph_num") >= 2:
-                        roccia_part_2 = True
-                if roccia_part_1 and roccia_part_2:
-                    sonataName = "洛2+2"
+        if need_expected_damage and role_score.expected_damage is not None:
+            expected_damage = comma_separated_number(role_score.expected_damage)
+            expected_name = role_score.expected_name
 
-        phantom_score = round(phantom_score, 2)
+        phantom_score = round(role_score.score, 2)
         wcr = WavesCharRank(
             **{
                 "roleId": role_detail.role.roleId,
@@ -124,14 +74,12 @@ async def get_waves_char_rank(uid, all_role_detail, need_expected_damage=False):
                 "chain": role_detail.get_chain_num(),
                 "chainName": role_detail.get_chain_name(),
                 "score": phantom_score,
-                "score_bg": get_total_score_bg(
-                    role_detail.role.roleName, phantom_score, calc.calc_temp
-                ),
+                "score_bg": role_score.score_bg,
                 "expected_damage": expected_damage,
                 "weaponId": role_detail.weaponData.weapon.weaponId,
                 "weaponLevel": role_detail.weaponData.level,
                 "weaponResonLevel": role_detail.weaponData.resonLevel,
-                "sonataName": sonataName,
+                "sonataName": role_score.sonata_alias or role_score.sonata_name,
                 "expected_name": expected_name,
             }
         )
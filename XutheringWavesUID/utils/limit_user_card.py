@@ -3,7 +3,10 @@ from pathlib import Path
 
 import aiofiles
 
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.panel_cache import panel_cache
+from ..utils.panel_store import get_panel_store
+from ..utils.player_summary import invalidate_player_summary
+from ..utils.player_writer import player_writer
 
 MAP_PATH = Path(__file__).parent / "map"
 LIMIT_PATH = MAP_PATH / "1.json"
@@ -13,13 +16,19 @@ async def load_limit_user_card():
     async with aiofiles.open(LIMIT_PATH, "r", encoding="UTF-8") as f:
         data = json.loads(await f.read())
 
-    LIMIT_USER_PATH = PLAYER_PATH / "1"
-    if not LIMIT_USER_PATH.exists():
-        LIMIT_USER_PATH.mkdir(parents=True, exist_ok=True)
-
-    async with aiofiles.open(
-        LIMIT_USER_PATH / "rawData.json", "w", encoding="UTF-8"
-    ) as f:
-        await f.write(json.dumps(data, ensure_ascii=False))
+    # 极限面板以 uid "1" 写入当前的面板存储, 与玩家面板读取方式一致
+    store = get_panel_store()
+    async with player_writer.lock("1"):
+        role_ids = {item["role"]["roleId"] for item in data}
+        old_data = await store.get_all("1") or []
+        removed = [
+            item["role"]["roleId"]
+            for item in old_data
+            if item["role"]["roleId"] not in role_ids
+        ]
+        await store.delete("1", removed)
+        await store.upsert("1", data)
+        panel_cache.invalidate("1")
+    await invalidate_player_summary("1")
 
     return data
@@ -77,4 +77,9 @@ except Exception:
 
 def reload_all_register():
     register_damage(reload=True)
-    register_rank(reload=True)
\ No newline at end of file
+    register_rank(reload=True)
+
+    # 伤害模块变化后评分缓存中的期望伤害需重新计算
+    from ....utils.score_memo import reset_damage_version
+
+    reset_damage_version()
\ No newline at end of file
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..utils.api.model import RoleDetailData
+from .panel_store import PanelStore
+
+
+def get_panel_cache_max_size() -> int:
+    from ..wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("PanelCacheMaxSize").data or 0
+
+
+class _Entry:
+    __slots__ = ("store", "version", "roles", "size")
+
+    def __init__(
+        self,
+        store: str,
+        version: Tuple[float, int],
+        roles: List[RoleDetailData],
+    ):
+        self.store = store
+        self.version = version
+        self.roles = roles
+        # 以原始数据字节数近似内存占用
+        self.size = version[1]
+
+
+class PanelCache:
+    """
+    已解析的账号面板缓存
+    - 以存储中的 (修改时间, 字节数) 作为版本, 版本变化即失效
+    - save_card_info 写入后立即失效
+    - 按原始数据大小限制总容量, LRU 淘汰
+    缓存的 RoleDetailData 为共享对象, 调用方修改前需自行 deepcopy
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _pop(self, uid: str):
+        entry = self._entries.pop(uid, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, uid: str):
+        self._pop(uid)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    async def get_all(
+        self, store: PanelStore, uid: str
+    ) -> Optional[List[RoleDetailData]]:
+        max_size = get_panel_cache_max_size() * 1024 * 1024
+        if max_size <= 0:
+            if self._entries:
+                self.clear()
+            player_data = await store.get_all(uid)
+            if player_data is None:
+                return None
+            return [RoleDetailData(**r) for r in player_data]
+
+        version = await store.version(uid)
+        if version is None:
+            self._pop(uid)
+            return None
+
+        entry = self._entries.get(uid)
+        if entry and entry.store == store.name and entry.version == version:
+            self._entries.move_to_end(uid)
+            self._stats["hits"] += 1
+            return entry.roles
+
+        self._stats["misses"] += 1
+        self._pop(uid)
+        player_data = await store.get_all(uid)
+        if player_data is None:
+            return None
+        roles = [RoleDetailData(**r) for r in player_data]
+
+        # 读取期间被写入则不缓存, 下次按新版本重新读取
+        if await store.version(uid) == version:
+            entry = _Entry(store.name, version, roles)
+            if entry.size <= max_size:
+                self._entries[uid] = entry
+                self._bytes += entry.size
+                while self._bytes > max_size:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= old.size
+                    self._stats["evictions"] += 1
+        return roles
+
+    async def get_roles(
+        self, store: PanelStore, uid: str, role_ids: Iterable[int]
+    ) -> List[RoleDetailData]:
+        """指定角色, 已缓存时直接取用, 否则只读取这些角色"""
+        role_ids = set(role_ids)
+        entry = self._entries.get(uid)
+        if (
+            entry
+            and entry.store == store.name
+            and entry.version == await store.version(uid)
+        ):
+            self._entries.move_to_end(uid)
+            self._stats["hits"] += 1
+            return [r for r in entry.roles if r.role.roleId in role_ids]
+
+        player_data = await store.get_roles(uid, role_ids)
+        return [RoleDetailData(**r) for r in player_data.values()]
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "size": len(self._entries), "bytes": self._bytes}
+
+
+panel_cache = PanelCache()
@@ -0,0 +1,388 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiofiles
+
+from gsuid_core.logger import logger
+
+from .player_writer import player_writer
+from .player_codec import CODEC_NONE, file_codec_sync
+from .player_path import get_player_path, iter_player_paths
+from .resource.RESOURCE_PATH import PLAYER_PATH
+
+PANEL_DB_PATH = PLAYER_PATH / "panel.db"
+
+
+def get_panel_store_backend() -> str:
+    from ..wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("PanelStoreBackend").data or "json"
+
+
+class PanelStore(ABC):
+    """
+    角色面板存储, 以 (uid, roleId) 为键保存角色详情原始数据
+    """
+
+    name = ""
+
+    @abstractmethod
+    async def get_all(self, uid: str) -> Optional[List[Dict]]:
+        """账号全部角色, 无数据返回None"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all_raw(self, uid: str) -> Optional[bytes]:
+        """账号全部角色的 JSON 数组原始字节, 供 msgspec 直接解码"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_roles(self, uid: str, role_ids: Iterable[int]) -> Dict[int, Dict]:
+        raise NotImplementedError
+
+    async def get_role(self, uid: str, role_id: int) -> Optional[Dict]:
+        return (await self.get_roles(uid, [role_id])).get(role_id)
+
+    @abstractmethod
+    async def version(self, uid: str) -> Optional[Tuple[float, int]]:
+        """账号数据的版本 (修改时间, 字节数), 无数据返回None"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert(self, uid: str, roles: List[Dict]):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, uid: str, role_ids: Iterable[int]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def uids(self) -> List[str]:
+        raise NotImplementedError
+
+
+def dump_role_list(roles: List[Dict]) -> Tuple[bytes, Dict[str, List[int]]]:
+    """序列化为 JSON 数组, 同时返回每个角色的 [字节偏移, 长度]"""
+    parts = [json.dumps(item, ensure_ascii=False).encode("utf-8") for item in roles]
+    index = {}
+    offset = 1
+    for item, part in zip(roles, parts):
+        index[str(item["role"]["roleId"])] = [offset, len(part)]
+        offset += len(part) + 2
+    return b"[" + b", ".join(parts) + b"]", index
+
+
+def scan_role_list(raw: bytes) -> Tuple[List[Dict], Dict[str, List[int]]]:
+    """解析旧文件, 顺带计算每个角色的字节偏移"""
+    text = raw.decode("utf-8")
+    decoder = json.JSONDecoder()
+    roles = []
+    index = {}
+    pos = text.index("[") + 1
+    byte_pos = len(text[:pos].encode("utf-8"))
+    while True:
+        start = pos
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            break
+        byte_pos += len(text[start:pos].encode("utf-8"))
+        item, end = decoder.raw_decode(text, pos)
+        length = len(text[pos:end].encode("utf-8"))
+        index[str(item["role"]["roleId"])] = [byte_pos, length]
+        roles.append(item)
+        byte_pos += length
+        pos = end
+    return roles, index
+
+
+class JsonPanelStore(PanelStore):
+    """
+    兼容旧版本的 <玩家目录>/rawData.json, 写入时重写整个文件 (延迟合并, 原子替换)
+    旁路索引 rawData.idx 记录每个角色的字节偏移, 读取单个角色时只读取对应片段
+    开启压缩后文件无法按偏移读取, 不使用索引
+    """
+
+    name = "json"
+
+    def get_path(self, uid: str) -> Path:
+        return get_player_path(uid) / "rawData.json"
+
+    def get_index_path(self, uid: str) -> Path:
+        return get_player_path(uid) / "rawData.idx"
+
+    async def _write_index(self, uid: str, index: Dict[str, List[int]]):
+        path = self.get_path(uid)
+        # 压缩后的文件无法按偏移读取, 不写索引
+        if file_codec_sync(path) != CODEC_NONE:
+            return
+        try:
+            stat = path.stat()
+            data = json.dumps(
+                {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "roles": index}
+            )
+            await player_writer.write(
+                self.get_index_path(uid), data.encode("utf-8"), delay=0
+            )
+        except Exception as e:
+            logger.warning(f"save panel index failed {uid}: {e}")
+
+    async def _read_index(self, uid: str) -> Optional[Dict[str, List[int]]]:
+        """索引与数据文件的修改时间/大小一致时才有效"""
+        path = self.get_path(uid)
+        if player_writer.get_pending(path):
+            # 尚未落盘, 磁盘上的索引对应旧内容
+            return None
+        try:
+            stat = path.stat()
+            async with aiofiles.open(self.get_index_path(uid), "r") as f:
+                index = json.loads(await f.read())
+        except Exception:
+            return None
+        if index.get("mtime_ns") != stat.st_mtime_ns or index.get("size") != stat.st_size:
+            return None
+        return index["roles"]
+
+    async def _load(
+        self, uid: str, write_index: bool = False
+    ) -> Optional[Dict[int, Dict]]:
+        path = self.get_path(uid)
+        is_pending = player_writer.get_pending(path) is not None
+        raw = await player_writer.read(path)
+        if raw is None:
+            return None
+        try:
+            player_data, index = scan_role_list(raw)
+        except Exception as e:
+            # 文件为原子写入, 解析失败说明文件本身损坏, 保留以便排查
+            logger.exception(f"load panel failed {path}:", e)
+            return None
+        if write_index and not is_pending:
+            await self._write_index(uid, index)
+        return {d["role"]["roleId"]: d for d in player_data}
+
+    async def _save(self, uid: str, data: Dict[int, Dict]):
+        raw, index = dump_role_list(list(data.values()))
+        # 落盘后再写索引, 保证索引与文件一致
+        await player_writer.write(
+            self.get_path(uid), raw, on_flush=lambda: self._write_index(uid, index)
+        )
+
+    async def version(self, uid: str) -> Optional[Tuple[float, int]]:
+        pending = player_writer.get_pending(self.get_path(uid))
+        if pending is not None:
+            return -pending[0], len(pending[1])
+        try:
+            stat = self.get_path(uid).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def get_all(self, uid: str) -> Optional[List[Dict]]:
+        data = await self._load(uid)
+        return list(data.values()) if data is not None else None
+
+    async def get_all_raw(self, uid: str) -> Optional[bytes]:
+        return await player_writer.read(self.get_path(uid))
+
+    async def get_roles(self, uid: str, role_ids: Iterable[int]) -> Dict[int, Dict]:
+        index = await self._read_index(uid)
+        if index is None:
+            # 旧文件或索引过期, 完整读取一次并重建索引
+            data = await self._load(uid, write_index=True) or {}
+            return {i: data[i] for i in role_ids if i in data}
+
+        result = {}
+        try:
+            async with aiofiles.open(self.get_path(uid), mode="rb") as f:
+                for role_id in role_ids:
+                    pos = index.get(str(role_id))
+                    if not pos:
+                        continue
+                    await f.seek(pos[0])
+                    result[role_id] = json.loads(await f.read(pos[1]))
+        except Exception as e:
+            # 索引损坏时回退为完整读取
+            logger.warning(f"read panel by index failed {uid}: {e}")
+            data = await self._load(uid, write_index=True) or {}
+            return {i: data[i] for i in role_ids if i in data}
+        return result
+
+    async def upsert(self, uid: str, roles: List[Dict]):
+        if not roles:
+            return
+        data = await self._load(uid) or {}
+        for item in roles:
+            data[item["role"]["roleId"]] = item
+        await self._save(uid, data)
+
+    async def delete(self, uid: str, role_ids: Iterable[int]):
+        data = await self._load(uid)
+        if not data:
+            return
+        removed = [data.pop(i) for i in role_ids if i in data]
+        if removed:
+            await self._save(uid, data)
+
+    def uids(self) -> List[str]:
+        return [
+            uid
+            for uid, path in iter_player_paths()
+            if (path / "rawData.json").exists()
+        ]
+
+
+class SqlitePanelStore(PanelStore):
+    """
+    SQLite(WAL) 存储, 单角色读写只涉及该角色一行
+    sqlite3 为同步接口, 在线程中执行
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS panel ("
+                "uid TEXT NOT NULL, "
+                "role_id INTEGER NOT NULL, "
+                "data TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "PRIMARY KEY (uid, role_id))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: Iterable = (), many: bool = False):
+        with self._lock:
+            conn = self._connect()
+            if many:
+                conn.executemany(sql, params)
+                conn.commit()
+                return []
+            rows = conn.execute(sql, tuple(params)).fetchall()
+            conn.commit()
+            return rows
+
+    async def _run(self, sql: str, params: Iterable = (), many: bool = False):
+        return await asyncio.to_thread(self._execute, sql, params, many)
+
+    async def get_all(self, uid: str) -> Optional[List[Dict]]:
+        # 按首次写入顺序返回, 与 rawData.json 保持一致
+        rows = await self._run(
+            "SELECT data FROM panel WHERE uid = ? ORDER BY rowid", (uid,)
+        )
+        if not rows:
+            return None
+        return [json.loads(r[0]) for r in rows]
+
+    async def get_all_raw(self, uid: str) -> Optional[bytes]:
+        rows = await self._run(
+            "SELECT data FROM panel WHERE uid = ? ORDER BY rowid", (uid,)
+        )
+        if not rows:
+            return None
+        return ("[" + ",".join(r[0] for r in rows) + "]").encode("utf-8")
+
+    async def version(self, uid: str) -> Optional[Tuple[float, int]]:
+        rows = await self._run(
+            "SELECT MAX(updated_at), SUM(LENGTH(data)) FROM panel WHERE uid = ?",
+            (uid,),
+        )
+        if not rows or rows[0][0] is None:
+            return None
+        return rows[0][0], rows[0][1]
+
+    async def get_roles(self, uid: str, role_ids: Iterable[int]) -> Dict[int, Dict]:
+        role_ids = list(role_ids)
+        if not role_ids:
+            return {}
+        placeholders = ",".join("?" * len(role_ids))
+        rows = await self._run(
+            f"SELECT role_id, data FROM panel WHERE uid = ? AND role_id IN ({placeholders})",
+            (uid, *role_ids),
+        )
+        return {r[0]: json.loads(r[1]) for r in rows}
+
+    async def upsert(self, uid: str, roles: List[Dict]):
+        if not roles:
+            return
+        now = time.time()
+        params = [
+            (
+                uid,
+                item["role"]["roleId"],
+                json.dumps(item, ensure_ascii=False, separators=(",", ":")),
+                now,
+            )
+            for item in roles
+        ]
+        await self._run(
+            "INSERT INTO panel (uid, role_id, data, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(uid, role_id) DO UPDATE SET "
+            "data = excluded.data, updated_at = excluded.updated_at",
+            params,
+            many=True,
+        )
+
+    async def delete(self, uid: str, role_ids: Iterable[int]):
+        params = [(uid, i) for i in role_ids]
+        if params:
+            await self._run(
+                "DELETE FROM panel WHERE uid = ? AND role_id = ?", params, many=True
+            )
+
+    def uids(self) -> List[str]:
+        if not self.db_path.exists():
+            return []
+        return [r[0] for r in self._execute("SELECT DISTINCT uid FROM panel")]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+json_panel_store = JsonPanelStore()
+sqlite_panel_store = SqlitePanelStore(PANEL_DB_PATH)
+
+PANEL_STORES: Dict[str, PanelStore] = {
+    json_panel_store.name: json_panel_store,
+    sqlite_panel_store.name: sqlite_panel_store,
+}
+
+
+def get_panel_store() -> PanelStore:
+    return PANEL_STORES.get(get_panel_store_backend(), json_panel_store)
+
+
+async def migrate_panel_store(src: PanelStore, dst: PanelStore) -> int:
+    """将 src 中全部账号的面板数据写入 dst, 返回迁移的账号数"""
+    count = 0
+    for uid in src.uids():
+        roles = await src.get_all(uid)
+        if not roles:
+            continue
+        try:
+            await dst.upsert(uid, roles)
+            count += 1
+        except Exception as e:
+            logger.exception(f"[鸣潮] 迁移面板数据失败 uid={uid}:", e)
+    return count
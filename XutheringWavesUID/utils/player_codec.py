@@ -0,0 +1,133 @@
+import asyncio
+import gzip
+from pathlib import Path
+from typing import Optional, Tuple
+
+from gsuid_core.logger import logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODEC_NONE = "none"
+CODEC_GZIP = "gzip"
+CODEC_ZSTD = "zstd"
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+_warned = False
+
+
+def get_player_compression() -> str:
+    from ..wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("PlayerCompression").data or CODEC_NONE
+
+
+def get_codec() -> str:
+    global _warned
+    codec = get_player_compression()
+    if codec == CODEC_ZSTD and zstandard is None:
+        if not _warned:
+            logger.warning("[鸣潮] 未安装 zstandard, 玩家数据改用 gzip 压缩")
+            _warned = True
+        return CODEC_GZIP
+    return codec
+
+
+def should_compress(path: Path) -> bool:
+    """面板数据与抽卡记录 (含备份) 体积大, 其余小文件保持明文"""
+    return path.name == "rawData.json" or "gacha_logs" in path.name
+
+
+def get_path_codec(path: Path) -> str:
+    if not should_compress(path):
+        return CODEC_NONE
+    return get_codec()
+
+
+def detect_codec(head: bytes) -> str:
+    if head.startswith(GZIP_MAGIC):
+        return CODEC_GZIP
+    if head.startswith(ZSTD_MAGIC):
+        return CODEC_ZSTD
+    return CODEC_NONE
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_GZIP:
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if codec == CODEC_ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def read_file_sync(path: Path) -> bytes:
+    """按文件头识别压缩方式, 流式解压读取; 明文文件原样返回"""
+    with open(path, "rb") as f:
+        head = f.read(4)
+        codec = detect_codec(head)
+        if codec == CODEC_NONE:
+            return head + f.read()
+
+        f.seek(0)
+        if codec == CODEC_GZIP:
+            reader = gzip.GzipFile(fileobj=f, mode="rb")
+        elif zstandard is not None:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+        else:
+            raise RuntimeError(f"未安装 zstandard, 无法读取 {path}")
+
+        chunks = []
+        with reader:
+            while chunk := reader.read(READ_CHUNK_SIZE):
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+
+def file_codec_sync(path: Path) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return detect_codec(f.read(4))
+    except FileNotFoundError:
+        return None
+
+
+async def recompress_player_files() -> Tuple[int, int]:
+    """
+    将压缩方式与当前配置不一致的玩家文件按当前配置重写
+    返回 (重写文件数, 节省字节数)
+    """
+    from .player_path import iter_player_paths
+    from .player_writer import player_writer
+
+    count = 0
+    saved = 0
+    for uid, player_dir in list(iter_player_paths()):
+        for path in list(player_dir.iterdir()):
+            if not should_compress(path) or not path.is_file():
+                continue
+            codec = get_path_codec(path)
+            if await asyncio.to_thread(file_codec_sync, path) in (codec, None):
+                continue
+
+            async with player_writer.lock(uid):
+                # 有待写入内容时, 落盘会使用当前配置
+                if player_writer.get_pending(path):
+                    continue
+                try:
+                    before = path.stat().st_size
+                    data = await player_writer.read(path)
+                    if data is None:
+                        continue
+                    await player_writer.write(path, data, delay=0)
+                    saved += before - path.stat().st_size
+                    count += 1
+                except Exception as e:
+                    logger.warning(f"[鸣潮] 重写玩家文件失败 {path}: {e}")
+
+    return count, saved
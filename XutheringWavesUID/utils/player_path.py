@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from gsuid_core.logger import logger
+
+from .player_writer import player_writer
+from .resource.RESOURCE_PATH import PLAYER_PATH
+
+LAYOUT_FLAT = "flat"
+LAYOUT_SHARDED = "sharded"
+
+# uid -> 已存在的玩家目录
+_resolved: Dict[str, Path] = {}
+
+
+def get_player_path_layout() -> str:
+    from ..wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config("PlayerPathLayout").data or LAYOUT_FLAT
+
+
+def get_flat_path(uid: str) -> Path:
+    return PLAYER_PATH / uid
+
+
+def get_sharded_path(uid: str) -> Path:
+    """players/ab/cd/<uid>/, ab cd 为 uid 的 md5 前四位"""
+    digest = hashlib.md5(uid.encode()).hexdigest()
+    return PLAYER_PATH / digest[:2] / digest[2:4] / uid
+
+
+def get_layout_path(uid: str, layout: str) -> Path:
+    if layout == LAYOUT_SHARDED:
+        return get_sharded_path(uid)
+    return get_flat_path(uid)
+
+
+def get_player_path(uid: str) -> Path:
+    """
+    玩家数据目录
+    迁移期间两种布局并存: 优先当前布局, 只有另一布局存在时使用另一布局,
+    都不存在时 (新玩家) 使用当前布局
+    """
+    uid = str(uid)
+    path = _resolved.get(uid)
+    if path is not None and path.exists():
+        return path
+
+    layout = get_player_path_layout()
+    path = get_layout_path(uid, layout)
+    if not path.exists():
+        other = get_layout_path(
+            uid, LAYOUT_FLAT if layout == LAYOUT_SHARDED else LAYOUT_SHARDED
+        )
+        if not other.exists():
+            _resolved.pop(uid, None)
+            return path
+        path = other
+
+    _resolved[uid] = path
+    return path
+
+
+def _is_shard_name(name: str) -> bool:
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+
+def resolve_player_file(path: Path) -> Path:
+    """
+    玩家目录下的文件路径改为该玩家目录当前所在位置下的同一文件
+    用于迁移前取得旧路径的写入方, 其他路径原样返回
+    """
+    try:
+        parts = path.relative_to(PLAYER_PATH).parts
+    except ValueError:
+        return path
+    if len(parts) >= 4 and _is_shard_name(parts[0]) and _is_shard_name(parts[1]):
+        uid, rest = parts[2], parts[3:]
+    elif len(parts) >= 2 and not _is_shard_name(parts[0]):
+        uid, rest = parts[0], parts[1:]
+    else:
+        return path
+    return get_player_path(uid).joinpath(*rest)
+
+
+def iter_player_paths() -> Iterator[Tuple[str, Path]]:
+    """遍历两种布局下的全部玩家目录"""
+    if not PLAYER_PATH.exists():
+        return
+    for child in PLAYER_PATH.iterdir():
+        if not child.is_dir():
+            continue
+        if not _is_shard_name(child.name):
+            yield child.name, child
+            continue
+        for sub in child.iterdir():
+            if not sub.is_dir() or not _is_shard_name(sub.name):
+                continue
+            for player_dir in sub.iterdir():
+                if player_dir.is_dir():
+                    yield player_dir.name, player_dir
+
+
+def _move_player_dir(src: Path, dst: Path):
+    if not dst.exists():
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        # 同一文件系统内为原子 rename
+        os.replace(src, dst)
+        return
+
+    # 目标已存在 (迁移期间旧路径又被写入), 按文件合并, 保留较新的一份
+    for file in src.iterdir():
+        target = dst / file.name
+        if file.is_dir():
+            if target.exists():
+                continue
+            shutil.move(str(file), target)
+        elif not target.exists() or file.stat().st_mtime > target.stat().st_mtime:
+            os.replace(file, target)
+    shutil.rmtree(src, ignore_errors=True)
+
+
+def _remove_empty_shards():
+    for child in PLAYER_PATH.iterdir():
+        if not child.is_dir() or not _is_shard_name(child.name):
+            continue
+        for sub in child.iterdir():
+            if sub.is_dir() and not any(sub.iterdir()):
+                sub.rmdir()
+        if not any(child.iterdir()):
+            child.rmdir()
+
+
+async def migrate_player_paths(layout: str) -> int:
+    """
+    将玩家目录迁移到指定布局, 返回迁移的玩家数
+    逐个玩家在 uid 锁内 落盘待写入数据 + rename, 迁移期间无需停机;
+    读取方通过 get_player_path 在两种布局间查找, 可重复执行以处理迁移期间新写入的旧路径
+    """
+    count = 0
+    for uid, src in list(iter_player_paths()):
+        dst = get_layout_path(uid, layout)
+        if src == dst:
+            continue
+        try:
+            async with player_writer.lock(uid):
+                await player_writer.flush_dir(src)
+                await asyncio.to_thread(_move_player_dir, src, dst)
+                _resolved[uid] = dst
+            count += 1
+        except Exception as e:
+            logger.exception(f"[鸣潮] 迁移玩家目录失败 uid={uid}:", e)
+
+    await asyncio.to_thread(_remove_empty_shards)
+    return count
+
+
+player_writer.set_path_resolver(resolve_player_file)
@@ -0,0 +1,171 @@
+"""
+每个uid的角色摘要 <玩家目录>/summary.json
+
+roleId -> 等级、共鸣链、武器、合鸣、声骸评分、期望伤害
+由 save_card_info 在保存面板后更新, 群排行、持有率等只需这些字段的功能直接读取摘要,
+不再读取和解析完整面板
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from msgspec import Struct
+from msgspec import json as msgjson
+
+from gsuid_core.logger import logger
+
+from .char_info_utils import (
+    get_all_role_detail_info_list,
+    get_all_role_detail_struct_list,
+)
+from .player_path import get_player_path
+from .player_writer import player_writer
+
+SUMMARY_FILE = "summary.json"
+
+
+class RoleSummary(Struct):
+    roleId: int
+    level: int
+    chain: int
+    starLevel: int
+    weaponId: int
+    weaponLevel: int
+    weaponResonLevel: Optional[int] = None
+    sonataName: str = ""
+    # 从旧数据生成摘要时不计算评分, 需要时再补全
+    score: Optional[float] = None
+    expected_damage: Optional[float] = None
+    expected_name: str = ""
+
+
+PlayerSummary = Dict[int, RoleSummary]
+
+summary_decoder = msgjson.Decoder(PlayerSummary)
+summary_encoder = msgjson.Encoder()
+
+
+def get_summary_path(uid: str) -> Path:
+    return get_player_path(uid) / SUMMARY_FILE
+
+
+def summary_from_rank(rank) -> RoleSummary:
+    """由 WavesCharRank 生成"""
+    return RoleSummary(
+        roleId=rank.roleId,
+        level=rank.level,
+        chain=rank.chain,
+        starLevel=rank.starLevel,
+        weaponId=rank.weaponId,
+        weaponLevel=rank.weaponLevel,
+        weaponResonLevel=rank.weaponResonLevel,
+        sonataName=rank.sonataName,
+        score=rank.score,
+        expected_damage=rank.expected_damage,
+        expected_name=rank.expected_name,
+    )
+
+
+def summary_from_detail(role_detail) -> RoleSummary:
+    """由角色详情生成, 不含评分"""
+    return RoleSummary(
+        roleId=role_detail.role.roleId,
+        level=role_detail.level,
+        chain=role_detail.get_chain_num(),
+        starLevel=role_detail.role.starLevel,
+        weaponId=role_detail.weaponData.weapon.weaponId,
+        weaponLevel=role_detail.weaponData.level,
+        weaponResonLevel=role_detail.weaponData.resonLevel,
+    )
+
+
+async def load_player_summary(uid: str) -> Optional[PlayerSummary]:
+    raw = await player_writer.read(get_summary_path(uid))
+    if raw is None:
+        return None
+    try:
+        return summary_decoder.decode(raw)
+    except Exception as e:
+        logger.warning(f"load player summary failed {uid}: {e}")
+        return None
+
+
+async def _save_player_summary(uid: str, summary: PlayerSummary):
+    await player_writer.write(get_summary_path(uid), summary_encoder.encode(summary))
+
+
+async def update_player_summary(
+    uid: str, waves_char_rank: List, removed: Iterable[int] = ()
+):
+    """
+    合并更新摘要, waves_char_rank 为 WavesCharRank 列表
+    调用方需持有 player_writer.lock(uid), 与面板在同一把锁内写入
+    """
+    summary = await load_player_summary(uid) or {}
+    for role_id in removed:
+        summary.pop(role_id, None)
+    for rank in waves_char_rank:
+        summary[rank.roleId] = summary_from_rank(rank)
+    await _save_player_summary(uid, summary)
+
+
+async def invalidate_player_summary(uid: str):
+    """面板被整体替换时删除摘要, 下次读取时重新生成"""
+    async with player_writer.lock(uid):
+        path = get_summary_path(uid)
+        await player_writer.flush(path)
+        path.unlink(missing_ok=True)
+
+
+async def _build_player_summary(
+    uid: str, summary: Optional[PlayerSummary], need_score: bool
+) -> Optional[PlayerSummary]:
+    if not need_score:
+        details = await get_all_role_detail_struct_list(uid)
+        if details is None:
+            return None
+        return {d.role.roleId: summary_from_detail(d) for d in details}
+
+    from .expression_ctx import get_waves_char_rank
+
+    role_details = await get_all_role_detail_info_list(uid)
+    if role_details is None:
+        return None
+    new_summary = {
+        r.roleId: summary_from_rank(r)
+        for r in await get_waves_char_rank(uid, list(role_details))
+    }
+    # 期望伤害计算较重, 不在这里补全, 保留已有的值
+    for role_id, old in (summary or {}).items():
+        new = new_summary.get(role_id)
+        if new and old.expected_damage is not None:
+            new.expected_damage = old.expected_damage
+            new.expected_name = old.expected_name
+    return new_summary
+
+
+def _is_complete(summary: Optional[PlayerSummary], need_score: bool) -> bool:
+    if summary is None:
+        return False
+    return not need_score or all(r.score is not None for r in summary.values())
+
+
+async def get_player_summary(
+    uid: str, need_score: bool = False
+) -> Optional[PlayerSummary]:
+    """
+    读取摘要, 没有面板时返回 None
+    旧数据没有摘要时从面板生成一次并保存; need_score 时确保包含声骸评分
+    """
+    summary = await load_player_summary(uid)
+    if _is_complete(summary, need_score):
+        return summary
+
+    async with player_writer.lock(uid):
+        summary = await load_player_summary(uid)
+        if _is_complete(summary, need_score):
+            return summary
+        summary = await _build_player_summary(uid, summary, need_score)
+        if summary is not None:
+            await _save_player_summary(uid, summary)
+    return summary
@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import os
+import weakref
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from gsuid_core.logger import logger
+
+from .player_codec import compress, get_path_codec, read_file_sync
+
+FlushCallback = Callable[[], Awaitable[None]]
+PathResolver = Callable[[Path], Path]
+
+# 落盘失败后保留待写入内容, 间隔一段时间后重试
+FLUSH_RETRY_DELAY = 5.0
+
+
+def get_write_behind_delay() -> float:
+    from ..wutheringwaves_config import WutheringWavesConfig
+
+    return (WutheringWavesConfig.get_config("WriteBehindDelay").data or 0) / 1000
+
+
+def atomic_write_sync(path: Path, data: bytes):
+    """先写临时文件并 fsync, 再原子替换, 不会留下写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class PlayerWriter:
+    """
+    玩家数据文件写入
+    - 原子写入: 临时文件 + fsync + rename
+    - 落盘时按配置压缩, 读取时按文件头自动解压, 调用方始终读写明文
+    - 延迟写入: 延迟时间内对同一文件的多次写入合并为一次, 延迟从第一次写入起算
+    - 写入前的内容可通过 read/get_pending 读到, 读写保持一致
+    - 落盘失败时保留内容并定时重试; 不延迟的写入 (delay=0) 会把异常抛给调用方
+    - lock(uid) 用于串行化同一uid的 读取-合并-写入
+    - 路径经 resolver 转换为玩家目录的当前位置, 目录迁移后仍持有旧路径的
+      写入方不会在旧位置重新建出目录
+    """
+
+    def __init__(self):
+        # path -> (序号, 内容, 写入后回调)
+        self._pending: Dict[Path, Tuple[int, bytes, Optional[FlushCallback]]] = {}
+        self._timers: Dict[Path, asyncio.Task] = {}
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._flush_locks: "weakref.WeakValueDictionary[Path, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._seq = itertools.count(1)
+        self._stats = {"writes": 0, "flushes": 0, "failures": 0}
+        self._resolve: PathResolver = lambda path: path
+
+    def set_path_resolver(self, resolve: PathResolver):
+        self._resolve = resolve
+
+    def lock(self, uid: str) -> asyncio.Lock:
+        lock = self._locks.get(uid)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[uid] = lock
+        return lock
+
+    def _flush_lock(self, path: Path) -> asyncio.Lock:
+        lock = self._flush_locks.get(path)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._flush_locks[path] = lock
+        return lock
+
+    def get_pending(self, path: Path) -> Optional[Tuple[int, bytes]]:
+        pending = self._pending.get(self._resolve(path))
+        if pending is None:
+            return None
+        return pending[0], pending[1]
+
+    def exists(self, path: Path) -> bool:
+        """文件是否存在, 包括尚未落盘的写入"""
+        path = self._resolve(path)
+        return path in self._pending or path.exists()
+
+    async def read(self, path: Path) -> Optional[bytes]:
+        path = self._resolve(path)
+        pending = self._pending.get(path)
+        if pending is not None:
+            return pending[1]
+        try:
+            return await asyncio.to_thread(read_file_sync, path)
+        except FileNotFoundError:
+            return None
+
+    async def write(
+        self,
+        path: Path,
+        data: bytes,
+        delay: Optional[float] = None,
+        on_flush: Optional[FlushCallback] = None,
+    ):
+        self._stats["writes"] += 1
+        if delay is None:
+            delay = get_write_behind_delay()
+        path = self._resolve(path)
+        self._pending[path] = (next(self._seq), data, on_flush)
+
+        if delay <= 0:
+            await self.flush(path, raise_error=True)
+            return
+
+        self._schedule(path, delay)
+
+    def _schedule(self, path: Path, delay: float):
+        if path not in self._timers:
+            self._timers[path] = asyncio.create_task(self._delayed_flush(path, delay))
+
+    async def _delayed_flush(self, path: Path, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._timers.pop(path, None)
+        await self.flush(path)
+
+    @staticmethod
+    def _write_sync(path: Path, data: bytes, codec: str):
+        atomic_write_sync(path, compress(data, codec))
+
+    async def flush(self, path: Path, raise_error: bool = False):
+        if path not in self._pending:
+            path = self._resolve(path)
+        timer = self._timers.pop(path, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+
+        # 同一文件的写入依次进行, 避免旧内容覆盖新内容
+        async with self._flush_lock(path):
+            pending = self._pending.get(path)
+            if pending is None:
+                return
+            seq, data, on_flush = pending
+            # 写入期间玩家目录可能已迁移, 落盘前重新定位
+            target = self._resolve(path)
+            codec = get_path_codec(target)
+            try:
+                await asyncio.to_thread(self._write_sync, target, data, codec)
+                self._stats["flushes"] += 1
+            except Exception as e:
+                # 保留待写入内容, 稍后重试, 期间的读取仍能读到新内容
+                self._stats["failures"] += 1
+                logger.exception(f"[鸣潮] 写入文件失败 {path}, 稍后重试:", e)
+                self._schedule(path, FLUSH_RETRY_DELAY)
+                if raise_error:
+                    raise
+                return
+
+            # 写入期间有新内容则保留, 由新的写入负责落盘
+            if self._pending.get(path, (None,))[0] == seq:
+                del self._pending[path]
+
+            if on_flush:
+                try:
+                    await on_flush()
+                except Exception as e:
+                    logger.warning(f"[鸣潮] 写入回调失败 {path}: {e}")
+
+    async def flush_dir(self, directory: Path):
+        for path in list(self._pending):
+            if directory in path.parents:
+                await self.flush(path)
+
+    async def flush_all(self):
+        for path in list(self._pending):
+            await self.flush(path)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "pending": len(self._pending)}
+
+
+player_writer = PlayerWriter()
@@ -9,6 +9,7 @@ from ..api.wwapi import (
     UPLOAD_SLASH_RECORD_URL,
     UPLOAD_URL,
 )
+from ..api.wwapi_client import wwapi_client
 from .const import QUEUE_ABYSS_RECORD, QUEUE_SCORE_RANK, QUEUE_SLASH_RECORD
 from .queues import event_handler, start_dispatcher
 
@@ -26,21 +27,20 @@ async def send_score_rank(item: Any):
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传面板结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传面板失败: {res.text if res else ''} {e}")
+    res = None
+    try:
+        res = await wwapi_client.post(
+            UPLOAD_URL,
+            json=item,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {WavesToken}",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        logger.info(f"上传面板结果: {res.status_code} - {res.text}")
+    except Exception as e:
+        logger.exception(f"上传面板失败: {res.text if res else ''} {e}")
 
 
 @event_handler(QUEUE_ABYSS_RECORD)
@@ -56,21 +56,20 @@ async def send_abyss_record(item: Any):
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_ABYSS_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传深渊结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传深渊失败: {res.text if res else ''} {e}")
+    res = None
+    try:
+        res = await wwapi_client.post(
+            UPLOAD_ABYSS_RECORD_URL,
+            json=item,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {WavesToken}",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        logger.info(f"上传深渊结果: {res.status_code} - {res.text}")
+    except Exception as e:
+        logger.exception(f"上传深渊失败: {res.text if res else ''} {e}")
 
 
 @event_handler(QUEUE_SLASH_RECORD)
@@ -86,21 +85,20 @@ async def send_slash_record(item: Any):
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        res = None
-        try:
-            res = await client.post(
-                UPLOAD_SLASH_RECORD_URL,
-                json=item,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            logger.info(f"上传冥海结果: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"上传冥海失败: {res.text if res else ''} {e}")
+    res = None
+    try:
+        res = await wwapi_client.post(
+            UPLOAD_SLASH_RECORD_URL,
+            json=item,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {WavesToken}",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        logger.info(f"上传冥海结果: {res.status_code} - {res.text}")
+    except Exception as e:
+        logger.exception(f"上传冥海失败: {res.text if res else ''} {e}")
 
 
 def init_queues():
@@ -1,58 +1,113 @@
 import asyncio
 import json
-from typing import Dict, List, Optional, Union
-
-import aiofiles
+import time
+from typing import Dict, List, Optional, Tuple, Union
 
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
 
+from ..utils.api.fetch_scheduler import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_REFRESH,
+    fetch_scheduler,
+)
 from ..utils.api.model import AccountBaseInfo, RoleList
 from ..utils.error_reply import WAVES_CODE_101, WAVES_CODE_102
 from ..utils.expression_ctx import WavesCharRank, get_waves_char_rank
 from ..utils.hint import error_reply
+from ..utils.panel_cache import panel_cache
+from ..utils.panel_store import get_panel_store
+from ..utils.player_path import get_player_path
+from ..utils.player_summary import update_player_summary
+from ..utils.player_writer import player_writer
 from ..utils.queues.const import QUEUE_SCORE_RANK
 from ..utils.queues.queues import push_item
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
 from ..utils.util import get_version
 from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import WutheringWavesConfig
 from .resource.constant import SPECIAL_CHAR_INT_ALL
 
 
-def is_use_global_semaphore() -> bool:
-    return WutheringWavesConfig.get_config("UseGlobalSemaphore").data or False
+def get_refresh_card_timeout() -> int:
+    return WutheringWavesConfig.get_config("RefreshCardTimeout").data or 0
 
 
-def get_refresh_card_concurrency() -> int:
-    return WutheringWavesConfig.get_config("RefreshCardConcurrency").data or 2
+# 角色列表中可用于判断角色是否变化的字段
+ROLE_COMPARE_KEYS = ("level", "breach", "chainUnlockNum")
 
 
-class SemaphoreManager:
-    def __init__(self):
-        self._last_config: int = get_refresh_card_concurrency()
-        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(value=self._last_config)
-        self._semaphore_lock = asyncio.Lock()
+def is_incremental_refresh() -> bool:
+    return WutheringWavesConfig.get_config("IncrementalRefresh").data or False
 
-    async def get_semaphore(self) -> asyncio.Semaphore:
-        current_config = get_refresh_card_concurrency()
 
-        if is_use_global_semaphore():
-            return await self._get_semaphore(current_config)  # 全局模式
-        else:
-            return asyncio.Semaphore(value=current_config)  # 独立模式
+def get_incremental_refresh_max_age() -> int:
+    return WutheringWavesConfig.get_config("IncrementalRefreshMaxAge").data or 0
 
-    async def _get_semaphore(self, current_config: int) -> asyncio.Semaphore:
-        if self._last_config != current_config:
-            async with self._semaphore_lock:
-                if self._last_config != current_config:
-                    self._semaphore = asyncio.Semaphore(value=current_config)
-                    self._last_config = current_config
 
-        return self._semaphore
+async def load_refresh_time(uid: str) -> Dict[str, float]:
+    path = get_player_path(uid) / "refreshTime.json"
+    try:
+        raw = await player_writer.read(path)
+        return json.loads(raw) if raw else {}
+    except Exception as e:
+        logger.warning(f"load_refresh_time failed {path}: {e}")
+        return {}
+
+
+async def save_refresh_time(uid: str, role_ids: List[str]):
+    """记录角色详情的获取时间, 供增量刷新判断"""
+    if not role_ids:
+        return
+    async with player_writer.lock(uid):
+        refresh_time = await load_refresh_time(uid)
+        now = time.time()
+        for role_id in role_ids:
+            refresh_time[role_id] = now
 
+        path = get_player_path(uid) / "refreshTime.json"
+        await player_writer.write(path, json.dumps(refresh_time).encode("utf-8"))
+
+
+async def filter_unchanged_roles(
+    uid: str, role_ids: List[str], role_info: RoleList
+) -> Tuple[List[str], List[Dict]]:
+    """增量刷新: 角色列表信息未变且详情未过期的角色直接沿用本地数据
+
+    Returns:
+        (需要请求详情的角色id, 沿用的本地角色数据)
+    """
+    try:
+        old_data = await get_panel_store().get_roles(uid, [int(i) for i in role_ids])
+    except Exception as e:
+        logger.warning(f"filter_unchanged_roles load failed {uid}: {e}")
+        return role_ids, []
+    if not old_data:
+        return role_ids, []
+
+    refresh_time = await load_refresh_time(uid)
+    max_age = get_incremental_refresh_max_age() * 60
+    now = time.time()
+    role_map = {r.roleId: r for r in role_info.roleList}
+
+    fetch_ids = []
+    unchanged = []
+    for role_id in role_ids:
+        old = old_data.get(int(role_id))
+        role = role_map.get(int(role_id))
+        if (
+            old
+            and role
+            and now - refresh_time.get(role_id, 0) < max_age
+            and all(
+                old["role"].get(key) == getattr(role, key)
+                for key in ROLE_COMPARE_KEYS
+            )
+        ):
+            unchanged.append(old)
+        else:
+            fetch_ids.append(role_id)
 
-semaphore_manager = SemaphoreManager()
+    return fetch_ids, unchanged
 
 
 async def send_card(
@@ -63,12 +118,11 @@ async def send_card(
     token: Optional[str] = "",
     role_info: Optional[RoleList] = None,
     waves_data: Optional[List] = None,
+    waves_char_rank: Optional[List[WavesCharRank]] = None,
 ):
-    waves_char_rank: Optional[List[WavesCharRank]] = None
-
     WavesToken = WutheringWavesConfig.get_config("WavesToken").data
 
-    if WavesToken:
+    if WavesToken and waves_char_rank is None:
         waves_char_rank = await get_waves_char_rank(uid, save_data, True)
 
     if (
@@ -118,96 +172,73 @@ async def save_card_info(
 ):
     if len(waves_data) == 0:
         return
-    _dir = PLAYER_PATH / uid
-    _dir.mkdir(parents=True, exist_ok=True)
-    path = _dir / "rawData.json"
+    store = get_panel_store()
 
-    old_data = {}
-    if path.exists():
-        try:
-            async with aiofiles.open(path, mode="r", encoding="utf-8") as f:
-                old = json.loads(await f.read())
-                old_data = {d["role"]["roleId"]: d for d in old}
-        except Exception as e:
-            logger.exception(f"save_card_info get failed {path}:", e)
-            path.unlink(missing_ok=True)
+    role_ids = {item["role"]["roleId"] for item in waves_data}
+    if role_ids & set(SPECIAL_CHAR_INT_ALL):
+        role_ids.update(SPECIAL_CHAR_INT_ALL)
 
-    #
     refresh_update = {}
     refresh_unchanged = {}
-    for item in waves_data:
-        role_id = item["role"]["roleId"]
-
-        if role_id in SPECIAL_CHAR_INT_ALL:
-            # 漂泊者预处理
-            for piaobo_id in SPECIAL_CHAR_INT_ALL:
-                old = old_data.get(piaobo_id)
-                if not old:
-                    continue
-                if piaobo_id != role_id:
-                    del old_data[piaobo_id]
-
-        old = old_data.get(role_id)
-        if old != item:
-            refresh_update[role_id] = item
-        else:
-            refresh_unchanged[role_id] = item
+    removed = []
+    # 同一uid的 读取-合并-写入 串行进行
+    async with player_writer.lock(uid):
+        old_data = await store.get_roles(uid, role_ids)
+        for item in waves_data:
+            role_id = item["role"]["roleId"]
+
+            if role_id in SPECIAL_CHAR_INT_ALL:
+                # 漂泊者预处理
+                for piaobo_id in SPECIAL_CHAR_INT_ALL:
+                    old = old_data.get(piaobo_id)
+                    if not old:
+                        continue
+                    if piaobo_id != role_id:
+                        del old_data[piaobo_id]
+                        removed.append(piaobo_id)
 
-        old_data[role_id] = item
+            old = old_data.get(role_id)
+            if old != item:
+                refresh_update[role_id] = item
+            else:
+                refresh_unchanged[role_id] = item
 
-    save_data = list(old_data.values())
+            old_data[role_id] = item
 
-    await send_card(uid, user_id, save_data, is_self_ck, token, role_info, waves_data)
+        try:
+            await store.delete(uid, removed)
+            # 未变化的角色无需重写
+            await store.upsert(uid, list(refresh_update.values()))
+        except Exception as e:
+            logger.exception(f"save_card_info save failed {uid}:", e)
+        panel_cache.invalidate(uid)
 
-    try:
-        async with aiofiles.open(path, "w", encoding="utf-8") as file:
-            await file.write(json.dumps(save_data, ensure_ascii=False))
-    except Exception as e:
-        logger.exception(f"save_card_info save failed {path}:", e)
+        save_data = await store.get_all(uid) or list(old_data.values())
 
-    # 保存charListData.json（角色评分缓存）
-    waves_char_rank = await get_waves_char_rank(uid, save_data, True)
-    await save_char_list_cache(uid, waves_char_rank)
+        # 更新角色摘要（等级、共鸣链、评分等），供群排行、持有率读取
+        # 与面板在同一把锁内写入, 重叠的保存不会让摘要回退到旧面板
+        waves_char_rank = await get_waves_char_rank(uid, save_data, True)
+        try:
+            await update_player_summary(uid, waves_char_rank or [], removed)
+        except Exception as e:
+            logger.warning(f"保存角色摘要失败 uid={uid}: {e}")
+
+    await send_card(
+        uid,
+        user_id,
+        save_data,
+        is_self_ck,
+        token,
+        role_info,
+        waves_data,
+        waves_char_rank,
+    )
 
     if waves_map:
         waves_map["refresh_update"] = refresh_update
         waves_map["refresh_unchanged"] = refresh_unchanged
 
 
-async def save_char_list_cache(uid: str, waves_char_rank: Optional[List[WavesCharRank]]):
-    """保存角色评分数据到charListData.json供练度排行使用
-
-    只更新改动的角色，而不是重写整个文件。
-
-    Args:
-        uid: 用户uid
-        waves_char_rank: WavesCharRank列表（只包含改动的角色）
-    """
-    if not waves_char_rank:
-        return
-
-    try:
-        from ..wutheringwaves_rank.draw_rank_list_card import (
-            load_char_list_data,
-            save_char_list_data,
-        )
-
-        # 加载现有的角色评分数据
-        existing_char_list_data = await load_char_list_data(uid)
-        if not existing_char_list_data:
-            existing_char_list_data = {}
-
-        # 只更新改动的角色
-        for char_rank in waves_char_rank:
-            existing_char_list_data[str(char_rank.roleId)] = char_rank.score
-
-        # 保存更新后的数据
-        if existing_char_list_data:
-            await save_char_list_data(uid, existing_char_list_data)
-    except Exception as e:
-        logger.debug(f"保存charListData.json失败 uid={uid}: {e}")
-
-
 async def refresh_char(
     ev: Event,
     uid: str,
@@ -222,8 +253,8 @@ async def refresh_char(
         is_self_ck, ck = await waves_api.get_ck_result(uid, user_id, ev.bot_id)
     if not ck:
         return error_reply(WAVES_CODE_102)
-    # 共鸣者信息
-    role_info = await waves_api.get_role_info(uid, ck)
+    # 共鸣者信息, 刷新时不使用缓存, 否则增量刷新会把有变化的角色当作未变化
+    role_info = await waves_api.get_role_info(uid, ck, use_cache=False)
     if not role_info.success:
         return role_info.throw_msg()
 
@@ -234,34 +265,35 @@ async def refresh_char(
         msg = f"鸣潮特征码[{uid}]获取数据失败\n1.是否注册过库街区\n2.库街区能否查询当前鸣潮特征码数据"
         return msg
 
-    semaphore = await semaphore_manager.get_semaphore()
+    timeout = get_refresh_card_timeout()
+    deadline = time.monotonic() + timeout if timeout > 0 else None
+    priority = PRIORITY_INTERACTIVE if refresh_type != "all" else PRIORITY_REFRESH
 
-    async def limited_get_role_detail_info(role_id, uid, ck):
-        async with semaphore:
-            return await waves_api.get_role_detail_info(role_id, uid, ck)
+    def limited_get_role_detail_info(role_id, uid, ck):
+        return fetch_scheduler.submit(
+            uid,
+            lambda: waves_api.get_role_detail_info(role_id, uid, ck),
+            priority=priority,
+            deadline=deadline,
+        )
 
-    if is_self_ck:
-        tasks = [
-            limited_get_role_detail_info(f"{r.roleId}", uid, ck)
-            for r in role_info.roleList
-            if refresh_type == "all"
-            or (isinstance(refresh_type, list) and f"{r.roleId}" in refresh_type)
-        ]
+    if is_self_ck or not role_info.showRoleIdList:
+        all_ids = [f"{r.roleId}" for r in role_info.roleList]
     else:
-        if role_info.showRoleIdList:
-            tasks = [
-                limited_get_role_detail_info(f"{r}", uid, ck)
-                for r in role_info.showRoleIdList
-                if refresh_type == "all"
-                or (isinstance(refresh_type, list) and f"{r}" in refresh_type)
-            ]
-        else:
-            tasks = [
-                limited_get_role_detail_info(f"{r.roleId}", uid, ck)
-                for r in role_info.roleList
-                if refresh_type == "all"
-                or (isinstance(refresh_type, list) and f"{r.roleId}" in refresh_type)
-            ]
+        all_ids = [f"{r}" for r in role_info.showRoleIdList]
+    role_ids = [
+        r
+        for r in all_ids
+        if refresh_type == "all" or (isinstance(refresh_type, list) and r in refresh_type)
+    ]
+
+    unchanged_datas = []
+    if refresh_type == "all" and is_incremental_refresh():
+        role_ids, unchanged_datas = await filter_unchanged_roles(
+            uid, role_ids, role_info
+        )
+
+    tasks = [limited_get_role_detail_info(r, uid, ck) for r in role_ids]
     results = await asyncio.gather(*tasks)
 
     charId2chainNum: Dict[int, int] = {
@@ -319,6 +351,11 @@ async def refresh_char(
 
         waves_datas.append(role_detail_info)
 
+    # 获取时间只供增量刷新使用, 关闭时不读写 refreshTime.json
+    if is_incremental_refresh():
+        await save_refresh_time(uid, [f"{i['role']['roleId']}" for i in waves_datas])
+    waves_datas.extend(unchanged_datas)
+
     await save_card_info(
         uid,
         waves_datas,
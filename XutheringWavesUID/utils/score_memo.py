@@ -0,0 +1,202 @@
+"""
+角色评分缓存
+
+以 (面板内容哈希, 评分模块版本, 伤害模块版本) 判断缓存是否有效, 保存
+声骸评分、评分背景、期望伤害和合鸣; 面板只在刷新时变化, 排行查询时
+未变化的角色直接读取, 不再重新计算
+
+模块版本为相关文件内容的哈希:
+- 评分模块: 下载的 waves_build、角色评分模板 calc.json、utils/calc、
+  utils/calculate.py、角色/武器/合鸣数据 map/detail_json 及读取它们的 utils/ascension
+- 伤害模块: 下载的 map/waves_build、utils/damage、utils/map/damage
+缓存记录需两个版本都一致, 面板与伤害共用的文件只需计入评分模块
+reload_calculate_module / reload_all_register 加载新代码后重新计算版本,
+旧版本的记录在下次使用时删除
+"""
+
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from gsuid_core.logger import logger
+
+from .api.model import RoleDetailData
+from .calc import WuWaCalc
+from .calc.batch_score import ensure_batch_score_verified, score_roles
+from .calculate import get_calc_map, get_total_score_bg
+from .damage.abstract import DamageRankRegister
+from .database.models import WavesRoleScore
+from .resource.RESOURCE_PATH import BUILD_PATH, MAP_BUILD_PATH
+
+UTILS_PATH = Path(__file__).parent
+CALC_SOURCES = (
+    (BUILD_PATH, "*"),
+    (UTILS_PATH / "map" / "character", "*/calc.json"),
+    (UTILS_PATH / "map" / "detail_json", "**/*"),
+    (UTILS_PATH / "calc", "*.py"),
+    (UTILS_PATH / "ascension", "*.py"),
+    (UTILS_PATH, "calculate.py"),
+)
+DAMAGE_SOURCES = (
+    (MAP_BUILD_PATH, "*"),
+    (UTILS_PATH / "damage", "*.py"),
+    (UTILS_PATH / "map" / "damage", "*.py"),
+)
+
+_state: Dict[str, Optional[str]] = {"calc": None, "damage": None, "purged": None}
+
+
+def _digest_files(sources: Iterable[Tuple[Path, str]]) -> str:
+    sha = hashlib.sha1()
+    for root, pattern in sources:
+        if not root.exists():
+            continue
+        for path in sorted(root.glob(pattern)):
+            if not path.is_file() or "__pycache__" in path.parts:
+                continue
+            sha.update(str(path.relative_to(root)).encode())
+            sha.update(path.read_bytes())
+    return sha.hexdigest()[:16]
+
+
+def get_module_versions() -> Tuple[str, str]:
+    """(评分模块版本, 伤害模块版本)"""
+    if _state["calc"] is None:
+        _state["calc"] = _digest_files(CALC_SOURCES)
+    if _state["damage"] is None:
+        _state["damage"] = _digest_files(DAMAGE_SOURCES)
+    return _state["calc"], _state["damage"]  # type: ignore
+
+
+def reset_calc_version():
+    _state["calc"] = None
+    _state["purged"] = None
+
+
+def reset_damage_version():
+    _state["damage"] = None
+    _state["purged"] = None
+
+
+def get_panel_hash(role_detail: RoleDetailData) -> str:
+    return hashlib.sha1(role_detail.model_dump_json().encode()).hexdigest()
+
+
+def get_sonata_name(ph_detail: List[Dict]) -> str:
+    """5件套或凑满的合鸣"""
+    for ph in ph_detail:
+        if ph.get("ph_name") and (ph.get("ph_num") == 5 or ph.get("isFull")):
+            return ph["ph_name"]
+    return ""
+
+
+def get_sonata_alias(role_id: int, ph_detail: List[Dict]) -> str:
+    """特殊合鸣组合的展示名"""
+    if role_id == 1606:
+        names = {ph.get("ph_name") for ph in ph_detail if ph.get("ph_num", 0) >= 2}
+        if "沉日劫明" in names and "幽夜隐匿之帷" in names:
+            return "洛2+2"
+    return ""
+
+
+def _calc_expected(calc: WuWaCalc) -> Tuple[Optional[str], str]:
+    """(期望伤害, 期望伤害名字), 角色没有伤害计算时为 (None, "")"""
+    role_detail = calc.role_detail
+    rankDetail = DamageRankRegister.find_class(str(role_detail.role.roleId))
+    if not rankDetail:
+        return None, ""
+    calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
+    # 只需要期望伤害数值, 不记录效果明细
+    calc.damageAttribute = calc.card_sort_map_to_attribute(
+        calc.role_card, record_effect=False
+    )
+    _, expected_damage = rankDetail["func"](calc.damageAttribute, role_detail)
+    return expected_damage, rankDetail["title"]
+
+
+def _calc_role_scores(
+    items: List[Tuple[str, RoleDetailData, str]],
+    need_expected_damage: bool,
+    versions: Tuple[str, str],
+) -> List[WavesRoleScore]:
+    calcs = []
+    for _, role_detail, _ in items:
+        calc = WuWaCalc(role_detail)
+        if role_detail.phantomData and role_detail.phantomData.equipPhantomList:
+            calc.phantom_pre = calc.prepare_phantom()
+            calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
+            calc.calc_temp = get_calc_map(
+                calc.phantom_card,
+                role_detail.role.roleName,
+                role_detail.role.roleId,
+            )
+        calcs.append(calc)
+    # 所有角色的声骸评分一次批量计算
+    phantom_scores = score_roles(calcs)
+
+    result = []
+    for (uid, role_detail, panel_hash), calc, phantom_score in zip(
+        items, calcs, phantom_scores
+    ):
+        role = role_detail.role
+        row = WavesRoleScore(
+            uid=uid,
+            role_id=role.roleId,
+            panel_hash=panel_hash,
+            calc_version=versions[0],
+            damage_version=versions[1],
+            score=phantom_score,
+            score_bg=get_total_score_bg(
+                role.roleName, round(phantom_score, 2), calc.calc_temp
+            ),
+        )
+        if calc.phantom_card:
+            ph_detail = calc.phantom_pre.get("ph_detail", [])
+            row.sonata_name = get_sonata_name(ph_detail)
+            row.sonata_alias = get_sonata_alias(role.roleId, ph_detail)
+            if need_expected_damage:
+                row.expected_damage, row.expected_name = _calc_expected(calc)
+        row.has_expected = need_expected_damage
+        result.append(row)
+    return result
+
+
+async def get_role_scores(
+    items: List[Tuple[str, RoleDetailData]], need_expected_damage: bool = False
+) -> List[WavesRoleScore]:
+    """
+    批量读取角色评分, 与 items [(uid, 角色详情)] 一一对应
+    缓存中没有或缺少期望伤害的角色重新计算并写入缓存
+    """
+    # 首次使用或模块重新加载后需读取文件计算版本
+    versions = await asyncio.to_thread(get_module_versions)
+    if _state["purged"] != "".join(versions):
+        count = await WavesRoleScore.delete_stale(*versions)
+        if count:
+            logger.info(f"[鸣潮] 删除旧版本角色评分缓存 {count} 条")
+        _state["purged"] = "".join(versions)
+
+    hashes = [get_panel_hash(role_detail) for _, role_detail in items]
+    memo = await WavesRoleScore.get_by_hash(list(set(hashes)), *versions)
+
+    result: List[Optional[WavesRoleScore]] = []
+    missing = []
+    for i, panel_hash in enumerate(hashes):
+        row = memo.get(panel_hash)
+        if row is None or (need_expected_damage and not row.has_expected):
+            missing.append(i)
+            result.append(None)
+        else:
+            result.append(row)
+
+    if missing:
+        await ensure_batch_score_verified()
+        rows = _calc_role_scores(
+            [(*items[i], hashes[i]) for i in missing], need_expected_damage, versions
+        )
+        for i, row in zip(missing, rows):
+            result[i] = row
+        await WavesRoleScore.save_scores(rows)
+
+    return result  # type: ignore
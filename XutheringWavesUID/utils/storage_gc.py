@@ -0,0 +1,153 @@
+import asyncio
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from gsuid_core.logger import logger
+
+from .api.response_cache import response_cache
+from .player_path import iter_player_paths
+
+# import_gacha_logs_<时间>.json / update_gacha_logs_<时间>.json
+GACHA_BACKUP_PATTERN = re.compile(r"^(import|update)_gacha_logs_.+\.json$")
+# 写入中途退出残留的临时文件
+TMP_MAX_AGE = 3600
+
+# 类别 -> (文件数, 字节数)
+GcResult = Dict[str, Tuple[int, int]]
+
+_stats = {"runs": 0, "files": 0, "bytes": 0}
+
+
+def _get_config(key: str) -> int:
+    from ..wutheringwaves_config import WutheringWavesConfig
+
+    return WutheringWavesConfig.get_config(key).data or 0
+
+
+def _list_files(paths: List[Path]) -> List[Tuple[float, int, Path]]:
+    files = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    return files
+
+
+def plan_gacha_backups(
+    keep: int,
+    max_age: float,
+    uid_max_bytes: int,
+    max_bytes: int,
+    now: float,
+) -> List[Tuple[int, Path]]:
+    """
+    计算需要清理的抽卡备份, 返回 [(字节数, 路径)]
+    - 每个uid按新到旧保留 keep 份, 超过 max_age 或累计超过 uid_max_bytes 的清理
+    - 全部备份超过 max_bytes 时从最旧的开始清理
+    - 每个uid最新的一份始终保留
+    参数为 0 时不按该条件清理
+    """
+    removed: List[Tuple[int, Path]] = []
+    candidates: List[Tuple[float, int, Path]] = []
+    total = 0
+
+    for _, player_dir in iter_player_paths():
+        files = _list_files(
+            [p for p in player_dir.iterdir() if GACHA_BACKUP_PATTERN.match(p.name)]
+        )
+        files.sort(reverse=True)
+
+        uid_total = 0
+        for i, (mtime, size, path) in enumerate(files):
+            if i > 0 and (
+                (keep > 0 and i >= keep)
+                or (max_age > 0 and now - mtime > max_age)
+                or (uid_max_bytes > 0 and uid_total + size > uid_max_bytes)
+            ):
+                removed.append((size, path))
+                continue
+            uid_total += size
+            if i > 0:
+                candidates.append((mtime, size, path))
+        total += uid_total
+
+    if max_bytes > 0 and total > max_bytes:
+        candidates.sort()
+        for _, size, path in candidates:
+            if total <= max_bytes:
+                break
+            removed.append((size, path))
+            total -= size
+
+    return removed
+
+
+def plan_tmp_files(now: float) -> List[Tuple[int, Path]]:
+    paths = [p for _, d in iter_player_paths() for p in d.glob(".*.tmp")]
+    if response_cache.root.exists():
+        paths.extend(response_cache.root.rglob("*.tmp"))
+    return [
+        (size, path)
+        for mtime, size, path in _list_files(paths)
+        if now - mtime > TMP_MAX_AGE
+    ]
+
+
+def _remove(files: List[Tuple[int, Path]], dry_run: bool) -> Tuple[int, int]:
+    if not dry_run:
+        for _, path in files:
+            path.unlink(missing_ok=True)
+    return len(files), sum(size for size, _ in files)
+
+
+def _collect_sync(dry_run: bool) -> GcResult:
+    now = time.time()
+    result: GcResult = {}
+
+    backups = plan_gacha_backups(
+        _get_config("GachaBackupKeep"),
+        _get_config("GachaBackupMaxAge") * 86400,
+        _get_config("GachaBackupMaxSizePerUid") * 1024 * 1024,
+        _get_config("GachaBackupMaxSize") * 1024 * 1024,
+        now,
+    )
+    result["抽卡备份"] = _remove(backups, dry_run)
+
+    result["数据缓存"] = response_cache.evict(
+        _get_config("CacheEverythingMaxAge") * 86400,
+        _get_config("CacheEverythingMaxSize") * 1024 * 1024,
+        dry_run,
+    )
+
+    result["临时文件"] = _remove(plan_tmp_files(now), dry_run)
+    return result
+
+
+async def run_storage_gc(dry_run: bool = False) -> GcResult:
+    """按配置清理抽卡备份、数据缓存和残留临时文件, dry_run 时只统计不删除"""
+    result = await asyncio.to_thread(_collect_sync, dry_run)
+    if not dry_run:
+        _stats["runs"] += 1
+        _stats["files"] += sum(i[0] for i in result.values())
+        _stats["bytes"] += sum(i[1] for i in result.values())
+        for name, (count, freed) in result.items():
+            if count:
+                logger.info(
+                    f"[鸣潮] 清理{name} {count} 个文件, 释放 {freed / 1024 / 1024:.1f}MB"
+                )
+    return result
+
+
+def format_gc_result(result: GcResult) -> str:
+    return "\n".join(
+        f"{name}: {count}个文件, {freed / 1024 / 1024:.1f}MB"
+        for name, (count, freed) in result.items()
+    )
+
+
+def get_storage_gc_stats() -> Dict[str, int]:
+    return dict(_stats)
@@ -2,56 +2,86 @@ import asyncio
 import inspect
 import random
 import string
-import time
 from functools import wraps
-from typing import Any, Callable, Coroutine, Dict, List, TypeVar, overload
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+    overload,
+)
 
 import httpx
 
 from gsuid_core.subscribe import gs_subscribe
 
+from .api.single_flight import SingleFlight
+
+
+def timed_async_cache(
+    expiration,
+    condition=lambda x: True,
+    maxsize: int = 128,
+    negative_expiration: float = 0,
+    keys: Optional[List[str]] = None,
+):
+    """
+    异步函数结果缓存
+    - 按参数区分缓存 (keys 指定参与的参数, 默认全部参数, 类方法忽略 self/cls)
+    - LRU 容量上限 + 每条缓存过期时间
+    - 并发未命中时只执行一次
+    - 不满足 condition 的结果在 negative_expiration > 0 时也短暂缓存
+    使用示例:
+    @timed_async_cache(86400, lambda x: x.success)
+    async def get_online_list_role(self, token: str):
+        ...
+    """
 
-def timed_async_cache(expiration, condition=lambda x: True):
     def decorator(func):
-        cache = {}
-        locks = {}
+        # 并发合并与调用方隔离由 SingleFlight 负责, 缓存结果不复制
+        flight = SingleFlight(func.__qualname__, maxsize, copy_result=False)
 
         sig = inspect.signature(func)
         params = list(sig.parameters.keys())
         is_cls_method = params and params[0] in ["self", "cls"]
+        if keys is not None:
+            key_params = keys
+        else:
+            key_params = params[1:] if is_cls_method else params
 
-        @wraps(func)
-        async def wrapper(*args):
-            current_time = time.time()
+        def make_key(args, kwargs) -> tuple:
             if is_cls_method and args and hasattr(args[0], "__class__"):
-                cache_key = f"{args[0].__class__.__name__}.{func.__name__}"
+                cache_key_parts = [f"{args[0].__class__.__name__}.{func.__name__}"]
             else:
-                cache_key = func.__name__
-
-            # 为每个缓存键创建一个锁
-            if cache_key not in locks:
-                locks[cache_key] = asyncio.Lock()
-
-            # 检查缓存，如果有效则直接返回
-            if cache_key in cache:
-                value, timestamp = cache[cache_key]
-                if current_time - timestamp < expiration:
-                    return value
-
-            # 获取锁以确保并发安全
-            async with locks[cache_key]:
-                # 双重检查，避免等待锁期间其他协程已经更新了缓存
-                if cache_key in cache:
-                    value, timestamp = cache[cache_key]
-                    if current_time - timestamp < expiration:
-                        return value
-
-                # 执行原始函数
-                value = await func(*args)
-                if condition(value):
-                    cache[cache_key] = (value, current_time)
-                return value
+                cache_key_parts = [func.__name__]
 
+            if key_params:
+                bound_args = sig.bind(*args, **kwargs)
+                bound_args.apply_defaults()
+                for key in key_params:
+                    cache_key_parts.append(repr(bound_args.arguments.get(key)))
+            return tuple(cache_key_parts)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await flight.do(
+                make_key(args, kwargs),
+                lambda: func(*args, **kwargs),
+                ttl=expiration,
+                condition=condition,
+                negative_ttl=negative_expiration,
+            )
+
+        def cache_info() -> Dict[str, int]:
+            stats = flight.stats()
+            stats["size"] = stats.pop("cached")
+            return stats
+
+        wrapper.cache_info = cache_info  # type: ignore[attr-defined]
+        wrapper.cache_clear = flight.invalidate  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
@@ -201,8 +231,8 @@ filter_msg = [
 ]
 
 
-# 发送主人信息
-@timed_async_cache(300, lambda x: x)
+# 发送主人信息, 5分钟内只发送一次
+@timed_async_cache(300, lambda x: x, keys=[])
 async def send_master_info(msg: str):
     # 过滤
     for i in filter_msg:
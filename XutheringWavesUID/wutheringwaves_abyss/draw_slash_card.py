@@ -3,7 +3,6 @@ import time
 from pathlib import Path
 from typing import Union
 
-import aiofiles
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
@@ -38,9 +37,11 @@ from ..utils.image import (
     pic_download_from_url,
 )
 from ..utils.imagetool import draw_pic, draw_pic_with_ring
+from ..utils.player_path import get_player_path
+from ..utils.player_writer import player_writer
 from ..utils.queues.const import QUEUE_SLASH_RECORD
 from ..utils.queues.queues import push_item
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH, SLASH_PATH
+from ..utils.resource.RESOURCE_PATH import SLASH_PATH
 from ..utils.waves_api import waves_api
 
 TEXT_PATH = Path(__file__).parent / "texture2d"
@@ -373,17 +374,15 @@ async def save_slash_record(
 ):
     """保存无尽记录到本地文件"""
     try:
-        _dir = PLAYER_PATH / uid
-        _dir.mkdir(parents=True, exist_ok=True)
-        path = _dir / "slashData.json"
+        path = get_player_path(uid) / "slashData.json"
 
         slash_dict = slash_data.model_dump()
         record_payload = {
             "record_time": int(time.time()),
             "slash_data": slash_dict,
         }
-        async with aiofiles.open(path, "w", encoding="utf-8") as file:
-            await file.write(json.dumps(record_payload, ensure_ascii=False))
+        data = json.dumps(record_payload, ensure_ascii=False).encode("utf-8")
+        await player_writer.write(path, data)
     except Exception as e:
         logger.warning(f"[保存无尽数据失败] uid={uid}, error={e}")
 
@@ -12,6 +12,7 @@ from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img, get_qq_avatar
 
 from ..utils import hint
+from ..utils.api.fetch_scheduler import fetch_scheduler
 from ..utils.api.model import (
     AccountBaseInfo,
     OnlineRoleList,
@@ -20,6 +21,7 @@ from ..utils.api.model import (
 )
 from ..utils.api.model_other import EnemyDetailData
 from ..utils.api.wwapi import ONE_RANK_URL, OneRankRequest, OneRankResponse
+from ..utils.api.wwapi_client import wwapi_client
 from ..utils.ascension.char import get_char_model
 from ..utils.ascension.template import get_template_data
 from ..utils.ascension.weapon import (
@@ -171,22 +173,21 @@ async def get_one_rank(item: OneRankRequest) -> Optional[OneRankResponse]:
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        try:
-            res = await client.post(
-                ONE_RANK_URL,
-                json=item.dict(),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            # logger.debug(f"获取排行: {res.text}")
-            if res.status_code == 200:
-                return OneRankResponse.model_validate(res.json())
-        except Exception as e:
-            logger.exception(f"获取排行失败: {e}")
+    try:
+        res = await wwapi_client.post(
+            ONE_RANK_URL,
+            json=item.dict(),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {WavesToken}",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        # logger.debug(f"获取排行: {res.text}")
+        if res.status_code == 200:
+            return OneRankResponse.model_validate(res.json())
+    except Exception as e:
+        logger.exception(f"获取排行失败: {e}")
 
 
 def parse_text_and_number(text):
@@ -416,8 +417,9 @@ async def get_role_need(
             query_list = SPECIAL_CHAR.copy()[char_id]
 
         for char_id in query_list:
-            role_detail_info = await waves_api.get_role_detail_info(
-                char_id, waves_id, ck
+            role_detail_info = await fetch_scheduler.submit(
+                waves_id,
+                lambda: waves_api.get_role_detail_info(char_id, waves_id, ck),
             )
             if not role_detail_info.success:
                 continue
@@ -698,10 +700,11 @@ async def draw_char_detail_img(
     oneRank: Optional[OneRankResponse] = None
     enemy_detail: Optional[EnemyDetailData] = EnemyDetailData()
     if change_list_regex:
-        temp = copy.deepcopy(role_detail)
+        # 面板数据来自共享缓存, 在副本上修改
+        temp = role_detail
         try:
             role_detail, change_command = await change_role_detail(
-                uid, ck, role_detail, enemy_detail, change_list_regex
+                uid, ck, copy.deepcopy(role_detail), enemy_detail, change_list_regex
             )
         except Exception as e:
             logger.exception("角色数据转换错误", e)
@@ -1,8 +1,10 @@
 import re
+import copy
 from typing import Any, Dict, List, Optional
 
 from gsuid_core.logger import logger
 
+from ..utils.api.fetch_scheduler import fetch_scheduler
 from ..utils.api.model import EquipPhantomData, RoleDetailData
 from ..utils.api.model_other import EnemyDetailData
 from ..utils.ascension.sonata import WavesSonataResult, get_sonata_detail
@@ -43,10 +45,16 @@ async def get_remote_role_detail_info(
             (role for role in gen_temp if str(role.role.roleId) in find_char_id),
             None,
         )
+        # 面板缓存中的对象为共享对象, 替换声骸等操作会修改数据, 需返回副本
+        if role_detail_info:
+            role_detail_info = copy.deepcopy(role_detail_info)
 
     if not role_detail_info:
         for char_id in find_char_id:
-            temp = await waves_api.get_role_detail_info(char_id, waves_id, ck)
+            temp = await fetch_scheduler.submit(
+                waves_id,
+                lambda: waves_api.get_role_detail_info(char_id, waves_id, ck),
+            )
             if not temp.success:
                 continue
             role_detail_info = temp.data
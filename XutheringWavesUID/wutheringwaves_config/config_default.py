@@ -109,6 +109,17 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         0,
         600,
     ),
+    "IncrementalRefresh": GsBoolConfig(
+        "增量刷新面板",
+        "开启后刷新全部面板时，等级/突破/共鸣链未变化且未超过有效期的角色不再请求详情",
+        False,
+    ),
+    "IncrementalRefreshMaxAge": GsIntConfig(
+        "增量刷新面板有效期（单位min）",
+        "超过该时间的角色详情即使未变化也会重新获取",
+        60,
+        10080,
+    ),
     "RefreshIntervalNotify": GsStrConfig(
         "刷新面板间隔通知文案",
         "刷新面板间隔通知文案",
@@ -132,6 +143,12 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         "鸣潮全排行token",
         "",
     ),
+    "WWApiMaxConnections": GsIntConfig(
+        "排行接口最大连接数（重启生效）",
+        "排行/上传等接口共用连接池的最大连接数",
+        20,
+        100,
+    ),
     "AtCheck": GsBoolConfig(
         "开启可以艾特查询",
         "开启可以艾特查询",
@@ -168,11 +185,59 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         10,
         50,
     ),
+    "CookieValidateCache": GsIntConfig(
+        "token校验结果缓存时间（单位秒）",
+        "该时间内同一token不再重复校验有效性，0为每次都校验",
+        60,
+        3600,
+    ),
+    "PublicTokenPoolSize": GsIntConfig(
+        "公共token池大小",
+        "预先校验并轮换使用的公共token数量，0为每次查询时现场挑选",
+        20,
+        200,
+    ),
+    "PublicTokenPoolInterval": GsIntConfig(
+        "公共token池校验间隔（单位min）",
+        "公共token池校验间隔（单位min）",
+        30,
+        1440,
+    ),
+    "RequestCoalesceTTL": GsIntConfig(
+        "相同请求结果复用时间（单位秒）",
+        "同一UID的相同接口请求会合并为一次，该时间内的重复请求直接复用结果，0为仅合并并发请求",
+        0,
+        60,
+    ),
+    "KuroRateLimit": GsIntConfig(
+        "库洛接口每秒请求数上限",
+        "每个接口在直连/代理出口上分别限速，遇到风控或系统繁忙时自动降速退避，0为不限制",
+        0,
+        100,
+    ),
+    "KuroRateBackoffMax": GsIntConfig(
+        "库洛接口最大退避时间（单位秒）",
+        "库洛接口最大退避时间（单位秒）",
+        60,
+        600,
+    ),
+    "RefreshCardTimeout": GsIntConfig(
+        "刷新角色面板排队超时（单位秒）",
+        "刷新面板时排队超过该时间仍未发出的角色详情请求将被放弃，0为不限制",
+        120,
+        600,
+    ),
     "UseGlobalSemaphore": GsBoolConfig(
         "开启后刷新角色面板并发数为全局共享",
         "开启后刷新角色面板并发数为全局共享",
         False,
     ),
+    "RefreshCardGlobalConcurrency": GsIntConfig(
+        "角色详情请求全局并发数",
+        "所有用户同时进行的角色详情请求总数上限，始终生效，刷新角色面板并发数为每个用户的上限",
+        20,
+        200,
+    ),
     "CaptchaProvider": GsStrConfig(
         "验证码提供方（重启生效）",
         "验证码提供方（重启生效）",
@@ -184,9 +249,75 @@ CONFIG_DEFAULT: Dict[str, GSC] = {
         "验证码提供方appkey",
         "",
     ),
+    "PanelStoreBackend": GsStrConfig(
+        "角色面板存储方式",
+        "json为每个账号一个rawData.json；sqlite为单个数据库按角色读写。切换前请使用【迁移面板数据】",
+        "json",
+        options=["json", "sqlite"],
+    ),
+    "PanelCacheMaxSize": GsIntConfig(
+        "面板解析缓存上限（单位MB）",
+        "按原始数据大小计算，缓存已解析的角色面板，0为不缓存",
+        64,
+        4096,
+    ),
+    "WriteBehindDelay": GsIntConfig(
+        "玩家数据延迟写入（单位ms）",
+        "延迟时间内对同一文件的多次写入合并为一次，0为立即写入，关闭时会写入全部未落盘数据",
+        1000,
+        10000,
+    ),
+    "PlayerPathLayout": GsStrConfig(
+        "玩家数据目录布局",
+        "flat为players/<uid>；sharded为按uid哈希分两级子目录，适合大量账号。切换后可使用【迁移玩家目录】在线迁移",
+        "flat",
+        options=["flat", "sharded"],
+    ),
+    "PlayerCompression": GsStrConfig(
+        "玩家数据压缩",
+        "压缩面板数据与抽卡记录（含备份）以节省磁盘，zstd需安装zstandard。已有文件由每日任务或【压缩玩家数据】按新配置重写",
+        "none",
+        options=["none", "gzip", "zstd"],
+    ),
     "CacheEverything": GsBoolConfig(
         "启用数据缓存",
-        "启用后，所有API数据（基础信息、角色信息、深渊等）都会被缓存到本地用于网络故障时兜底，每1000用户大约额外占用1GB空间。禁用则每次都从API获取最新数据",
+        "启用后，所有API数据（基础信息、角色信息、深渊等）都会被缓存到本地，短时间内的重复查询直接复用并在后台刷新，网络故障时兜底，每1000用户大约额外占用1GB空间。禁用则每次都从API获取最新数据",
         False,
     ),
+    "CacheEverythingMaxAge": GsIntConfig(
+        "数据缓存最长保留时间（单位天）",
+        "超过该时间未更新的缓存文件会被定时清理，0为不按时间清理",
+        30,
+        365,
+    ),
+    "CacheEverythingMaxSize": GsIntConfig(
+        "数据缓存最大占用空间（单位MB）",
+        "缓存总大小超过该值时优先清理最旧的文件，0为不限制",
+        1024,
+        102400,
+    ),
+    "GachaBackupKeep": GsIntConfig(
+        "每个UID保留的抽卡备份数",
+        "导入/更新抽卡记录时生成的备份，超出的旧备份会被定时清理，每个UID始终保留最新一份，0为不限制",
+        10,
+        1000,
+    ),
+    "GachaBackupMaxAge": GsIntConfig(
+        "抽卡备份最长保留时间（单位天）",
+        "超过该时间的备份会被定时清理，0为不按时间清理",
+        0,
+        3650,
+    ),
+    "GachaBackupMaxSizePerUid": GsIntConfig(
+        "单个UID抽卡备份最大占用空间（单位MB）",
+        "超过时清理该UID较旧的备份，0为不限制",
+        0,
+        10240,
+    ),
+    "GachaBackupMaxSize": GsIntConfig(
+        "抽卡备份最大占用空间（单位MB）",
+        "全部备份总大小超过该值时优先清理最旧的备份，0为不限制",
+        0,
+        102400,
+    ),
 }
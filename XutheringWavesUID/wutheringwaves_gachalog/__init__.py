@@ -22,7 +22,7 @@ from .draw_gachalogs import draw_card, draw_card_help
 from .get_gachalogs import export_gachalogs, import_gachalogs, save_gachalogs
 from .gacha_handler import fetch_mcgf_data, merge_gacha_data
 from ..wutheringwaves_rank.draw_gacha_rank_card import draw_gacha_rank_card
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.player_path import get_player_path, iter_player_paths
 
 sv_gacha_log = SV("waves抽卡记录")
 sv_gacha_help_log = SV("waves抽卡记录帮助")
@@ -225,7 +225,7 @@ async def delete_gacha_history(bot: Bot, ev: Event):
     if not uid.isdigit() or len(uid) != 9:
         return await bot.send(f"请附带特征码，例如【{PREFIX}删除抽卡记录123456789】")
 
-    player_dir = PLAYER_PATH / uid
+    player_dir = get_player_path(uid)
     gacha_log_file = player_dir / "gacha_logs.json"
     if not gacha_log_file.exists():
         return await bot.send(f"UID{uid}暂无抽卡记录文件")
@@ -251,9 +251,7 @@ async def delete_gacha_history(bot: Bot, ev: Event):
 )
 async def delete_import_gacha_files(bot: Bot, ev: Event):
     delete_count = 0
-    for player_dir in PLAYER_PATH.iterdir():
-        if not player_dir.is_dir():
-            continue
+    for _, player_dir in iter_player_paths():
         for file_path in player_dir.glob("import_gacha_logs_*.json"):
             try:
                 file_path.unlink()
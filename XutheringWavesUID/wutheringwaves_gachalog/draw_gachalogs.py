@@ -5,7 +5,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List
 
-import aiofiles
+from msgspec import json as msgjson
 from PIL import Image, ImageDraw
 from gsuid_core.models import Event
 from gsuid_core.utils.image.convert import convert_img
@@ -17,7 +17,8 @@ from ..wutheringwaves_config import PREFIX
 from ..utils.api.model import AccountBaseInfo
 from ..utils.error_reply import WAVES_CODE_102
 from ..utils.resource.constant import NORMAL_LIST
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.player_path import get_player_path
+from ..utils.player_writer import player_writer
 from ..utils.image import (
     GOLD,
     add_footer,
@@ -136,26 +137,27 @@ async def draw_card_help():
 
 async def get_gacha_stats(uid: str) -> Dict:
     """获取抽卡统计信息，优先从缓存读取，否则从原始数据计算"""
-    _dir = PLAYER_PATH / str(uid)
-    _dir.mkdir(parents=True, exist_ok=True)
-
+    _dir = get_player_path(uid)
     gacha_log_path = _dir / "gacha_logs.json"
     stats_path = _dir / "gachaStats.json"
+
+    if not player_writer.exists(gacha_log_path):
+        return {}
+
     # 如果统计文件存在，直接读取
-    if gacha_log_path.exists() and stats_path.exists():
+    stats_raw = await player_writer.read(stats_path)
+    if stats_raw is not None:
         try:
-            async with aiofiles.open(stats_path, "r", encoding="utf-8") as f:
-                return json.loads(await f.read())
+            return json.loads(stats_raw)
         except Exception:
             pass
 
     # 否则从 gacha_logs.json 计算
-    if not gacha_log_path.exists():
+    gacha_log_raw = await player_writer.read(gacha_log_path)
+    if gacha_log_raw is None:
         return {}
-
     try:
-        async with aiofiles.open(gacha_log_path, "r", encoding="utf-8") as f:
-            raw_data = json.loads(await f.read())
+        raw_data = msgjson.decode(gacha_log_raw)
 
         gachalogs = raw_data.get("data", {})
         total_data = {}
@@ -257,9 +259,7 @@ async def get_gacha_stats(uid: str) -> Dict:
 async def save_gacha_stats(uid: str, total_data: Dict):
     """保存抽卡统计信息到本地文件"""
     try:
-        _dir = PLAYER_PATH / str(uid)
-        _dir.mkdir(parents=True, exist_ok=True)
-        path = _dir / "gachaStats.json"
+        path = get_player_path(uid) / "gachaStats.json"
 
         # 提取关键统计信息
         stats_data = {}
@@ -285,19 +285,19 @@ async def save_gacha_stats(uid: str, total_data: Dict):
                 "weapon_gold": len(data["rank_s_list"]) if gacha_name == "武器精准调谐" else 0,  # 武器金数
             }
 
-        async with aiofiles.open(path, "w", encoding="utf-8") as file:
-            await file.write(json.dumps(stats_data, ensure_ascii=False))
+        data = json.dumps(stats_data, ensure_ascii=False).encode("utf-8")
+        await player_writer.write(path, data)
     except Exception:
         pass
 
 
 async def draw_card(uid: str, ev: Event):
     # 获取数据
-    gacha_log_path = PLAYER_PATH / str(uid) / "gacha_logs.json"
-    if not gacha_log_path.exists():
+    gacha_log_path = get_player_path(uid) / "gacha_logs.json"
+    gacha_log_raw = await player_writer.read(gacha_log_path)
+    if gacha_log_raw is None:
         return f"[鸣潮] 你还没有抽卡记录噢!\n 请发送 {PREFIX}导入抽卡链接 后重试!"
-    async with aiofiles.open(gacha_log_path, "r", encoding="UTF-8") as f:
-        raw_data: Dict = json.loads(await f.read())
+    raw_data: Dict = msgjson.decode(gacha_log_raw)
 
     gachalogs = raw_data["data"]
     title_num = len([1 for i in gachalogs.keys() if "新手" not in i])
@@ -3,7 +3,6 @@ import base64
 import copy
 import json
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 import aiofiles
@@ -14,7 +13,8 @@ from gsuid_core.models import Event
 
 from ..utils.api.model import GachaLog
 from ..utils.database.models import WavesUser
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.player_path import get_player_path
+from ..utils.player_writer import player_writer
 from ..utils.waves_api import waves_api
 from ..version import XutheringWavesUID_version
 from ..wutheringwaves_config import PREFIX
@@ -167,15 +167,13 @@ async def get_new_gachalog_for_file(
 
 
 async def backup_gachalogs(uid: str, gachalogs_history: Dict, type: str):
-    path = PLAYER_PATH / str(uid)
-    if not path.exists():
-        path.mkdir(parents=True, exist_ok=True)
+    path = get_player_path(uid)
     # 备份
     backup_path = (
         path / f"{type}_gacha_logs_{datetime.now().strftime('%Y-%m-%d.%H%M%S')}.json"
     )
-    async with aiofiles.open(backup_path, "w", encoding="UTF-8") as file:
-        await file.write(json.dumps(gachalogs_history, ensure_ascii=False))
+    data = json.dumps(gachalogs_history, ensure_ascii=False).encode("UTF-8")
+    await player_writer.write(backup_path, data, delay=0)
 
 
 async def save_gachalogs(
@@ -186,17 +184,34 @@ async def save_gachalogs(
     import_data: Optional[Dict[str, List[GachaLog]]] = None,
     force_overwrite: bool = False,
 ) -> str:
-    path = PLAYER_PATH / str(uid)
-    if not path.exists():
-        path.mkdir(parents=True, exist_ok=True)
+    # 同一uid的抽卡记录 读取-合并-写入 串行进行, 避免并发更新互相覆盖
+    async with player_writer.lock(str(uid)):
+        try:
+            return await _save_gachalogs(
+                ev, uid, record_id, is_force, import_data, force_overwrite
+            )
+        except OSError:
+            # 写入失败的内容由 player_writer 保留并在后台重试
+            return f"❌UID{uid}抽卡记录保存失败, 请稍后再试!"
+
+
+async def _save_gachalogs(
+    ev: Event,
+    uid: str,
+    record_id: str,
+    is_force: bool = False,
+    import_data: Optional[Dict[str, List[GachaLog]]] = None,
+    force_overwrite: bool = False,
+) -> str:
+    path = get_player_path(uid)
 
     # 抽卡记录json路径
     gachalogs_path = path / "gacha_logs.json"
 
     temp_gachalogs_history = {}
-    if gachalogs_path.exists():
-        with Path.open(gachalogs_path, encoding="UTF-8") as f:
-            gachalogs_history: Dict = json.load(f)
+    raw = await player_writer.read(gachalogs_path)
+    if raw is not None:
+        gachalogs_history: Dict = json.loads(raw)
 
         # import 时备份
         if not record_id:
@@ -290,8 +305,9 @@ async def save_gachalogs(
     }
 
     vo = msgspec.to_builtins(result)
-    async with aiofiles.open(gachalogs_path, "w", encoding="UTF-8") as file:
-        await file.write(json.dumps(vo, ensure_ascii=False))
+    # 抽卡记录写坏无法恢复, 不做延迟直接落盘
+    data = json.dumps(vo, ensure_ascii=False).encode("UTF-8")
+    await player_writer.write(gachalogs_path, data, delay=0)
 
     # 计算数据
     all_add = sum(gachalogs_count_add.values())
@@ -374,7 +390,7 @@ async def import_gachalogs(ev: Event, history_url: str, type: str, uid: str, for
 
 
 async def export_gachalogs(uid: str) -> dict:
-    path = PLAYER_PATH / uid
+    path = get_player_path(uid)
     if not path.exists():
         path.mkdir(parents=True, exist_ok=True)
 
@@ -384,9 +400,9 @@ async def export_gachalogs(uid: str) -> dict:
 
     # 抽卡记录json路径
     gachalogs_path = path / "gacha_logs.json"
-    if gachalogs_path.exists():
-        async with aiofiles.open(gachalogs_path, "r", encoding="UTF-8") as f:
-            raw_data = json.loads(await f.read())
+    raw = await player_writer.read(gachalogs_path)
+    if raw is not None:
+        raw_data = json.loads(raw)
 
         result = {
             "info": {
@@ -3,7 +3,6 @@ import copy
 from pathlib import Path
 from typing import Dict, Union
 
-import httpx
 from PIL import Image, ImageDraw
 
 from gsuid_core.logger import logger
@@ -11,9 +10,10 @@ from gsuid_core.models import Event
 from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.wwapi import GET_HOLD_RATE_URL
+from ..utils.api.wwapi_client import wwapi_client
 from ..utils.ascension.char import get_char_model
-from ..utils.char_info_utils import get_all_role_detail_info_list
-from ..utils.database.models import WavesBind
+from ..utils.player_summary import get_player_summary
+from ..utils.database.models import WavesGroupBind
 from ..utils.fonts.waves_fonts import (
     waves_font_20,
     waves_font_24,
@@ -263,11 +263,10 @@ async def draw_pic(roleId):
 async def get_char_hold_rate_data() -> Dict:
     """获取角色持有率数据"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(GET_HOLD_RATE_URL, timeout=10)
-            response.raise_for_status()
-            if response.status_code == 200:
-                return response.json().get("data", {})
+        response = await wwapi_client.get(GET_HOLD_RATE_URL, timeout=10)
+        response.raise_for_status()
+        if response.status_code == 200:
+            return response.json().get("data", {})
     except Exception as e:
         logger.error(f"获取角色持有率数据失败: {e}")
 
@@ -278,8 +277,8 @@ async def get_group_char_hold_rate_data(group_id: str) -> Dict:
     """获取群组角色持有率数据"""
     res = {}
 
-    users = await WavesBind.get_group_all_uid(group_id)
-    if not users:
+    members = await WavesGroupBind.get_group_members(group_id)
+    if not members:
         return res
 
     uid_fiter = {}
@@ -292,25 +291,16 @@ async def get_group_char_hold_rate_data(group_id: str) -> Dict:
         if uid in uid_fiter:
             return None
 
-        role_details = await get_all_role_detail_info_list(uid)
-        if role_details is None:
+        summary = await get_player_summary(uid)
+        if summary is None:
             return None
 
-        uid_data = {}
-        for role_detail in role_details:
-            uid_data[role_detail.role.roleId] = role_detail.get_chain_num()
+        uid_data = {role_id: role.chain for role_id, role in summary.items()}
 
         return uid, uid_data
 
     # 提取所有需要处理的UID
-    all_uids = []
-    for user in users:
-        if not user.uid:
-            continue
-        uids = user.uid.split("_")
-        for uid in uids:
-            if uid not in uid_fiter:
-                all_uids.append(uid)
+    all_uids = list(dict.fromkeys(member.uid for member in members))
 
     # 使用Semaphore限制并发处理UID
     async def process_with_semaphore(uid):
@@ -9,6 +9,7 @@ from gsuid_core.models import Event
 from gsuid_core.utils.image.convert import convert_img
 
 from ..utils.api.wwapi import ABYSS_TYPE_MAP_REVERSE, GET_TOWER_APPEAR_RATE
+from ..utils.api.wwapi_client import wwapi_client
 from ..utils.ascension.char import get_char_model
 from ..utils.ascension.model import CharacterModel
 from ..utils.fonts.waves_fonts import (
@@ -26,19 +27,18 @@ TEXT_PATH = Path(__file__).parent / "texture2d"
 
 @timed_async_cache(expiration=3600, condition=lambda x: isinstance(x, dict))
 async def get_tower_appear_rate_data() -> Union[Dict, None]:
-    async with httpx.AsyncClient() as client:
-        try:
-            res = await client.get(
-                GET_TOWER_APPEAR_RATE,
-                headers={
-                    "Content-Type": "application/json",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            if res.status_code == 200:
-                return res.json().get("data", [])
-        except Exception as e:
-            logger.exception(f"获取深塔出场率数据失败: {e}")
+    try:
+        res = await wwapi_client.get(
+            GET_TOWER_APPEAR_RATE,
+            headers={
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        if res.status_code == 200:
+            return res.json().get("data", [])
+    except Exception as e:
+        logger.exception(f"获取深塔出场率数据失败: {e}")
 
 
 async def draw_tower_use_rate(ev: Event):
@@ -14,15 +14,14 @@ from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.api.model import RoleDetailData, WeaponData
 from ..utils.cache import TimedCache
-from ..utils.calc import WuWaCalc
-from ..utils.calculate import (
-    calc_phantom_score,
-    get_calc_map,
-    get_total_score_bg,
-)
-from ..utils.char_info_utils import get_all_role_detail_info_list
+from ..utils.char_info_utils import get_role_detail_info_list
 from ..utils.damage.abstract import DamageRankRegister
-from ..utils.database.models import WavesBind, WavesUser
+from ..utils.database.models import (
+    WavesBind,
+    WavesGroupBind,
+    WavesRoleScore,
+    WavesUser,
+)
 from ..utils.fonts.waves_fonts import (
     waves_font_14,
     waves_font_16,
@@ -51,6 +50,7 @@ from ..utils.image import (
 )
 from ..utils.name_convert import alias_to_char_name, char_name_to_char_id
 from ..utils.resource.constant import SPECIAL_CHAR, SPECIAL_CHAR_NAME
+from ..utils.score_memo import get_role_scores
 from ..utils.util import hide_uid
 from ..wutheringwaves_config import PREFIX, WutheringWavesConfig
 
@@ -82,58 +82,13 @@ class RankInfo(BaseModel):
     sonata_name: str  # 合鸣效果
 
 
-async def get_one_rank_info(user_id, uid, role_detail, rankDetail):
-    equipPhantomList = role_detail.phantomData.equipPhantomList
-
-    calc: WuWaCalc = WuWaCalc(role_detail)
-    calc.phantom_pre = calc.prepare_phantom()
-    calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-    calc.calc_temp = get_calc_map(
-        calc.phantom_card,
-        role_detail.role.roleName,
-        role_detail.role.roleId,
-    )
-
-    # 评分
-    phantom_score = 0
-    # calc_temp = get_calc_map(phantom_sum_value, role_detail.role.roleName)
-    for i, _phantom in enumerate(equipPhantomList):
-        if _phantom and _phantom.phantomProp:
-            props = _phantom.get_props()
-            _score, _bg = calc_phantom_score(
-                role_detail.role.roleId, props, _phantom.cost, calc.calc_temp
-            )
-            phantom_score += _score
-
-    if phantom_score == 0:
+def get_one_rank_info(user_id, uid, role_detail, role_score: WavesRoleScore):
+    """role_score 由 get_role_scores 读取或计算"""
+    if role_score.score == 0:
         return
 
-    phantom_score = round(phantom_score, 2)
-    phantom_bg = get_total_score_bg(
-        role_detail.role.roleName, phantom_score, calc.calc_temp
-    )
-
-    calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
-    calc.damageAttribute = calc.card_sort_map_to_attribute(calc.role_card)
-
-    if rankDetail:
-        crit_damage, expected_damage = rankDetail["func"](
-            calc.damageAttribute, role_detail
-        )
-    else:
-        expected_damage = "0"
-
-    sonata_name = ""
-    ph_detail = calc.phantom_card.get("ph_detail", [])
-    if isinstance(ph_detail, list):
-        for ph in ph_detail:
-            if ph.get("ph_num") == 5:
-                sonata_name = ph.get("ph_name", "")
-                break
-
-            if ph.get("isFull"):
-                sonata_name = ph.get("ph_name", "")
-                break
+    phantom_score = round(role_score.score, 2)
+    expected_damage = role_score.expected_damage or "0"
 
     rankInfo = RankInfo(
         **{
@@ -144,10 +99,10 @@ async def get_one_rank_info(user_id, uid, role_detail, rankDetail):
             "chain": role_detail.get_chain_num(),
             "chainName": role_detail.get_chain_name(),
             "score": round(int(phantom_score * 100) / 100, ndigits=2),
-            "score_bg": phantom_bg,
+            "score_bg": role_score.score_bg,
             "expected_damage": expected_damage,
             "expected_damage_int": int(expected_damage.replace(",", "")),
-            "sonata_name": sonata_name,
+            "sonata_name": role_score.sonata_name,
         }
     )
     return rankInfo
@@ -156,62 +111,35 @@ async def get_one_rank_info(user_id, uid, role_detail, rankDetail):
 async def find_role_detail(
     uid: str, char_id: Union[int, str, List[str], List[int]]
 ) -> Optional[RoleDetailData]:
-    role_details = await get_all_role_detail_info_list(uid)
-    if role_details is None:
-        return None
-
-    # 将char_id转换为字符串列表进行匹配
+    # 将char_id转换为列表, 只读取需要的角色
     if isinstance(char_id, (int, str)):
-        char_id_list = [str(char_id)]
+        char_id_list = [char_id]
     else:
-        char_id_list = [str(cid) for cid in char_id]
+        char_id_list = list(char_id)
 
-    # 使用生成器来进行过滤
-    return next(
-        (role for role in role_details if str(role.role.roleId) in char_id_list), None
-    )
+    role_details = await get_role_detail_info_list(uid, char_id_list)
+    return role_details[0] if role_details else None
 
 
-async def get_rank_info_for_user(
-    user: WavesBind,
-    char_id,
+async def get_rank_role_detail(
+    member: WavesGroupBind,
     find_char_id,
-    rankDetail,
     tokenLimitFlag,
     wavesTokenUsersMap,
-):
-    rankInfoList = []
-    if not user.uid:
-        return rankInfoList
-
-    tasks = [find_role_detail(uid, find_char_id) for uid in user.uid.split("_")]
-    role_details = await asyncio.gather(*tasks)
-
-    for uid, role_detail in zip(user.uid.split("_"), role_details):
-        if (
-            tokenLimitFlag
-            and (
-                user.user_id,
-                uid,
-            )
-            not in wavesTokenUsersMap
-        ):
-            continue
-        if not role_detail:
-            continue
-        if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
-            continue
-
-        rankInfo = await get_one_rank_info(user.user_id, uid, role_detail, rankDetail)
-        if not rankInfo:
-            continue
-        rankInfoList.append(rankInfo)
+) -> Optional[RoleDetailData]:
+    if tokenLimitFlag and (member.user_id, member.uid) not in wavesTokenUsersMap:
+        return
 
-    return rankInfoList
+    role_detail = await find_role_detail(member.uid, find_char_id)
+    if not role_detail:
+        return
+    if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
+        return
+    return role_detail
 
 
 async def get_all_rank_info(
-    users: List[WavesBind],
+    members: List[WavesGroupBind],
     char_id,
     find_char_id,
     rankDetail,
@@ -220,22 +148,34 @@ async def get_all_rank_info(
 ):
     semaphore = asyncio.Semaphore(50)
 
-    async def process_user(user):
+    async def process_member(member):
         async with semaphore:
-            return await get_rank_info_for_user(
-                user,
-                char_id,
+            return await get_rank_role_detail(
+                member,
                 find_char_id,
-                rankDetail,
                 tokenLimitFlag,
                 wavesTokenUsersMap,
             )
 
-    tasks = [process_user(user) for user in users]
-    results = await asyncio.gather(*tasks)
+    tasks = [process_member(member) for member in members]
+    role_details = await asyncio.gather(*tasks)
+    found = [
+        (member, role_detail)
+        for member, role_detail in zip(members, role_details)
+        if role_detail
+    ]
+
+    # 面板未变化的成员直接读取评分缓存, 其余一次批量计算
+    role_scores = await get_role_scores(
+        [(member.uid, role_detail) for member, role_detail in found],
+        need_expected_damage=True,
+    )
 
-    # Flatten the results list
-    rankInfoList = [rank_info for result in results for rank_info in result]
+    rankInfoList = []
+    for (member, role_detail), role_score in zip(found, role_scores):
+        rankInfo = get_one_rank_info(member.user_id, member.uid, role_detail, role_score)
+        if rankInfo:
+            rankInfoList.append(rankInfo)
     return rankInfoList
 
 
@@ -288,10 +228,10 @@ async def draw_rank_img(
     start_time = time.time()
     logger.info(f"[get_rank_info_for_user] start: {start_time}")
     # 获取群里的所有拥有该角色人的数据
-    users = await WavesBind.get_group_all_uid(ev.group_id)
+    members = await WavesGroupBind.get_group_members(ev.group_id)
 
     tokenLimitFlag, wavesTokenUsersMap = await get_waves_token_condition(ev)
-    if not users:
+    if not members:
         msg = []
         msg.append(f"[鸣潮] 群【{ev.group_id}】暂无【{char}】面板")
         msg.append(f"请使用【{PREFIX}刷新面板】后再使用此功能！")
@@ -315,7 +255,7 @@ async def draw_rank_img(
 
     damage_title = (rankDetail and rankDetail["title"]) or "无"
     rankInfoList = await get_all_rank_info(
-        list(users),
+        members,
         char_id,
         find_char_id,
         rankDetail,
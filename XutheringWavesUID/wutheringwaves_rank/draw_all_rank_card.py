@@ -18,6 +18,7 @@ from ..utils.api.wwapi import (
     RankInfoResponse,
     RankItem,
 )
+from ..utils.api.wwapi_client import wwapi_client
 from ..utils.ascension.char import get_char_model
 from ..utils.ascension.weapon import get_weapon_model
 from ..utils.cache import TimedCache
@@ -95,23 +96,22 @@ async def get_rank(item: RankItem) -> Optional[RankInfoResponse]:
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        try:
-            res = await client.post(
-                GET_RANK_URL,
-                json=item.dict(),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            if res.status_code == 200:
-                return RankInfoResponse.model_validate(res.json())
-            else:
-                logger.warning(f"获取排行失败: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"获取排行失败: {e}")
+    try:
+        res = await wwapi_client.post(
+            GET_RANK_URL,
+            json=item.dict(),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {WavesToken}",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        if res.status_code == 200:
+            return RankInfoResponse.model_validate(res.json())
+        else:
+            logger.warning(f"获取排行失败: {res.status_code} - {res.text}")
+    except Exception as e:
+        logger.exception(f"获取排行失败: {e}")
 
 
 async def draw_all_rank_card(
@@ -8,7 +8,7 @@ from gsuid_core.logger import logger
 from gsuid_core.models import Event
 from gsuid_core.utils.image.convert import convert_img
 
-from ..utils.database.models import WavesBind
+from ..utils.database.models import WavesBind, WavesGroupBind
 from ..utils.fonts.waves_fonts import (
     waves_font_18,
     waves_font_20,
@@ -63,36 +63,29 @@ class GachaRankCard:
             self.weighted = 1000
 
 
-async def get_all_gacha_rank_info(users: List[WavesBind], bot_id: str) -> List[GachaRankCard]:
+async def get_all_gacha_rank_info(members: List[WavesGroupBind], bot_id: str) -> List[GachaRankCard]:
     """获取所有用户的抽卡排行信息"""
     rankInfoList = []
 
-    for user in users:
-        if not user.user_id:
-            continue
-
-        # 处理多个uid（用下划线连接）
-        if not user.uid:
-            continue
-
-        for uid in user.uid.split("_"):
-            try:
-                stats = await get_gacha_stats(uid)
-                if not stats:
-                    continue
-
-                rankInfo = GachaRankCard(user.user_id, uid, stats)
+    for member in members:
+        uid = member.uid
+        try:
+            stats = await get_gacha_stats(uid)
+            if not stats:
+                continue
 
-                # 获取配置的最小抽数阈值
-                min_pull = WutheringWavesConfig.get_config("GachaRankMin").data
-                if rankInfo.total_count < min_pull:
-                    continue
+            rankInfo = GachaRankCard(member.user_id, uid, stats)
 
-                rankInfoList.append(rankInfo)
-            except Exception as e:
-                logger.debug(f"获取用户{uid}抽卡排行数据失败: {e}")
+            # 获取配置的最小抽数阈值
+            min_pull = WutheringWavesConfig.get_config("GachaRankMin").data
+            if rankInfo.total_count < min_pull:
                 continue
 
+            rankInfoList.append(rankInfo)
+        except Exception as e:
+            logger.debug(f"获取用户{uid}抽卡排行数据失败: {e}")
+            continue
+
     return rankInfoList
 
 
@@ -137,8 +130,8 @@ async def draw_gacha_rank_card(bot, ev: Event) -> Union[str, bytes]:
             sort_reverse = False
 
     # 获取群里的所有用户
-    users = await WavesBind.get_group_all_uid(ev.group_id)
-    if not users:
+    members = await WavesGroupBind.get_group_members(ev.group_id)
+    if not members:
         msg = []
         msg.append(f"[鸣潮] 群【{ev.group_id}】暂无抽卡排行数据")
         msg.append(f"请使用【{PREFIX}导入抽卡记录】后再使用此功能！")
@@ -148,7 +141,7 @@ async def draw_gacha_rank_card(bot, ev: Event) -> Union[str, bytes]:
             )
         return "\n".join(msg)
 
-    rankInfoList = await get_all_gacha_rank_info(list(users), ev.bot_id)
+    rankInfoList = await get_all_gacha_rank_info(members, ev.bot_id)
     if len(rankInfoList) == 0:
         msg = []
         msg.append(f"[鸣潮] 群【{ev.group_id}】暂无抽卡排行数据")
@@ -1,10 +1,8 @@
 import asyncio
-import json
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import List, Tuple, Union
 
-import aiofiles
 from PIL import Image, ImageDraw
 from pydantic import BaseModel
 
@@ -14,16 +12,9 @@ from gsuid_core.models import Event
 from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
-from ..utils.api.model import RoleDetailData
 from ..utils.cache import TimedCache
-from ..utils.calc import WuWaCalc
-from ..utils.calculate import (
-    calc_phantom_score,
-    get_calc_map,
-)
-from ..utils.char_info_utils import get_all_role_detail_info_list
-from ..utils.database.models import WavesBind
-from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
+from ..utils.database.models import WavesBind, WavesGroupBind
+from ..utils.player_summary import get_player_summary
 from ..utils.fonts.waves_fonts import (
     waves_font_12,
     waves_font_16,
@@ -78,79 +69,6 @@ async def get_practice_rank_token_condition(ev):
     return False
 
 
-def calculate_role_phantom_score(role_detail: RoleDetailData) -> float:
-    """计算单个角色的声骸总分
-
-    Args:
-        role_detail: 角色详情
-
-    Returns:
-        角色的声骸总分
-    """
-    if not role_detail.phantomData or not role_detail.phantomData.equipPhantomList:
-        return 0.0
-
-    calc: WuWaCalc = WuWaCalc(role_detail)
-    calc.phantom_pre = calc.prepare_phantom()
-    calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-    calc.calc_temp = get_calc_map(
-        calc.phantom_card,
-        role_detail.role.roleName,
-        role_detail.role.roleId,
-    )
-
-    phantom_score = 0.0
-    for _phantom in role_detail.phantomData.equipPhantomList:
-        if _phantom and _phantom.phantomProp:
-            props = _phantom.get_props()
-            _score, _ = calc_phantom_score(
-                role_detail.role.roleId, props, _phantom.cost, calc.calc_temp
-            )
-            phantom_score += _score
-
-    return phantom_score
-
-
-async def save_char_list_data(uid: str, char_list_data: Dict):
-    """保存角色评分数据到charListData.json
-
-    Args:
-        uid: 用户uid
-        char_list_data: 角色评分字典，格式为 {roleId: score}
-    """
-    try:
-        _dir = PLAYER_PATH / uid
-        _dir.mkdir(parents=True, exist_ok=True)
-        path = _dir / "charListData.json"
-
-        async with aiofiles.open(path, "w", encoding="utf-8") as file:
-            await file.write(json.dumps(char_list_data, ensure_ascii=False))
-    except Exception as e:
-        logger.debug(f"保存charListData.json失败 uid={uid}: {e}")
-
-
-async def load_char_list_data(uid: str) -> Optional[Dict]:
-    """从charListData.json读取角色评分数据
-
-    Args:
-        uid: 用户uid
-
-    Returns:
-        角色评分字典，格式为 {roleId: score}，如果文件不存在返回None
-    """
-    try:
-        path = PLAYER_PATH / uid / "charListData.json"
-        if not path.exists():
-            return None
-
-        async with aiofiles.open(path, mode="r", encoding="utf-8") as f:
-            char_list_data = json.loads(await f.read())
-            return char_list_data
-    except Exception as e:
-        logger.debug(f"读取charListData.json失败 uid={uid}: {e}")
-        return None
-
-
 TEXT_PATH = Path(__file__).parent / "texture2d"
 avatar_mask = Image.open(TEXT_PATH / "avatar_mask.png")
 char_mask = Image.open(TEXT_PATH / "char_mask.png")
@@ -173,100 +91,49 @@ class PracticeRankInfo(BaseModel):
     uid: str  # uid
     kuro_name: str  # 玩家名字
     total_score: float  # 总声骸分数
-    role_details: List[RoleDetailData]  # 角色详情列表
+    role_scores: List[Tuple[int, float]]  # 计入排行的 (角色id, 声骸分数), 按分数降序
 
 
 async def get_all_rank_list_info(
-    users: List[WavesBind],
+    members: List[WavesGroupBind],
     threshold: int = 175,
 ) -> List[PracticeRankInfo]:
     """获取所有用户的练度排行信息（基于声骸分数）
 
     Args:
-        users: 用户列表
+        members: 群成员列表
         threshold: 计入排行的角色声骸分数阈值 (150-195)
     """
     rankInfoList = []
 
-    for user in users:
-        if not user.uid:
+    for member in members:
+        uid = member.uid
+        # 从角色摘要读取声骸分数, 不读取完整面板
+        summary = await get_player_summary(uid, need_score=True)
+        if not summary:
             continue
 
-        # 处理多个uid（用下划线连接）
-        for uid in user.uid.split("_"):
-            # 首先尝试从charListData.json读取缓存的角色评分
-            char_list_data = await load_char_list_data(uid)
-
-            if char_list_data:
-                # 使用缓存的角色评分数据
-                total_score = 0.0
-                valid_role_ids = []
-
-                for role_id_str, score in char_list_data.items():
-                    if score >= threshold:
-                        total_score += score
-                        valid_role_ids.append(role_id_str)
-
-                if total_score == 0:
-                    continue
-
-                total_score = round(total_score, 2)
-
-                # 获取角色详情用于排行展示
-                role_details_list = await get_all_role_detail_info_list(uid)
-                if role_details_list is None:
-                    continue
-
-                role_details = [r for r in role_details_list if str(r.role.roleId) in valid_role_ids]
+        role_scores = sorted(
+            (
+                (role_id, role.score)
+                for role_id, role in summary.items()
+                if role.score is not None and role.score >= threshold
+            ),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        total_score = round(sum(score for _, score in role_scores), 2)
+        if total_score == 0:
+            continue
 
-                rankInfo = PracticeRankInfo(
-                    qid=user.user_id,
-                    uid=uid,
-                    kuro_name=uid,
-                    total_score=total_score,
-                    role_details=role_details,
-                )
-                rankInfoList.append(rankInfo)
-            else:
-                # charListData.json不存在，从rawData计算并保存
-                role_details_list = await get_all_role_detail_info_list(uid)
-                if role_details_list is None:
-                    continue
-
-                role_details = list(role_details_list)
-                if not role_details:
-                    continue
-
-                # 计算总声骸分数并保存到charListData
-                total_score = 0.0
-                valid_role_details = []
-                char_list_data = {}
-
-                for role_detail in role_details:
-                    phantom_score = calculate_role_phantom_score(role_detail)
-                    char_list_data[str(role_detail.role.roleId)] = phantom_score
-
-                    # 只计算分数>=阈值的角色
-                    if phantom_score >= threshold:
-                        total_score += phantom_score
-                        valid_role_details.append(role_detail)
-
-                # 保存计算结果到charListData.json
-                if char_list_data:
-                    await save_char_list_data(uid, char_list_data)
-
-                if total_score == 0:
-                    continue
-
-                total_score = round(total_score, 2)
-                rankInfo = PracticeRankInfo(
-                    qid=user.user_id,
-                    uid=uid,
-                    kuro_name=uid,
-                    total_score=total_score,
-                    role_details=valid_role_details,
-                )
-                rankInfoList.append(rankInfo)
+        rankInfo = PracticeRankInfo(
+            qid=member.user_id,
+            uid=uid,
+            kuro_name=uid,
+            total_score=total_score,
+            role_scores=role_scores,
+        )
+        rankInfoList.append(rankInfo)
 
     return rankInfoList
 
@@ -290,8 +157,8 @@ async def draw_rank_list(bot: Bot, ev: Event, threshold: int = 175) -> Union[str
             threshold = 175
 
     # 获取群里的所有用户
-    users = await WavesBind.get_group_all_uid(ev.group_id)
-    if not users:
+    members = await WavesGroupBind.get_group_members(ev.group_id)
+    if not members:
         msg = []
         msg.append(f"[鸣潮] 群【{ev.group_id}】暂无练度排行数据")
         msg.append(f"请使用【{PREFIX}刷新面板】后再使用此功能！")
@@ -302,7 +169,7 @@ async def draw_rank_list(bot: Bot, ev: Event, threshold: int = 175) -> Union[str
         msg.append("")
         return "\n".join(msg)
 
-    rankInfoList = await get_all_rank_list_info(list(users), threshold)
+    rankInfoList = await get_all_rank_list_info(members, threshold)
     if len(rankInfoList) == 0:
         msg = []
         msg.append(f"[鸣潮] 群【{ev.group_id}】暂无练度排行数据")
@@ -442,37 +309,13 @@ async def draw_rank_list(bot: Bot, ev: Event, threshold: int = 175) -> Union[str
         )
 
         # 绘制角色数量（根据等级显示）
-        char_count = len(rankInfo.role_details)
+        char_count = len(rankInfo.role_scores)
         bar_draw.text((210, 75), f"{threshold_label}角色数: {char_count}", "white", waves_font_18, "lm")
 
         # 绘制角色信息
-        if rankInfo.role_details:
-            # 按声骸分数排序，取前5名
-            role_scores = []
-            for role in rankInfo.role_details:
-                if not role.phantomData or not role.phantomData.equipPhantomList:
-                    continue
-                calc: WuWaCalc = WuWaCalc(role)
-                calc.phantom_pre = calc.prepare_phantom()
-                calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
-                calc.calc_temp = get_calc_map(
-                    calc.phantom_card,
-                    role.role.roleName,
-                    role.role.roleId,
-                )
-                phantom_score = 0.0
-                for _phantom in role.phantomData.equipPhantomList:
-                    if _phantom and _phantom.phantomProp:
-                        props = _phantom.get_props()
-                        _score, _ = calc_phantom_score(
-                            role.role.roleId, props, _phantom.cost, calc.calc_temp
-                        )
-                        phantom_score += _score
-                role_scores.append((role, phantom_score))
-
-            sorted_roles = sorted(
-                role_scores, key=lambda x: x[1], reverse=True
-            )[:8]
+        if rankInfo.role_scores:
+            # 取声骸分数最高的前8名
+            sorted_roles = rankInfo.role_scores[:8]
 
             # 在条目底部绘制前5名角色的头像（放在UID右边）
             char_size = 40
@@ -480,11 +323,11 @@ async def draw_rank_list(bot: Bot, ev: Event, threshold: int = 175) -> Union[str
             char_start_x = 350
             char_start_y = 35
 
-            for i, (role, score) in enumerate(sorted_roles):
+            for i, (role_id, score) in enumerate(sorted_roles):
                 char_x = char_start_x + i * char_spacing
 
                 # 获取角色头像
-                char_avatar = await get_square_avatar(role.role.roleId)
+                char_avatar = await get_square_avatar(role_id)
                 char_avatar = char_avatar.resize((char_size, char_size))
 
                 # 应用圆形遮罩
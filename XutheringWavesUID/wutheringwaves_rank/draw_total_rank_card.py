@@ -17,6 +17,7 @@ from ..utils.api.wwapi import (
     TotalRankRequest,
     TotalRankResponse,
 )
+from ..utils.api.wwapi_client import wwapi_client
 from ..utils.cache import TimedCache
 from ..utils.database.models import WavesBind
 from ..utils.fonts.waves_fonts import (
@@ -73,23 +74,22 @@ async def get_rank(item: TotalRankRequest) -> Optional[TotalRankResponse]:
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        try:
-            res = await client.post(
-                GET_TOTAL_RANK_URL,
-                json=item.dict(),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            if res.status_code == 200:
-                return TotalRankResponse.model_validate(res.json())
-            else:
-                logger.warning(f"获取练度排行失败: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"获取练度排行失败: {e}")
+    try:
+        res = await wwapi_client.post(
+            GET_TOTAL_RANK_URL,
+            json=item.dict(),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {WavesToken}",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        if res.status_code == 200:
+            return TotalRankResponse.model_validate(res.json())
+        else:
+            logger.warning(f"获取练度排行失败: {res.status_code} - {res.text}")
+    except Exception as e:
+        logger.exception(f"获取练度排行失败: {e}")
 
 
 async def draw_total_rank(bot: Bot, ev: Event, pages: int) -> Union[str, bytes]:
@@ -1,14 +1,13 @@
 import re
 import copy
-import json
 import time
 import asyncio
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Union, Optional
 from datetime import datetime, timezone, timedelta
 
 import httpx
-import aiofiles
+from msgspec import UNSET
 from gsuid_core.bot import Bot
 from PIL import Image, ImageDraw
 from gsuid_core.models import Event
@@ -18,8 +17,12 @@ from gsuid_core.utils.image.image_tools import crop_center_img
 
 from ..utils.cache import TimedCache
 from ..utils.util import get_version
+from ..utils.api import model_struct
 from ..utils.api.model import SlashDetail
-from ..utils.database.models import WavesBind
+from ..utils.database.models import WavesBind, WavesGroupBind
+from ..utils.player_path import get_player_path
+from ..utils.player_writer import player_writer
+from ..utils.player_summary import get_player_summary
 from ..utils.ascension.char import get_char_model
 from ..utils.resource.RESOURCE_PATH import SLASH_PATH
 from ..wutheringwaves_abyss.draw_slash_card import COLOR_QUALITY
@@ -30,6 +33,7 @@ from ..utils.api.wwapi import (
     SlashRankRes,
     SlashRankItem,
 )
+from ..utils.api.wwapi_client import wwapi_client
 from ..utils.fonts.waves_fonts import (
     waves_font_12,
     waves_font_16,
@@ -189,23 +193,22 @@ async def get_rank(item: SlashRankItem) -> Optional[SlashRankRes]:
     if not WavesToken:
         return
 
-    async with httpx.AsyncClient() as client:
-        try:
-            res = await client.post(
-                GET_SLASH_RANK_URL,
-                json=item.dict(),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {WavesToken}",
-                },
-                timeout=httpx.Timeout(10),
-            )
-            if res.status_code == 200:
-                return SlashRankRes.model_validate(res.json())
-            else:
-                logger.warning(f"获取排行失败: {res.status_code} - {res.text}")
-        except Exception as e:
-            logger.exception(f"获取排行失败: {e}")
+    try:
+        res = await wwapi_client.post(
+            GET_SLASH_RANK_URL,
+            json=item.dict(),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {WavesToken}",
+            },
+            timeout=httpx.Timeout(10),
+        )
+        if res.status_code == 200:
+            return SlashRankRes.model_validate(res.json())
+        else:
+            logger.warning(f"获取排行失败: {res.status_code} - {res.text}")
+    except Exception as e:
+        logger.exception(f"获取排行失败: {e}")
 
 
 async def draw_all_slash_rank_card(bot: Bot, ev: Event):
@@ -480,7 +483,10 @@ class SlashRankListInfo:
     """无尽排行信息"""
 
     def __init__(
-        self, user_id: str, uid: str, slash_data: Optional[SlashDetail] = None
+        self,
+        user_id: str,
+        uid: str,
+        slash_data: Union[SlashDetail, model_struct.SlashDetail, None] = None,
     ):
         self.user_id = user_id
         self.uid = uid
@@ -500,79 +506,53 @@ class SlashRankListInfo:
 
 
 async def get_all_slash_rank_info(
-    users: List[WavesBind],
+    members: List[WavesGroupBind],
 ) -> List[SlashRankListInfo]:
     """从本地获取所有用户的无尽排行信息"""
-    from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
-
     rankInfoList = []
 
-    for user in users:
-        if not user.uid:
-            continue
-
-        # 处理多个uid（用下划线连接）
-        for uid in user.uid.split("_"):
-            # 从本地读取该用户的无尽数据
-            try:
-                slash_data_path = Path(PLAYER_PATH / uid / "slashData.json")
-                if not slash_data_path.exists():
-                    continue
-
-                async with aiofiles.open(
-                    slash_data_path, mode="r", encoding="utf-8"
-                ) as f:
-                    slash_raw = json.loads(await f.read())
-
-                record_time = None
-                slash_data = slash_raw
-                if isinstance(slash_raw, dict) and "slash_data" in slash_raw:
-                    record_time = slash_raw.get("record_time", ENDLESS_BASE_TIMESTAMP)
-                    slash_data = slash_raw.get("slash_data")
+    for member in members:
+        uid = member.uid
+        # 从本地读取该用户的无尽数据
+        try:
+            raw = await player_writer.read(get_player_path(uid) / "slashData.json")
+            if raw is None:
+                continue
 
-                if not isinstance(slash_data, dict) or not slash_data:
-                    continue
+            record = model_struct.decode_slash_record(raw)
 
-                if is_endless_record_expired(record_time):
-                    logger.debug(f"用户{uid}无尽数据已过期，跳过")
-                    continue
+            record_time = record.record_time
+            if record_time is UNSET:
+                record_time = ENDLESS_BASE_TIMESTAMP
+            slash_data = record.slash_data
 
-                if not slash_data.get("isUnlock", False):
-                    continue
+            if not slash_data:
+                continue
 
-                slash_data = SlashDetail.model_validate(slash_data)
+            if is_endless_record_expired(record_time):
+                logger.debug(f"用户{uid}无尽数据已过期，跳过")
+                continue
 
-                rankInfo = SlashRankListInfo(user.user_id, uid, slash_data)
-                if rankInfo.score > 0:
-                    rankInfoList.append(rankInfo)
-            except Exception as e:
-                logger.debug(f"获取用户{uid}本地无尽数据失败: {e}")
+            if not slash_data.isUnlock:
                 continue
 
+            rankInfo = SlashRankListInfo(member.user_id, uid, slash_data)
+            if rankInfo.score > 0:
+                rankInfoList.append(rankInfo)
+        except Exception as e:
+            logger.debug(f"获取用户{uid}本地无尽数据失败: {e}")
+            continue
+
     return rankInfoList
 
 
 async def get_role_chain_count(uid: str, role_id: int) -> int:
-    """从rawData.json获取角色共鸣链数量"""
-    from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
-
+    """从角色摘要获取角色共鸣链数量"""
     try:
-        raw_data_path = Path(PLAYER_PATH / str(uid) / "rawData.json")
-        if not raw_data_path.exists():
+        summary = await get_player_summary(str(uid))
+        if not summary or role_id not in summary:
             return -1
-
-        async with aiofiles.open(raw_data_path, mode="r", encoding="utf-8") as f:
-            raw_data = json.loads(await f.read())
-
-        # rawData是一个列表，包含每个角色的详细信息
-        if isinstance(raw_data, list):
-            for role_data in raw_data:
-                if role_data.get("role", {}).get("roleId") == role_id:
-                    # 获取chainList长度
-                    chain_list = role_data.get("chainList", [])
-                    unlocked_chains = [c for c in chain_list if c.get("unlocked", False)]
-                    return len(unlocked_chains)
-        return -1
+        return summary[role_id].chain
     except Exception as e:
         logger.debug(f"获取角色{role_id}共鸣链失败: {e}")
         return -1
@@ -580,28 +560,18 @@ async def get_role_chain_count(uid: str, role_id: int) -> int:
 
 async def get_five_star_chain_total(uid: str) -> int:
     """计算五星角色的金数（0链=1金，6链=7金，即链数+1）"""
-    from ..utils.resource.RESOURCE_PATH import PLAYER_PATH
-
     try:
-        raw_data_path = Path(PLAYER_PATH / str(uid) / "rawData.json")
-        if not raw_data_path.exists():
+        summary = await get_player_summary(str(uid))
+        if not summary:
             return 0
 
-        async with aiofiles.open(raw_data_path, mode="r", encoding="utf-8") as f:
-            raw_data = json.loads(await f.read())
-
         total_gold = 0
-        if isinstance(raw_data, list):
-            for role_data in raw_data:
-                role_id = role_data.get("role", {}).get("roleId")
-                if role_id:
-                    char_model = get_char_model(role_id)
-                    # 检查是否是五星角色
-                    if char_model and char_model.starLevel == 5:
-                        chain_list = role_data.get("chainList", [])
-                        unlocked_chains = [c for c in chain_list if c.get("unlocked", False)]
-                        # 金数 = 共鸣链数 + 1
-                        total_gold += len(unlocked_chains) + 1
+        for role_id, role in summary.items():
+            char_model = get_char_model(role_id)
+            # 检查是否是五星角色
+            if char_model and char_model.starLevel == 5:
+                # 金数 = 共鸣链数 + 1
+                total_gold += role.chain + 1
         return total_gold
     except Exception as e:
         logger.debug(f"计算五星角色金数失败: {e}")
@@ -617,8 +587,8 @@ async def draw_slash_rank_list(bot: Bot, ev: Event):
     tokenLimitFlag = await get_endless_rank_token_condition(ev)
 
     # 获取群里的所有用户
-    users = await WavesBind.get_group_all_uid(ev.group_id)
-    if not users:
+    members = await WavesGroupBind.get_group_members(ev.group_id)
+    if not members:
         msg = []
         msg.append(f"[鸣潮] 群【{ev.group_id}】暂无无尽排行数据")
         msg.append(f"请使用【{PREFIX}无尽】后再使用此功能！")
@@ -629,7 +599,7 @@ async def draw_slash_rank_list(bot: Bot, ev: Event):
         msg.append("")
         return "\n".join(msg)
 
-    rankInfoList = await get_all_slash_rank_info(list(users))
+    rankInfoList = await get_all_slash_rank_info(members)
     if len(rankInfoList) == 0:
         msg = []
         msg.append(f"[鸣潮] 群【{ev.group_id}】暂无无尽排行数据")
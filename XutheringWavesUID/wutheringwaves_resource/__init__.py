@@ -1,11 +1,23 @@
-import asyncio
-
+from gsuid_core.aps import scheduler
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
 from gsuid_core.models import Event
 from gsuid_core.sv import SV
 
+from ..utils.panel_store import (
+    PANEL_STORES,
+    get_panel_store_backend,
+    migrate_panel_store,
+)
+from ..utils.player_codec import recompress_player_files
+from ..utils.player_path import (
+    LAYOUT_FLAT,
+    LAYOUT_SHARDED,
+    get_player_path_layout,
+    migrate_player_paths,
+)
 from ..utils.resource.download_all_resource import download_all_resource
+from ..utils.storage_gc import format_gc_result, run_storage_gc
 
 sv_download_config = SV("ww资源下载", pm=1)
 
@@ -17,7 +29,64 @@ async def send_download_resource_msg(bot: Bot, ev: Event):
     await bot.send("[鸣潮] 下载完成！")
 
 
+@sv_download_config.on_command("迁移面板数据", block=True)
+async def send_migrate_panel_msg(bot: Bot, ev: Event):
+    # 默认迁移到当前配置的存储方式
+    target = ev.text.strip().lower() or get_panel_store_backend()
+    if target not in PANEL_STORES:
+        return await bot.send(f"[鸣潮] 可选存储方式: {'、'.join(PANEL_STORES)}")
+    src = next(v for k, v in PANEL_STORES.items() if k != target)
+    dst = PANEL_STORES[target]
+
+    await bot.send(f"[鸣潮] 开始迁移面板数据 {src.name} -> {dst.name}")
+    count = await migrate_panel_store(src, dst)
+    await bot.send(f"[鸣潮] 迁移完成，共迁移{count}个账号")
+
+
+@sv_download_config.on_command("迁移玩家目录", block=True)
+async def send_migrate_player_path_msg(bot: Bot, ev: Event):
+    # 默认迁移到当前配置的目录布局
+    target = ev.text.strip().lower() or get_player_path_layout()
+    if target not in (LAYOUT_FLAT, LAYOUT_SHARDED):
+        return await bot.send(f"[鸣潮] 可选目录布局: {LAYOUT_FLAT}、{LAYOUT_SHARDED}")
+
+    await bot.send(f"[鸣潮] 开始迁移玩家目录 -> {target}")
+    count = await migrate_player_paths(target)
+    await bot.send(f"[鸣潮] 迁移完成，共迁移{count}个玩家")
+
+
+@sv_download_config.on_fullmatch("压缩玩家数据", block=True)
+async def send_recompress_player_msg(bot: Bot, ev: Event):
+    await bot.send("[鸣潮] 开始按当前配置重写玩家数据")
+    count, saved = await recompress_player_files()
+    await bot.send(
+        f"[鸣潮] 重写完成，共{count}个文件，节省{saved / 1024 / 1024:.1f}MB"
+    )
+
+
+@sv_download_config.on_fullmatch(("存储清理预览", "存储清理"), block=True)
+async def send_storage_gc_msg(bot: Bot, ev: Event):
+    dry_run = ev.command == "存储清理预览"
+    result = await run_storage_gc(dry_run)
+    title = "可清理" if dry_run else "已清理"
+    await bot.send(f"[鸣潮] 存储{title}:\n{format_gc_result(result)}")
+
+
 async def startup():
     logger.info("[鸣潮] 等待资源下载完成...")
     await download_all_resource()
     logger.info("[鸣潮] 资源下载完成！完成启动！")
+
+
+@scheduler.scheduled_job("cron", hour=4, minute=10)
+async def storage_gc():
+    await run_storage_gc()
+
+
+@scheduler.scheduled_job("cron", hour=4, minute=30)
+async def recompress_player_data():
+    count, saved = await recompress_player_files()
+    if count:
+        logger.info(
+            f"[鸣潮] 重写玩家数据 {count} 个文件, 节省 {saved / 1024 / 1024:.1f}MB"
+        )
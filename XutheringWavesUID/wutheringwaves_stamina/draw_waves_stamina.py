@@ -12,6 +12,7 @@ from gsuid_core.models import Event
 from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import crop_center_img
 
+from ..utils.api.fetch_scheduler import fetch_scheduler
 from ..utils.api.model import AccountBaseInfo, DailyData
 from ..utils.api.request_util import KuroApiResp
 from ..utils.database.models import WavesBind, WavesUser
@@ -195,8 +196,11 @@ async def _draw_stamina_img(ev: Event, valid: Dict) -> Image.Image:
             )
             if ck:
                 for char_id in SPECIAL_CHAR[char_id]:
-                    role_detail_info = await waves_api.get_role_detail_info(
-                        char_id, daily_info.roleId, ck
+                    role_detail_info = await fetch_scheduler.submit(
+                        daily_info.roleId,
+                        lambda: waves_api.get_role_detail_info(
+                            char_id, daily_info.roleId, ck
+                        ),
                     )
                     if not role_detail_info.success:
                         continue
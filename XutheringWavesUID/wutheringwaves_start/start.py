@@ -1,5 +1,5 @@
 from gsuid_core.logger import logger
-from gsuid_core.server import on_core_start
+from gsuid_core.server import on_core_shutdown, on_core_start
 
 from ..wutheringwaves_resource import startup
 
@@ -8,9 +8,11 @@ from ..wutheringwaves_resource import startup
 async def all_start():
     logger.info("[鸣潮] 启动中...")
     try:
+        from ..utils.calc.batch_score import ensure_batch_score_verified
         from ..utils.damage.register_char import register_char
         from ..utils.damage.register_echo import register_echo
         from ..utils.damage.register_weapon import register_weapon
+        from ..utils.database.models import WavesGroupBind
         from ..utils.limit_user_card import load_limit_user_card
         from ..utils.map.damage.register import register_damage, register_rank
         from ..utils.queues import init_queues
@@ -30,7 +32,28 @@ async def all_start():
         logger.info(f"[鸣潮][加载角色极限面板] 数量: {len(card_list)}")
 
         await startup()
+
+        # 重建群成员索引, 失败不影响其他启动步骤
+        try:
+            count = await WavesGroupBind.rebuild()
+            logger.info(f"[鸣潮][群成员索引] 数量: {count}")
+        except Exception as e:
+            logger.exception(f"[鸣潮][群成员索引] 重建失败: {e}")
+
+        # 声骸批量评分校验, 在线程中进行
+        await ensure_batch_score_verified()
     except Exception as e:
         logger.exception(e)
 
     logger.success("[鸣潮] 启动完成✅")
+
+
+@on_core_shutdown
+async def all_shutdown():
+    from ..utils.api.wwapi_client import wwapi_client
+    from ..utils.panel_store import sqlite_panel_store
+    from ..utils.player_writer import player_writer
+
+    await player_writer.flush_all()
+    await wwapi_client.close()
+    sqlite_panel_store.close()
@@ -1,7 +1,14 @@
 from gsuid_core.status.plugin_status import register_status
 
+from ..utils.api.fetch_scheduler import fetch_scheduler
+from ..utils.api.single_flight import get_single_flight_stats
+from ..utils.api.token_pool import public_token_pool
+from ..utils.api.wwapi_client import wwapi_client
 from ..utils.database.models import WavesBind, WavesUser
 from ..utils.image import get_ICON
+from ..utils.panel_cache import panel_cache
+from ..utils.player_writer import player_writer
+from ..utils.storage_gc import get_storage_gc_stats
 
 
 async def get_user_num():
@@ -14,11 +21,51 @@ async def get_add_num():
     return len(datas)
 
 
+async def get_coalesced_num():
+    stats = get_single_flight_stats().values()
+    return sum(i["hits"] + i["coalesced"] for i in stats)
+
+
+async def get_token_pool_num():
+    return len(public_token_pool)
+
+
+async def get_fetch_queue_num():
+    return sum(fetch_scheduler.queue_depth().values())
+
+
+async def get_panel_cache_hits():
+    return panel_cache.stats()["hits"]
+
+
+async def get_pending_writes():
+    return player_writer.stats()["pending"]
+
+
+async def get_storage_gc_freed():
+    return round(get_storage_gc_stats()["bytes"] / 1024 / 1024, 1)
+
+
+async def get_wwapi_latency():
+    stats = wwapi_client.stats().values()
+    count = sum(i["count"] for i in stats)
+    if not count:
+        return 0
+    return round(sum(i["avg_ms"] * i["count"] for i in stats) / count)
+
+
 register_status(
     get_ICON(),
     "XutheringWavesUID",
     {
         "绑定UID": get_add_num,
         "登录账户": get_user_num,
+        "合并请求": get_coalesced_num,
+        "公共token池": get_token_pool_num,
+        "详情请求排队": get_fetch_queue_num,
+        "面板缓存命中": get_panel_cache_hits,
+        "待写入文件": get_pending_writes,
+        "存储回收(MB)": get_storage_gc_freed,
+        "排行接口耗时(ms)": get_wwapi_latency,
     },
 )
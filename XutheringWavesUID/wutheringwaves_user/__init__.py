@@ -10,6 +10,7 @@ from gsuid_core.sv import SV
 
 from ..utils.button import WavesButton
 from ..utils.database.models import WavesBind, WavesUser
+from ..utils.waves_api import waves_api
 from ..wutheringwaves_config import PREFIX, WutheringWavesConfig
 from ..wutheringwaves_user.login_succ import login_success_msg
 from .deal import add_cookie, delete_cookie, get_cookie, refresh_bind
@@ -137,6 +138,14 @@ async def auto_delete_all_invalid_cookie():
     logger.info(f"[鸣潮]推送主人删除无效token结果: {msg}")
 
 
+token_pool_interval = WutheringWavesConfig.get_config("PublicTokenPoolInterval").data
+
+
+@scheduler.scheduled_job("interval", minutes=token_pool_interval or 30)
+async def refresh_public_token_pool():
+    await waves_api.refresh_public_token_pool()
+
+
 @waves_bind_uid.on_command(
     (
         "绑定",
@@ -6,6 +6,7 @@ from gsuid_core.models import Event
 from ..utils.api.api import PGR_GAME_ID, WAVES_GAME_ID
 from ..utils.api.model import KuroWavesUserInfo
 from ..utils.api.request_util import PLATFORM_SOURCE
+from ..utils.cache import credential_cache
 from ..utils.database.models import WavesBind, WavesUser
 from ..utils.error_reply import ERROR_CODE, WAVES_CODE_103
 from ..utils.waves_api import waves_api
@@ -86,6 +87,7 @@ async def add_cookie(ev: Event, ck: str, did: str) -> str:
                 },
                 update_data={"bat": bat, "did": did},
             )
+            credential_cache.invalidate(uid=data.roleId)
 
             res = await WavesBind.insert_waves_uid(
                 ev.user_id, ev.bot_id, data.roleId, ev.group_id, lenth_limit=9
@@ -133,6 +135,7 @@ async def add_cookie(ev: Event, ck: str, did: str) -> str:
                     platform=platform,
                     did=did,
                 )
+            credential_cache.invalidate(uid=data.roleId)
 
             res = await WavesBind.insert_uid(
                 ev.user_id,
@@ -0,0 +1,66 @@
+"""
+声骸批量评分基准
+用法: python tests/bench_batch_score.py [面板数]
+需要 gsuid_core 与下载的评分模块 (utils/waves_build)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+
+def bench(func, repeat: int = 15) -> float:
+    """多次运行取最快一次, 单位毫秒"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(count: int):
+    sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, str(Path(__file__).parents[1]))
+
+    from synthetic_panels import make_panels
+
+    from XutheringWavesUID.utils import calculate
+    from XutheringWavesUID.utils.api.model import RoleDetailData
+    from XutheringWavesUID.utils.calc import WuWaCalc, batch_score
+    from XutheringWavesUID.utils.damage.register_echo import register_echo
+
+    register_echo()
+    calcs = []
+    for panel in make_panels(count):
+        role_detail = RoleDetailData(**panel)
+        calc = WuWaCalc(role_detail)
+        calc.phantom_card = calc.enhance_summation_phantom_value(calc.prepare_phantom())
+        calc.calc_temp = calculate.get_calc_map(
+            calc.phantom_card, role_detail.role.roleName, role_detail.role.roleId
+        )
+        calcs.append(calc)
+
+    phantoms = [batch_score._get_phantoms(c.role_detail) for c in calcs]
+    roles = [
+        (c.calc_temp, c.role_detail.role.attributeName, p)
+        for c, p in zip(calcs, phantoms)
+    ]
+
+    def scalar():
+        for calc, role_phantoms in zip(calcs, phantoms):
+            batch_score._scalar_score(
+                calc.role_detail.role.roleId, role_phantoms, calc.calc_temp
+            )
+
+    print(f"面板数: {count}, 声骸数: {sum(map(len, phantoms))}")
+    print(f"逐条评分: {bench(scalar):.2f} ms")
+    if batch_score.np is not None:
+        numpy_ms = bench(lambda: batch_score.batch_phantom_score(roles, True))
+        print(f"批量评分 (numpy): {numpy_ms:.2f} ms")
+    python_ms = bench(lambda: batch_score.batch_phantom_score(roles, False))
+    print(f"批量评分 (python): {python_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,63 @@
+"""
+角色详情解码基准: pydantic 模型与 msgspec Struct
+用法: python tests/bench_struct_decode.py [玩家数] [每个玩家的角色数]
+需要 gsuid_core
+"""
+
+import gc
+import sys
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def measure(func):
+    """返回 (耗时毫秒, 结果占用的内存 MB), 内存单独统计, 不计入耗时"""
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed * 1000, retained / 1024 / 1024
+
+
+def main(players: int, roles: int):
+    sys.path.insert(0, str(Path(__file__).parent))
+    sys.path.insert(0, str(Path(__file__).parents[1]))
+
+    from synthetic_panels import make_panels
+
+    from XutheringWavesUID.utils.api import model_struct
+    from XutheringWavesUID.utils.api.model import RoleDetailData
+
+    files = [
+        json.dumps(make_panels(roles, seed=i), ensure_ascii=False).encode("utf-8")
+        for i in range(players)
+    ]
+    size = sum(map(len, files)) / 1024 / 1024
+
+    def pydantic():
+        return [[RoleDetailData(**r) for r in json.loads(raw)] for raw in files]
+
+    def struct():
+        return [model_struct.decode_role_detail_list(raw) for raw in files]
+
+    print(f"玩家数: {players}, 角色数: {roles}, 数据: {size:.1f} MB")
+    for name, func in (("pydantic", pydantic), ("msgspec", struct)):
+        elapsed, retained = measure(func)
+        print(f"{name}: {elapsed:.0f} ms, {retained:.0f} MB")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 30,
+    )
@@ -0,0 +1,70 @@
+"""
+接口路由标签基准: inspect.stack() 取调用者 与 waves_route 标签对比
+用法: python tests/bench_waves_route.py [调用深度 ...]
+需要 gsuid_core
+"""
+
+import sys
+import time
+import asyncio
+import inspect
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+ITERATIONS = 2000
+
+
+async def nested(depth: int, func):
+    """在 depth 层协程调用之下执行 func, 模拟插件命令到接口的调用栈"""
+    if depth <= 0:
+        return await func()
+    return await nested(depth - 1, func)
+
+
+async def bench(depth: int, func) -> float:
+    """平均每次请求的耗时, 单位微秒"""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await nested(depth, func)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def main(depths):
+    from XutheringWavesUID.utils.api.request_util import (
+        waves_route,
+        get_request_route,
+    )
+
+    proxy_func = ["get_role_detail_info"]
+
+    class StackApi:
+        async def get_role_detail_info(self):
+            return await self._waves_request()
+
+        async def _waves_request(self):
+            # 旧版 _waves_request 的匹配方式
+            return inspect.stack()[1].function in proxy_func
+
+    class RouteApi:
+        @waves_route
+        async def get_role_detail_info(self):
+            return await self._waves_request()
+
+        async def _waves_request(self):
+            return get_request_route() in proxy_func
+
+    stack_api, route_api = StackApi(), RouteApi()
+    assert await stack_api.get_role_detail_info()
+    assert await route_api.get_role_detail_info()
+    for depth in depths:
+        stack_us = await bench(depth, stack_api.get_role_detail_info)
+        route_us = await bench(depth, route_api.get_role_detail_info)
+        print(
+            f"调用深度 {depth}: inspect.stack {stack_us:.1f} us/次, "
+            f"路由标签 {route_us:.1f} us/次"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(i) for i in sys.argv[1:]] or [5, 25]))
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+from importlib.util import find_spec
+
+# 以仓库根目录为导入路径, 测试按 XutheringWavesUID.xxx 导入插件
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+# 评分与伤害模块由资源下载提供 (utils/waves_build, utils/map/waves_build)
+CALCULATE = "XutheringWavesUID.utils.waves_build.calculate"
+DAMAGE = "XutheringWavesUID.utils.map.waves_build.damage"
+
+# 测试模块 -> 运行所需的模块, 按顺序检查, 缺少任意一个时不收集该测试模块
+REQUIRES = {
+    "test_batch_score.py": ["gsuid_core", CALCULATE],
+    "test_credential_cache.py": ["gsuid_core", "aiohttp"],
+    "test_damage_attribute.py": ["gsuid_core"],
+    "test_fetch_scheduler.py": ["gsuid_core", "aiohttp"],
+    "test_group_bind.py": ["gsuid_core", "aiohttp"],
+    "test_model_struct.py": ["gsuid_core"],
+    "test_panel_store.py": ["gsuid_core", "aiofiles"],
+    "test_player_summary.py": ["gsuid_core", "aiohttp"],
+    "test_rate_limit.py": ["gsuid_core", "aiohttp"],
+    "test_record_effect.py": ["gsuid_core", DAMAGE],
+    "test_response_cache.py": ["gsuid_core", "aiohttp"],
+    "test_single_flight.py": ["gsuid_core"],
+    "test_storage_gc.py": ["gsuid_core", "aiohttp"],
+    "test_stat_vector.py": ["gsuid_core", DAMAGE],
+    "test_token_pool.py": ["gsuid_core"],
+}
+
+
+def _missing(name: str) -> bool:
+    try:
+        return find_spec(name) is None
+    except ImportError:
+        return True
+
+
+collect_ignore = [
+    name for name, modules in REQUIRES.items() if any(map(_missing, modules))
+]
@@ -0,0 +1,54 @@
+"""
+测试与基准共用的面板数据
+以极限面板为模板, 随机替换副词条生成任意数量的面板
+"""
+
+import copy
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+LIMIT_PATH = Path(__file__).parents[1] / "XutheringWavesUID/utils/map/1.json"
+
+# 副词条名 (攻击/生命/防御 带 % 表示百分比) -> 可能的数值
+SUB_PROPS: Dict[str, List[str]] = {
+    "攻击": ["30", "40", "50", "60"],
+    "攻击%": ["6.4%", "8.6%", "10.9%", "11.6%"],
+    "生命": ["320", "470", "580"],
+    "生命%": ["6.4%", "9.4%", "11.6%"],
+    "防御": ["40", "60", "70"],
+    "防御%": ["8.1%", "12.8%", "14.7%"],
+    "暴击": ["6.3%", "8.1%", "10.5%"],
+    "暴击伤害": ["12.6%", "16.2%", "21.0%"],
+    "共鸣效率": ["6.8%", "10%", "12.4%"],
+    "普攻伤害加成": ["6.4%", "11.6%"],
+    "重击伤害加成": ["7.1%", "10.1%"],
+    "共鸣技能伤害加成": ["7.9%", "11.6%"],
+    "共鸣解放伤害加成": ["8.6%", "10.9%"],
+}
+
+
+def load_limit_panels() -> List[Dict]:
+    return json.loads(LIMIT_PATH.read_text(encoding="utf-8"))
+
+
+def make_panels(count: int, seed: int = 1) -> List[Dict]:
+    """按顺序轮流以极限面板为模板, 每条声骸随机抽取 5 条副词条"""
+    base = load_limit_panels()
+    rnd = random.Random(seed)
+    panels = []
+    for n in range(count):
+        panel = copy.deepcopy(base[n % len(base)])
+        for phantom in panel["phantomData"]["equipPhantomList"]:
+            if not phantom:
+                continue
+            phantom["subProps"] = [
+                {
+                    "attributeName": name.rstrip("%"),
+                    "attributeValue": rnd.choice(SUB_PROPS[name]),
+                }
+                for name in rnd.sample(list(SUB_PROPS), 5)
+            ]
+        panels.append(panel)
+    return panels
@@ -0,0 +1,200 @@
+import copy
+import asyncio
+import threading
+
+import pytest
+from synthetic_panels import make_panels
+
+from XutheringWavesUID.utils import calculate
+from XutheringWavesUID.utils.api.model import RoleDetailData
+from XutheringWavesUID.utils.calc import WuWaCalc, batch_score
+from XutheringWavesUID.utils.damage.register_echo import (
+    register_echo,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def echoes():
+    register_echo()
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    batch_score.reset_batch_score()
+    yield
+    batch_score.reset_batch_score()
+
+
+def prepare(panels):
+    calcs = []
+    for panel in panels:
+        role_detail = RoleDetailData(**panel)
+        calc = WuWaCalc(role_detail)
+        calc.phantom_pre = calc.prepare_phantom()
+        calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
+        calc.calc_temp = calculate.get_calc_map(
+            calc.phantom_card, role_detail.role.roleName, role_detail.role.roleId
+        )
+        calcs.append(calc)
+    return calcs
+
+
+def assert_same(result, expected):
+    for role_scores, role_expected in zip(result, expected):
+        assert len(role_scores) == len(role_expected)
+        for (score, grade), (expected_score, expected_grade) in zip(
+            role_scores, role_expected
+        ):
+            assert abs(score - expected_score) <= batch_score.VERIFY_TOLERANCE
+            assert grade == expected_grade
+
+
+def test_verify_covers_every_template():
+    verified = batch_score.verify_batch_score()
+    calc_maps = batch_score.load_calc_maps()
+    assert any(calc_map["name"] == "角色-通用" for calc_map in calc_maps)
+    for calc_map in calc_maps:
+        assert batch_score.get_template_key(calc_map) in verified
+
+
+def test_every_template_matches_on_synthetic_panels():
+    """每个评分模板都套用到随机面板的每个角色上"""
+    calcs = prepare(make_panels(60, seed=2))
+    phantoms = [batch_score._get_phantoms(c.role_detail) for c in calcs]
+    for calc_map in batch_score.load_calc_maps():
+        roles = [
+            (calc_map, c.role_detail.role.attributeName, p)
+            for c, p in zip(calcs, phantoms)
+        ]
+        expected = [
+            batch_score._scalar_score(c.role_detail.role.roleId, p, calc_map)
+            for c, p in zip(calcs, phantoms)
+        ]
+        assert_same(batch_score.batch_phantom_score(roles), expected)
+
+
+def test_same_name_templates_do_not_share_weights():
+    calcs = prepare(make_panels(1))
+    phantoms = batch_score._get_phantoms(calcs[0].role_detail)
+    attribute = calcs[0].role_detail.role.attributeName
+    calc_map = batch_score.load_calc_maps()[0]
+    changed = copy.deepcopy(calc_map)
+    for name in changed["sub_props"]:
+        changed["sub_props"][name] *= 2
+
+    first, second = batch_score.batch_phantom_score(
+        [(calc_map, attribute, phantoms), (changed, attribute, phantoms)]
+    )
+    assert first != second
+
+
+@pytest.mark.parametrize(
+    "use_numpy",
+    [
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(batch_score.np is None, reason="未安装 numpy"),
+        ),
+        False,
+    ],
+)
+def test_batch_matches_scalar_on_1000_panels(use_numpy):
+    calcs = prepare(make_panels(1000))
+    phantoms = [batch_score._get_phantoms(c.role_detail) for c in calcs]
+    roles = [
+        (c.calc_temp, c.role_detail.role.attributeName, p)
+        for c, p in zip(calcs, phantoms)
+    ]
+    result = batch_score.batch_phantom_score(roles, use_numpy=use_numpy)
+    expected = [
+        batch_score._scalar_score(c.role_detail.role.roleId, p, c.calc_temp)
+        for c, p in zip(calcs, phantoms)
+    ]
+    assert_same(result, expected)
+
+
+def test_different_scorer_disables_batch(monkeypatch):
+    scorer = calculate.calc_phantom_score
+
+    def changed(*args):
+        score, grade = scorer(*args)
+        return round(score * 1.01, 2), grade
+
+    monkeypatch.setattr(calculate, "calc_phantom_score", changed)
+    assert not batch_score.is_batch_score_enabled()
+
+
+def test_mismatched_template_falls_back_to_scorer(monkeypatch):
+    """只有一个模板与评分模块不一致时, 该模板的角色逐条评分, 其余仍批量计算"""
+    calcs = prepare(make_panels(30))
+    odd = calcs[0].calc_temp["name"]
+    scorer = calculate.calc_phantom_score
+
+    def changed(role_id, props, cost, calc_map):
+        score, grade = scorer(role_id, props, cost, calc_map)
+        if calc_map and calc_map["name"] == odd:
+            return round(score * 1.01, 2), grade
+        return score, grade
+
+    monkeypatch.setattr(calculate, "calc_phantom_score", changed)
+    assert batch_score.is_batch_score_enabled()
+    verified = batch_score._state["verified"]
+    assert batch_score.get_template_key(calcs[0].calc_temp) not in verified
+
+    batch = []
+    monkeypatch.setattr(
+        batch_score,
+        "batch_phantom_score",
+        lambda roles: batch.extend(roles) or [[] for _ in roles],
+    )
+    totals = batch_score.score_roles(calcs)
+    assert all(calc_map["name"] != odd for calc_map, _, _ in batch)
+    assert len(batch) == sum(c.calc_temp["name"] != odd for c in calcs)
+    for calc, total in zip(calcs, totals):
+        if calc.calc_temp["name"] == odd:
+            phantoms = batch_score._get_phantoms(calc.role_detail)
+            expected = batch_score._scalar_score(
+                calc.role_detail.role.roleId, phantoms, calc.calc_temp
+            )
+            assert total == sum(score for score, _ in expected)
+
+
+def test_score_roles_does_not_verify(monkeypatch):
+    """未校验时逐条评分, 不在调用方线程中触发校验"""
+
+    def fail():
+        raise AssertionError("verify called")
+
+    monkeypatch.setattr(batch_score, "verify_batch_score", fail)
+    calcs = prepare(make_panels(5))
+    assert len(batch_score.score_roles(calcs)) == 5
+
+
+def test_verify_runs_off_event_loop(monkeypatch):
+    threads = []
+
+    def verify():
+        threads.append(threading.get_ident())
+        return {"template"}
+
+    monkeypatch.setattr(batch_score, "verify_batch_score", verify)
+
+    async def main():
+        results = await asyncio.gather(
+            *[batch_score.ensure_batch_score_verified() for _ in range(3)]
+        )
+        return results, threading.get_ident()
+
+    results, loop_thread = asyncio.run(main())
+    assert results == [True] * 3
+    assert len(threads) == 1 and threads[0] != loop_thread
+
+
+def test_reset_during_verify_discards_result(monkeypatch):
+    def verify():
+        batch_score.reset_batch_score()
+        return {"template"}
+
+    monkeypatch.setattr(batch_score, "verify_batch_score", verify)
+    assert not batch_score.is_batch_score_enabled()
+    assert batch_score._state["enabled"] is None
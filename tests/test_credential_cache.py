@@ -0,0 +1,36 @@
+import asyncio
+from types import SimpleNamespace
+
+from XutheringWavesUID.utils.api.requests import WavesApi
+from XutheringWavesUID.utils.cache import credential_cache
+
+
+def test_concurrent_self_cookie_validation_runs_once(monkeypatch):
+    calls = []
+
+    async def validate(self, uid, cookie):
+        calls.append((uid, cookie))
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(success=True)
+
+    monkeypatch.setattr(WavesApi, "login_log", validate)
+    monkeypatch.setattr(WavesApi, "refresh_data", validate)
+    waves_api = WavesApi()
+    user = SimpleNamespace(uid="100000001", cookie="ck", did="did", bat="bat")
+    credential_cache.invalidate(uid=user.uid)
+
+    async def main():
+        return await asyncio.gather(
+            *[
+                waves_api.validate_self_cookie(user.uid, user.cookie, user)
+                for _ in range(10)
+            ],
+            waves_api.validate_self_cookie(user.uid, "other", user),
+        )
+
+    results = asyncio.run(main())
+    assert results == ["ck"] * 10 + ["other"]
+    # 每个 (uid, cookie) 只做一次 login_log + refresh_data
+    assert sorted(calls) == sorted([(user.uid, "ck"), (user.uid, "other")] * 2)
+    assert credential_cache.get(user.uid, "ck").did == "did"
+    credential_cache.invalidate(uid=user.uid)
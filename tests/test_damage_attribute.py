@@ -0,0 +1,49 @@
+import pytest
+
+from XutheringWavesUID.utils.damage.damage import DamageAttribute
+
+TITLES = ["默认手法", "敌人等级", "敌人抗性", "t", "不存在"]
+
+
+def apply(attr: DamageAttribute):
+    attr.add_effect("默认手法", "eeaz")
+    attr.add_effect("默认手法", "aaa")
+    attr.add_effect("", "空标题")
+    attr.add_effect("空内容", "")
+    attr.add_atk_percent(0.1, "t", "m")
+    attr.add_atk_percent(0.2, "t", "m2")
+    attr.set_enemy_level(100)
+    attr.set_enemy_level(80)
+    attr.set_skill_multi("120.5%+30%", "技能倍率", "x")
+    attr.add_crit_rate(0.6)
+    attr.add_crit_dmg(1.0, "暴伤", "100%")
+    attr.add_dmg_bonus(0.4, "加成", "40%")
+    return attr
+
+
+@pytest.mark.parametrize("record_effect", [True, False])
+def test_bare_attribute_effects(record_effect):
+    attr = apply(DamageAttribute(record_effect=record_effect))
+    # 同名效果取第一次添加的内容, 敌人等级以最后一次设置为准
+    assert attr.get_effect("默认手法") == "eeaz"
+    assert attr.get_effect("t") == "m"
+    assert attr.get_effect("敌人等级") == "80级"
+    assert attr.get_effect("空内容") is None
+    assert attr.enemy_level == 80
+
+
+def test_bare_attribute_parity():
+    recorded = apply(DamageAttribute(record_effect=True))
+    bare = apply(DamageAttribute(record_effect=False))
+
+    assert bare.effect == []
+    assert [bare.get_effect(t) for t in TITLES] == [
+        recorded.get_effect(t) for t in TITLES
+    ]
+    assert bare.atk_percent == recorded.atk_percent
+    assert bare.enemy_level == recorded.enemy_level
+    for attr in (bare, recorded):
+        attr.set_char_atk(500)
+        attr.set_weapon_atk(400)
+    assert bare.calculate_crit_damage() == recorded.calculate_crit_damage()
+    assert bare.calculate_expected_damage() == recorded.calculate_expected_damage()
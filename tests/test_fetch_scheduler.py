@@ -0,0 +1,65 @@
+import gc
+import asyncio
+
+import pytest
+
+from XutheringWavesUID.utils.api import fetch_scheduler
+from XutheringWavesUID.utils.api.request_util import KuroApiResp
+from XutheringWavesUID.utils.api.fetch_scheduler import (
+    PRIORITY_REFRESH,
+    FetchScheduler,
+)
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(fetch_scheduler, "get_concurrency", lambda: 2)
+    monkeypatch.setattr(fetch_scheduler, "get_global_concurrency", lambda: 3)
+    monkeypatch.setattr(fetch_scheduler, "is_global_limit", lambda: False)
+
+
+def run_jobs(scheduler: FetchScheduler, uids):
+    running = {"total": 0, "max": 0}
+    per_uid = {}
+
+    def job(uid):
+        async def func():
+            running["total"] += 1
+            per_uid[uid] = per_uid.get(uid, 0) + 1
+            running["max"] = max(running["max"], running["total"])
+            assert per_uid[uid] <= 2
+            # 执行期间触发垃圾回收, 调度任务不能被回收
+            gc.collect()
+            await asyncio.sleep(0.01)
+            per_uid[uid] -= 1
+            running["total"] -= 1
+            return KuroApiResp.ok(uid)
+
+        return func
+
+    async def main():
+        return await asyncio.gather(
+            *[
+                scheduler.submit(uid, job(uid), PRIORITY_REFRESH)
+                for uid in uids
+                for _ in range(4)
+            ]
+        )
+
+    return asyncio.run(main()), running["max"]
+
+
+def test_global_limit_applies_without_global_semaphore():
+    scheduler = FetchScheduler()
+    uids = [str(i) for i in range(5)]
+    results, max_running = run_jobs(scheduler, uids)
+    assert [r.data for r in results] == [uid for uid in uids for _ in range(4)]
+    assert max_running == 3
+    assert scheduler.stats()["running"] == 0
+    assert not scheduler._tasks
+
+
+def test_global_semaphore_uses_lower_limit(monkeypatch):
+    monkeypatch.setattr(fetch_scheduler, "is_global_limit", lambda: True)
+    _, max_running = run_jobs(FetchScheduler(), [str(i) for i in range(5)])
+    assert max_running == 2
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+from gsuid_core.utils.database.base_models import Bind
+
+from XutheringWavesUID.utils.database.models import WavesBind, WavesGroupBind
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    calls = []
+
+    async def sync_bind(user_id, bot_id):
+        calls.append((user_id, bot_id))
+
+    async def direct_write(cls, user_id, bot_id, uid, game_name=None):
+        # 父类实现不经过 update_data 时同样需要同步
+        return 0
+
+    monkeypatch.setattr(WavesGroupBind, "sync_bind", sync_bind)
+    monkeypatch.setattr(Bind, "delete_uid", classmethod(direct_write), raising=False)
+    monkeypatch.setattr(
+        Bind, "switch_uid_by_game", classmethod(direct_write), raising=False
+    )
+    return calls
+
+
+def test_delete_and_switch_sync_members(synced):
+    async def main():
+        await WavesBind.delete_uid("qq", "onebot", "100000001")
+        await WavesBind.switch_uid_by_game("qq", "onebot", "100000002")
+
+    asyncio.run(main())
+    assert synced == [("qq", "onebot")] * 2
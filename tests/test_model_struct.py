@@ -0,0 +1,39 @@
+import json
+
+from synthetic_panels import load_limit_panels
+
+from XutheringWavesUID.utils.api import model_struct
+from XutheringWavesUID.utils.api.model import RoleDetailData
+
+
+def dump(panels) -> bytes:
+    return json.dumps(panels, ensure_ascii=False).encode("utf-8")
+
+
+def test_numeric_strings_decode_like_pydantic():
+    panels = load_limit_panels()[:3]
+    for panel in panels:
+        panel["role"]["level"] = str(panel["role"]["level"])
+        panel["role"]["roleId"] = str(panel["role"]["roleId"])
+
+    roles = model_struct.decode_role_detail_list(dump(panels))
+    expected = [RoleDetailData(**panel) for panel in panels]
+    assert [(r.role.roleId, r.role.level) for r in roles] == [
+        (r.role.roleId, r.role.level) for r in expected
+    ]
+    assert all(isinstance(r.role.level, int) for r in roles)
+
+
+def test_bad_role_does_not_drop_account():
+    panels = load_limit_panels()[:3]
+    # msgspec 不接受而 pydantic 接受的值, 经 pydantic 转换
+    panels[0]["role"]["level"] = True
+    # 两者都不接受的角色被跳过
+    del panels[1]["role"]["starLevel"]
+
+    roles = model_struct.decode_role_detail_list(dump(panels))
+    assert [r.role.roleId for r in roles] == [
+        panels[0]["role"]["roleId"],
+        panels[2]["role"]["roleId"],
+    ]
+    assert roles[0].role.level == 1
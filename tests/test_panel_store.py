@@ -0,0 +1,21 @@
+import pytest
+
+from XutheringWavesUID.utils.panel_store import (
+    PanelStore,
+    JsonPanelStore,
+    SqlitePanelStore,
+)
+
+
+def test_backends_implement_every_method():
+    assert JsonPanelStore.__abstractmethods__ == frozenset()
+    assert SqlitePanelStore.__abstractmethods__ == frozenset()
+
+
+def test_incomplete_backend_cannot_be_created():
+    class PartialStore(PanelStore):
+        async def get_all(self, uid):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialStore()
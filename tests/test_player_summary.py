@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from XutheringWavesUID.utils.player_writer import player_writer
+from XutheringWavesUID.utils import player_path, refresh_char_detail
+from XutheringWavesUID.utils.player_summary import load_player_summary
+
+UID = "100000001"
+
+
+@pytest.fixture(autouse=True)
+def players(tmp_path, monkeypatch):
+    monkeypatch.setattr(player_path, "PLAYER_PATH", tmp_path)
+    monkeypatch.setattr(player_path, "_resolved", {})
+    get_config = refresh_char_detail.WutheringWavesConfig.get_config
+
+    def config(key):
+        if key == "WavesToken":
+            return SimpleNamespace(data="token")
+        return get_config(key)
+
+    monkeypatch.setattr(refresh_char_detail.WutheringWavesConfig, "get_config", config)
+
+
+def make_rank(item):
+    return SimpleNamespace(
+        roleId=item["role"]["roleId"],
+        level=item["level"],
+        chain=0,
+        starLevel=5,
+        weaponId=0,
+        weaponLevel=90,
+        weaponResonLevel=1,
+        sonataName="",
+        score=None,
+        expected_damage=None,
+        expected_name="",
+    )
+
+
+def test_overlapping_saves_keep_latest_summary(monkeypatch):
+    calls = []
+
+    async def get_waves_char_rank(uid, save_data, need_score=False):
+        calls.append(uid)
+        # 第一次保存的评分计算较慢, 第二次保存在它之前算完
+        await asyncio.sleep(0.05 if len(calls) == 1 else 0)
+        return [make_rank(item) for item in save_data]
+
+    monkeypatch.setattr(refresh_char_detail, "get_waves_char_rank", get_waves_char_rank)
+
+    def panel(level):
+        return {"role": {"roleId": 1102, "roleName": "散华"}, "level": level}
+
+    async def main():
+        await asyncio.gather(
+            refresh_char_detail.save_card_info(UID, [panel(70)]),
+            refresh_char_detail.save_card_info(UID, [panel(90)]),
+        )
+        await player_writer.flush_all()
+        return await load_player_summary(UID)
+
+    summary = asyncio.run(main())
+    assert summary[1102].level == 90
+    # 评分只计算一次, 摘要与上传排行共用
+    assert len(calls) == 2
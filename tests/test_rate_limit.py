@@ -0,0 +1,180 @@
+import time
+import asyncio
+
+import pytest
+
+from XutheringWavesUID.utils.api.requests import WavesApi
+from XutheringWavesUID.utils.api import requests, rate_limit
+from XutheringWavesUID.utils.api.rate_limit import TokenBucket, rate_limiter
+
+OK = ("200 OK", b'{"code": 200, "data": {}}')
+THROTTLED = ("429 Too Many Requests", b"{}")
+
+
+class StubServer:
+    """按顺序返回预设的 (状态, 响应体), 用完后返回 200, 记录每次请求的时间"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.hits = []
+        self.server = None
+
+    async def handle(self, reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        self.hits.append(time.monotonic())
+        status, body = self.replies.pop(0) if self.replies else OK
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+        return self
+
+    async def __aexit__(self, *args):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def bucket(self) -> TokenBucket:
+        # 无路由标签时以 url 作为限流桶的路由
+        return rate_limiter.get_bucket(self.url, "direct")
+
+
+class StubSolver:
+    async def solve(self):
+        return {"captcha_output": "ok"}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(rate_limit, "get_rate_limit", lambda: 50)
+    monkeypatch.setattr(rate_limit, "get_backoff_max", lambda: 0.2)
+    monkeypatch.setattr(requests, "get_need_proxy_func", lambda: [])
+    waves_api = WavesApi()
+    waves_api.captcha_solver = None
+    # 每个测试使用自己的事件循环, 会话不能跨测试复用
+    waves_api._sessions = {}
+    return waves_api
+
+
+async def close(waves_api: WavesApi):
+    for session in waves_api._sessions.values():
+        await session.close()
+
+
+def request(waves_api: WavesApi, url: str, **kwargs):
+    return waves_api._waves_request(url, "GET", {}, retry_delay=0.01, **kwargs)
+
+
+def test_backoff_and_recover_against_stub_server(api):
+    async def main():
+        async with StubServer(*[THROTTLED] * 3) as stub:
+            await request(api, stub.url, max_retries=3)
+            bucket = stub.bucket
+            assert len(stub.hits) == 3
+            assert bucket.failures == 3
+            assert bucket.rate < 50
+            assert bucket.blocked_until > time.monotonic()
+
+            # 退避结束前不会再打到上游
+            blocked = bucket.blocked_until
+            results = await asyncio.gather(*[request(api, stub.url) for _ in range(5)])
+            assert all(r.success for r in results)
+            assert min(stub.hits[3:]) >= blocked
+            assert bucket.failures == 0
+            # 成功后速率逐步恢复
+            for _ in range(20):
+                await request(api, stub.url)
+            assert bucket.rate == 50
+        await close(api)
+
+    asyncio.run(main())
+
+
+def test_server_error_with_bad_body_backs_off(api):
+    """5xx 的响应体无法解析时同样退避"""
+
+    async def main():
+        async with StubServer(("503 Service Unavailable", b'"busy"')) as stub:
+            with pytest.raises(TypeError):
+                await request(api, stub.url, max_retries=1)
+            assert stub.bucket.failures == 1
+            assert stub.bucket.blocked_until > time.monotonic()
+        await close(api)
+
+    asyncio.run(main())
+
+
+def test_captcha_retry_goes_through_bucket(api, monkeypatch):
+    routes = []
+    acquire = rate_limiter.acquire
+
+    async def spy(route, proxy):
+        routes.append(route)
+        return await acquire(route, proxy)
+
+    monkeypatch.setattr(rate_limiter, "acquire", spy)
+    api.captcha_solver = StubSolver()
+
+    async def main():
+        gee_test = ("200 OK", b'{"code": 200, "data": {"geeTest": true}}')
+        async with StubServer(gee_test, THROTTLED) as stub:
+            await request(api, stub.url)
+            assert routes == [stub.url, stub.url]
+            # 过验证码后的重试被限流时同样计入退避
+            assert stub.bucket.failures == 1
+        await close(api)
+
+    asyncio.run(main())
+
+
+def test_waiters_sleep_outside_lock():
+    async def main():
+        rate = 20
+        bucket = TokenBucket("fifo", rate)
+        order = []
+        released = []
+
+        async def worker(i):
+            await bucket.acquire(rate)
+            order.append(i)
+            released.append(time.monotonic())
+
+        start = time.monotonic()
+        tasks = [asyncio.create_task(worker(i)) for i in range(40)]
+        await asyncio.sleep(0.01)
+        # 所有等待者都已预约令牌, 锁不在等待期间持有
+        assert not bucket._lock.locked()
+        assert bucket.tokens < -19
+        await asyncio.gather(*tasks)
+
+        assert order == list(range(40))
+        assert released == sorted(released)
+        # 突发 20 个, 其余 20 个按 20/s 放行, 只检查下限
+        assert released[-1] - start >= 0.9
+
+    asyncio.run(main())
+
+
+def test_penalize_during_wait_extends_block(monkeypatch):
+    monkeypatch.setattr(rate_limit, "get_backoff_max", lambda: 0.3)
+
+    async def main():
+        bucket = TokenBucket("block", 10)
+        for _ in range(10):
+            await bucket.acquire(10)
+        # 令牌用完, 预约约 0.1s 后放行
+        waiter = asyncio.create_task(bucket.acquire(10))
+        await asyncio.sleep(0.02)
+        bucket.penalize("HTTP 429")
+        blocked = bucket.blocked_until
+        await waiter
+        assert time.monotonic() >= blocked
+
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+import pytest
+from synthetic_panels import load_limit_panels
+
+from XutheringWavesUID.utils.calc import WuWaCalc
+from XutheringWavesUID.utils.api.model import RoleDetailData
+from XutheringWavesUID.utils.damage import utils as damage_utils
+from XutheringWavesUID.utils.map.damage.register import register_rank
+from XutheringWavesUID.utils.damage.register_char import (
+    register_char,
+)
+from XutheringWavesUID.utils.damage.register_echo import (
+    register_echo,
+)
+from XutheringWavesUID.utils.damage.register_weapon import (
+    register_weapon,
+)
+from XutheringWavesUID.utils.damage.damage import (
+    DamageAttribute,
+    AbnormalSpectroFrazzle,
+)
+from XutheringWavesUID.utils.damage.abstract import (
+    WavesCharRegister,
+    WavesEchoRegister,
+    DamageRankRegister,
+    WavesWeaponRegister,
+)
+
+register_char()
+register_weapon()
+register_echo()
+register_rank()
+
+DAMAGE_TYPES = [
+    damage_utils.attack_damage,
+    damage_utils.hit_damage,
+    damage_utils.skill_damage,
+    damage_utils.liberation_damage,
+    damage_utils.phantom_damage,
+    damage_utils.heal_bonus,
+]
+WEAPON_ACTIONS = [
+    "buff",
+    "damage",
+    "cast_attack",
+    "cast_hit",
+    "cast_skill",
+    "cast_liberation",
+    "cast_dodge_counter",
+    "cast_healing",
+    "skill_create_healing",
+    "cast_extension",
+]
+# 只在记录效果时使用的字段, 不参与比较
+EFFECT_FIELDS = {"effect", "effect_values", "record_effect"}
+
+HOOKS = (
+    [
+        pytest.param(
+            lambda attr, k, clz=clz: clz().do_buff(
+                attr, chain=6, resonLevel=5, isGroup=bool(k % 2)
+            ),
+            id=f"char-{char_id}",
+        )
+        for char_id, clz in WavesCharRegister._id_cls_map.items()
+    ]
+    + [
+        pytest.param(
+            lambda attr, k, wid=wid, clz=clz: clz(wid, 90, 6, 5).do_action(
+                list(WEAPON_ACTIONS), attr, bool(k % 2)
+            ),
+            id=f"weapon-{wid}",
+        )
+        for wid, clz in WavesWeaponRegister._id_cls_map.items()
+    ]
+    + [
+        pytest.param(
+            lambda attr, k, clz=clz: clz().do_echo(attr, bool(k % 2)),
+            id=f"echo-{echo_id}",
+        )
+        for echo_id, clz in WavesEchoRegister._id_cls_map.items()
+    ]
+)
+
+
+RANKS = [
+    pytest.param(char_id, id=f"rank-{char_id}")
+    for char_id in DamageRankRegister._id_cls_map
+]
+
+
+def prepare(panel) -> WuWaCalc:
+    calc = WuWaCalc(RoleDetailData(**panel))
+    calc.phantom_pre = calc.prepare_phantom()
+    calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
+    calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
+    return calc
+
+
+@pytest.fixture(scope="module")
+def calcs():
+    return [prepare(panel) for panel in load_limit_panels()]
+
+
+def make_attribute(calc: WuWaCalc, record_effect: bool, k: int) -> DamageAttribute:
+    """按 k 轮换伤害类型、手法和环境, 覆盖效果中的各个分支"""
+    attr = calc.card_sort_map_to_attribute(calc.role_card, record_effect=record_effect)
+    attr.set_char_damage(DAMAGE_TYPES[k % len(DAMAGE_TYPES)])
+    attr.set_skill_multi("120.5%+30%", "技能倍率", "x")
+    attr.add_skill_ratio(0.1)
+    attr.add_effect("默认手法", "eeaz" if k % 2 else "aaa")
+    if k % 3 == 0:
+        attr.set_env_spectro()
+        attr.set_trigger_shield()
+    if k % 4 == 1:
+        attr.set_sync_strike()
+        attr.set_env_aero_erosion()
+    attr.set_enemy_level(100)
+    return attr
+
+
+def attribute_state(attr: DamageAttribute):
+    """除效果明细外的全部属性与最终伤害"""
+    state = {k: v for k, v in vars(attr).items() if k not in EFFECT_FIELDS}
+    state["role"] = None
+    state["ph_detail"] = [vars(i) for i in attr.ph_detail]
+    state["dmg_bonus_phantom"] = vars(attr.dmg_bonus_phantom)
+    state["effect_attack"] = attr.effect_attack
+    state["effect_life"] = attr.effect_life
+    state["effect_def"] = attr.effect_def
+    state["crit"] = attr.calculate_crit_damage()
+    state["expected"] = attr.calculate_expected_damage()
+    state["healing"] = attr.calculate_healing(attr.effect_life)
+    state["shield"] = attr.calculate_shield(attr.effect_def)
+    state["frazzle"] = (
+        AbnormalSpectroFrazzle(attr, 10)
+        .add_dmg_deepen(0.1, "t", "m")
+        .calculate_damage()
+    )
+    state["manual"] = attr.get_effect("默认手法")
+    state["enemy_level"] = attr.get_effect("敌人等级")
+    return state
+
+
+def run_hook(hook, calc, record_effect, k):
+    attr = make_attribute(calc, record_effect, k)
+    try:
+        hook(attr, k)
+    except Exception as e:
+        return repr(e)
+    return attribute_state(attr)
+
+
+@pytest.mark.parametrize("hook", HOOKS)
+def test_record_effect_does_not_change_damage(hook, calcs):
+    """不记录效果明细时, 每个注册的效果得到的属性和伤害与记录时一致"""
+    for i, calc in enumerate(calcs):
+        for k in range(i, i + len(DAMAGE_TYPES)):
+            expected = run_hook(hook, calc, True, k)
+            actual = run_hook(hook, calc, False, k)
+            assert actual == expected, f"{calc.role_detail.role.roleName} k={k}"
+
+
+@pytest.mark.parametrize("char_id", RANKS)
+def test_rank_func_does_not_change_damage(char_id):
+    """排行与评分缓存关闭效果记录计算期望伤害, 结果需与记录时一致"""
+    panels = [
+        panel
+        for panel in load_limit_panels()
+        if str(panel["role"]["roleId"]) == char_id
+    ]
+    if not panels:
+        pytest.skip("极限面板中没有该角色")
+
+    func = DamageRankRegister.find_class(char_id)["func"]
+    for panel in panels:
+        result = []
+        for record_effect in (True, False):
+            # 每次使用新的面板, 伤害计算可能修改角色详情
+            calc = prepare(panel)
+            attr = calc.card_sort_map_to_attribute(
+                calc.role_card, record_effect=record_effect
+            )
+            result.append(func(attr, calc.role_detail))
+        assert result[1] == result[0]
+
+
+def test_hooks_registered():
+    assert len(HOOKS) > 0
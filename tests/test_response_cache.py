@@ -0,0 +1,83 @@
+import json
+import asyncio
+
+import pytest
+
+from XutheringWavesUID.utils.api.requests import WavesApi
+from XutheringWavesUID.utils.database.models import WavesUser
+from XutheringWavesUID.utils.api import requests, response_cache
+from XutheringWavesUID.utils.api.request_util import KuroApiResp
+from XutheringWavesUID.utils.api.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path)
+    monkeypatch.setattr(requests, "response_cache", cache)
+    monkeypatch.setattr(requests, "is_cache_enabled", lambda: True)
+    monkeypatch.setattr(response_cache, "is_cache_enabled", lambda: True)
+    return cache
+
+
+def test_concurrent_writes_use_separate_temp_files(cache):
+    path = cache.get_path("base_info", "100000001")
+    payloads = [KuroApiResp.ok({"n": i, "pad": "x" * 10000}) for i in range(20)]
+
+    async def main():
+        await asyncio.gather(*[cache.write(path, resp) for resp in payloads])
+
+    asyncio.run(main())
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data in [resp.model_dump() for resp in payloads]
+    assert list(path.parent.glob("*.tmp")) == []
+
+
+def test_token_scoped_endpoints_do_not_share_cache(cache, monkeypatch):
+    """owner 的 token 取得的数据不会返回给使用公共 token 的调用方"""
+
+    async def select_data_by_cookie_and_uid(cookie, uid):
+        return object() if cookie == "owner" else None
+
+    async def waves_request(self, url, method, header, data):
+        return KuroApiResp.ok({"token": header["token"], **data})
+
+    async def used_headers(self, cookie, uid, needToken=False):
+        return {"token": cookie}
+
+    async def base_header():
+        return {}
+
+    monkeypatch.setattr(
+        WavesUser, "select_data_by_cookie_and_uid", select_data_by_cookie_and_uid
+    )
+    monkeypatch.setattr(WavesApi, "_waves_request", waves_request)
+    monkeypatch.setattr(WavesApi, "get_used_headers", used_headers)
+    monkeypatch.setattr(requests, "get_base_header", base_header)
+    api = WavesApi()
+    uid = "100000001"
+
+    async def main():
+        results = []
+        for method in [
+            api.get_base_info,
+            api.get_calabash_data,
+            api.get_challenge_data,
+            api.get_abyss_data,
+            api.get_abyss_index,
+            api.get_slash_index,
+            api.get_slash_detail,
+        ]:
+            owner = await method(uid, "owner")
+            await cache.flush()
+            public = await method(uid, "public")
+            results.append((owner.data["token"], public.data["token"]))
+
+        for country in ["1", "2"]:
+            resp = await api.get_explore_data(uid, "public", countryCode=country)
+            await cache.flush()
+            results.append(resp.data["countryCode"])
+        return results
+
+    results = asyncio.run(main())
+    assert results[:-2] == [("owner", "public")] * 7
+    assert results[-2:] == ["1", "2"]
@@ -0,0 +1,105 @@
+import asyncio
+
+from XutheringWavesUID.utils.util import timed_async_cache
+from XutheringWavesUID.utils.api.single_flight import SingleFlight
+
+
+def test_timed_cache_coalesces_and_caches():
+    calls = []
+
+    @timed_async_cache(60)
+    async def fetch(uid: str):
+        calls.append(uid)
+        await asyncio.sleep(0.01)
+        return {"uid": uid}
+
+    async def main():
+        first = await asyncio.gather(*[fetch("1") for _ in range(5)])
+        second = await fetch("1")
+        other = await fetch("2")
+        return first, second, other
+
+    first, second, other = asyncio.run(main())
+    assert calls == ["1", "2"]
+    assert first == [{"uid": "1"}] * 5
+    assert second == {"uid": "1"} and other == {"uid": "2"}
+    info = fetch.cache_info()
+    assert info["misses"] == 2
+    assert info["coalesced"] == 4
+    assert info["hits"] == 1
+    assert info["size"] == 2
+
+
+def test_timed_cache_leader_cancel_keeps_waiters():
+    """发起调用的一方被取消, 合并进来的调用仍拿到结果"""
+
+    @timed_async_cache(60)
+    async def fetch(uid: str):
+        await asyncio.sleep(0.05)
+        return uid
+
+    async def main():
+        leader = asyncio.ensure_future(fetch("1"))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(fetch("1"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter, leader.cancelled()
+
+    assert asyncio.run(main()) == ("1", True)
+    assert fetch.cache_info()["size"] == 1
+
+
+def test_timed_cache_condition_error_is_not_cached():
+    calls = []
+
+    def condition(value):
+        raise ValueError("bad")
+
+    @timed_async_cache(60, condition)
+    async def fetch():
+        calls.append(1)
+        return "ok"
+
+    async def main():
+        return await asyncio.gather(fetch(), fetch()), await fetch()
+
+    assert asyncio.run(main()) == (["ok", "ok"], "ok")
+    assert len(calls) == 2
+    assert fetch.cache_info()["size"] == 0
+
+
+def test_timed_cache_negative_expiration_and_lru():
+    calls = []
+
+    @timed_async_cache(60, lambda x: x > 0, maxsize=2, negative_expiration=60)
+    async def fetch(n: int):
+        calls.append(n)
+        return n
+
+    async def main():
+        for n in (0, 0, 1, 2, 0):
+            await fetch(n)
+
+    asyncio.run(main())
+    # 失败结果按 negative_expiration 缓存, 超出容量淘汰最久未用的 0
+    assert calls == [0, 1, 2, 0]
+    assert fetch.cache_info()["evictions"] == 2
+    fetch.cache_clear()
+    assert fetch.cache_info()["size"] == 0
+
+
+def test_single_flight_copies_shared_results():
+    flight = SingleFlight("test")
+
+    async def func():
+        await asyncio.sleep(0.01)
+        return {"data": []}
+
+    async def main():
+        return await asyncio.gather(flight.do(("k",), func), flight.do(("k",), func))
+
+    a, b = asyncio.run(main())
+    a["data"].append(1)
+    assert b == {"data": []}
+    assert flight.stats()["coalesced"] == 1
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+from string_calc import StringWuWaCalc
+
+from XutheringWavesUID.utils.calc import WuWaCalc
+from XutheringWavesUID.utils.api.model import RoleDetailData
+from XutheringWavesUID.utils.damage.register_echo import (
+    register_echo,
+)
+
+LIMIT_PATH = Path(__file__).parents[1] / "XutheringWavesUID/utils/map/1.json"
+LIMIT_PANELS = json.loads(LIMIT_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def echoes():
+    register_echo()
+
+
+def run_calc(calc: WuWaCalc):
+    calc.phantom_pre = calc.prepare_phantom()
+    calc.phantom_card = calc.enhance_summation_phantom_value(calc.phantom_pre)
+    phantom_card = dict(calc.phantom_card)
+    calc.role_card = calc.enhance_summation_card_value(calc.phantom_card)
+    attr = calc.card_sort_map_to_attribute(calc.role_card)
+    return phantom_card, dict(calc.role_card), attr
+
+
+def as_number(value):
+    """展示字符串转为数值比较, 单一来源的词条旧版为 "12%", 现为 "12.0%" """
+    if isinstance(value, str):
+        try:
+            return float(value.rstrip("%"))
+        except ValueError:
+            return value
+    return value
+
+
+def assert_card_equal(expected, actual, name):
+    actual = {k: v for k, v in actual.items() if k != "stat_vector"}
+    assert set(expected) == set(actual), name
+    for key, value in expected.items():
+        assert as_number(actual[key]) == as_number(value), f"{name} {key}"
+
+
+def attribute_values(attr):
+    values = {k: v for k, v in vars(attr).items() if isinstance(v, (int, float, str))}
+    values["dmg_bonus_phantom"] = vars(attr.dmg_bonus_phantom)
+    values["ph_detail"] = [vars(i) for i in attr.ph_detail]
+    return values
+
+
+@pytest.mark.parametrize(
+    "panel", LIMIT_PANELS, ids=[p["role"]["roleName"] for p in LIMIT_PANELS]
+)
+def test_stat_vector_matches_string_path(panel):
+    """数值累加与旧版字符串累加的面板、伤害属性完全一致"""
+    expected = run_calc(StringWuWaCalc(RoleDetailData(**panel)))
+    actual = run_calc(WuWaCalc(RoleDetailData(**panel)))
+
+    assert_card_equal(expected[0], actual[0], "phantom_card")
+    assert_card_equal(expected[1], actual[1], "role_card")
+    assert attribute_values(actual[2]) == attribute_values(expected[2])
+
+
+def test_all_limit_panels_covered():
+    assert len(LIMIT_PANELS) == 29
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from XutheringWavesUID.utils import storage_gc
+
+NOW = 1_000_000_000.0
+DAY = 86400
+
+
+@pytest.fixture
+def players(tmp_path, monkeypatch):
+    dirs = {}
+
+    def iter_player_paths():
+        return list(dirs.items())
+
+    monkeypatch.setattr(storage_gc, "iter_player_paths", iter_player_paths)
+
+    def add(uid: str, *backups):
+        """backups: (天前, 字节数), 按给出的顺序编号"""
+        player_dir = dirs.setdefault(uid, tmp_path / uid)
+        player_dir.mkdir(exist_ok=True)
+        paths = []
+        for i, (days, size) in enumerate(backups):
+            path = player_dir / f"update_gacha_logs_{i}.json"
+            path.write_bytes(b"x" * size)
+            os.utime(path, (NOW - days * DAY, NOW - days * DAY))
+            paths.append(path)
+        return paths
+
+    return add
+
+
+def plan(keep=0, max_age=0, uid_max_bytes=0, max_bytes=0):
+    removed = storage_gc.plan_gacha_backups(
+        keep, max_age * DAY, uid_max_bytes, max_bytes, NOW
+    )
+    return {path for _, path in removed}
+
+
+def test_keep_newest_n(players):
+    paths = players("1", (1, 10), (2, 10), (3, 10), (4, 10))
+    assert plan(keep=2) == set(paths[2:])
+
+
+def test_max_age_keeps_newest(players):
+    fresh = players("1", (1, 10), (5, 10), (9, 10))
+    old = players("2", (30, 10), (40, 10))
+    assert plan(max_age=7) == {fresh[2], old[1]}
+
+
+def test_uid_byte_cap(players):
+    paths = players("1", (1, 100), (2, 100), (3, 100))
+    assert plan(uid_max_bytes=250) == {paths[2]}
+    # 最新一份超过上限时仍保留
+    assert plan(uid_max_bytes=50) == set(paths[1:])
+
+
+def test_global_byte_cap_removes_oldest_first(players):
+    first = players("1", (1, 100), (3, 100), (5, 100))
+    second = players("2", (2, 100), (4, 100))
+    assert plan(max_bytes=300) == {first[2], second[1]}
+    # 只剩每个uid最新的一份时不再清理
+    assert plan(max_bytes=1) == {first[1], first[2], second[1]}
+
+
+def test_other_files_untouched(players, tmp_path):
+    players("1", (1, 10), (2, 10))
+    other = tmp_path / "1" / "gacha_logs.json"
+    other.write_bytes(b"x")
+    os.utime(other, (NOW - 100 * DAY, NOW - 100 * DAY))
+    assert other not in plan(keep=1, max_age=1, max_bytes=1)
@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from XutheringWavesUID.utils.api import token_pool
+from XutheringWavesUID.utils.database.models import WavesUser
+from XutheringWavesUID.utils.api.token_pool import (
+    CANDIDATE_FACTOR,
+    MAX_CONSECUTIVE_FAILURES,
+    PublicTokenPool,
+    RiskControlError,
+)
+
+USERS = [SimpleNamespace(uid=str(i), cookie=f"ck{i}") for i in range(100)]
+
+
+@pytest.fixture(autouse=True)
+def users(monkeypatch):
+    async def get_waves_all_user():
+        return list(USERS)
+
+    async def cookie_validate(uid):
+        return True
+
+    monkeypatch.setattr(token_pool, "get_pool_size", lambda: 4)
+    monkeypatch.setattr(WavesUser, "get_waves_all_user", get_waves_all_user)
+    monkeypatch.setattr(WavesUser, "cookie_validate", cookie_validate, raising=False)
+
+
+def refresh(validate):
+    pool = PublicTokenPool()
+    calls = []
+
+    async def func(uid, cookie):
+        calls.append(uid)
+        return validate(len(calls))
+
+    asyncio.run(pool.refresh(func))
+    return pool, calls
+
+
+def test_refresh_stops_after_consecutive_failures():
+    pool, calls = refresh(lambda n: False)
+    assert len(pool) == 0
+    assert len(calls) == MAX_CONSECUTIVE_FAILURES
+
+
+def test_refresh_stops_on_risk_control():
+    def validate(n):
+        raise RiskControlError("code 270")
+
+    pool, calls = refresh(validate)
+    assert len(pool) == 0
+    assert len(calls) == 1
+
+
+def test_refresh_caps_candidates():
+    # 每 4 个候选成功 1 个, 不触发连续失败上限, 也不会校验全部用户
+    pool, calls = refresh(lambda n: n % 4 == 0)
+    assert len(calls) == 4 * CANDIDATE_FACTOR
+    assert len(pool) == 3
+
+
+def test_refresh_fills_pool():
+    pool, calls = refresh(lambda n: True)
+    assert len(pool) == 4
+    assert len(calls) == 4